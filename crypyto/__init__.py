@@ -1,2 +1,8 @@
 from . import ciphers
-from . import substitution_alphabets
\ No newline at end of file
+from . import substitution_alphabets
+from . import frequency_analysis
+from . import pipeline
+from . import pool
+from . import specs
+from . import cryptanalysis
+from . import cache
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+Helpers shared by the ``encrypt_file``/``decrypt_file`` methods, which process memory-mapped files in fixed-size windows
+"""
+
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+WINDOW_SIZE = 1 << 18
+
+def byte_table(mapping=None):
+    """
+    Returns a 256-byte translate table (bytes) which uppercases ASCII letters and then applies ``mapping`` (dict)
+
+    Raises:
+        ValueError: When ``mapping`` maps a byte to a character that doesn't fit in a single byte
+    """
+
+    mapping = mapping or {}
+    table = bytearray(256)
+    for byte in range(256):
+        char = chr(byte).upper() if byte < 128 else chr(byte)
+        char = mapping.get(char, char)
+        if len(char) != 1 or ord(char) > 255:
+            raise ValueError('Files can only be processed with single-byte alphabets')
+        table[byte] = ord(char)
+    return bytes(table)
+
+class TranslateKernel:
+    """
+    Picklable kernel of the monoalphabetic ciphers: a single ``bytes.translate`` table
+    """
+
+    keyed = False
+
+    def __init__(self, table):
+        self.table = table
+
+    def count(self, window):
+        return 0
+
+    def __call__(self, window, key_offset=0):
+        return window.translate(self.table), 0
+
+class ShiftKernel:
+    """
+    Picklable kernel of the Vigenere family: ``table`` is applied first, then each letter of ``abc`` is shifted by the key shift of its position
+    """
+
+    keyed = True
+
+    def __init__(self, table, abc, shifts):
+        self.table = table
+        self.abc = np.frombuffer(abc, dtype=np.uint8)
+        self.shifts = shifts
+        self.byte_to_index = np.full(256, -1, dtype=np.intp)
+        self.byte_to_index[self.abc] = np.arange(len(self.abc))
+        self.is_letter = (self.byte_to_index >= 0)[np.frombuffer(table, dtype=np.uint8)]
+
+    def count(self, window):
+        counts = np.bincount(np.frombuffer(window, dtype=np.uint8), minlength=256)
+        return int(counts[self.is_letter].sum())
+
+    def __call__(self, window, key_offset=0):
+        data = np.frombuffer(window.translate(self.table), dtype=np.uint8).copy()
+        indices = self.byte_to_index[data]
+        is_letter = indices >= 0
+        letters = indices[is_letter]
+        letter_shifts = self.shifts[(key_offset + np.arange(len(letters))) % len(self.shifts)]
+        data[is_letter] = self.abc[(letters + letter_shifts) % len(self.abc)]
+        return data.tobytes(), len(letters)
+
+def _release(mapped, start, length):
+    if hasattr(mapped, 'madvise'):
+        mapped.madvise(mmap.MADV_DONTNEED, start - start % mmap.PAGESIZE, length + start % mmap.PAGESIZE)
+
+def process_file(src, dst, process, flush=None, window_size=WINDOW_SIZE):
+    """
+    Memory-maps ``src`` and writes ``process(window)`` to ``dst`` for each window of ``window_size`` bytes, followed by ``flush()`` (if given)
+
+    Pages already processed are released (when ``madvise`` is available), so the peak memory doesn't depend on the file size.
+    ``src`` and ``dst`` may also be binary file objects (e.g. pipes or sockets), which are read and written a window at a time instead
+    """
+
+    source = src if hasattr(src, 'read') else open(src, 'rb')
+    try:
+        destination = dst if hasattr(dst, 'write') else open(dst, 'wb')
+        try:
+            if source is src:
+                for window in iter(lambda: source.read(window_size), b''):
+                    destination.write(process(window))
+            else:
+                size = source.seek(0, 2)
+                if size:
+                    with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        for start in range(0, size, window_size):
+                            destination.write(process(mapped[start:start + window_size]))
+                            _release(mapped, start, min(window_size, size - start))
+            if flush:
+                destination.write(flush())
+        finally:
+            if destination is not dst:
+                destination.close()
+    finally:
+        if source is not src:
+            source.close()
+
+def _count_windows(mapped, start, end, kernel, window_size=WINDOW_SIZE):
+    counts = []
+    for window_start in range(start, end, window_size):
+        window_end = min(window_start + window_size, end)
+        counts.append(kernel.count(mapped[window_start:window_end]))
+        _release(mapped, window_start, window_end - window_start)
+    return counts
+
+def _count_shard(src, start, end, kernel):
+    with open(src, 'rb') as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return sum(_count_windows(mapped, start, end, kernel))
+
+def _transform_shard(src, dst, start, end, kernel, key_offset):
+    window_counts = []
+    with open(src, 'rb') as source, open(dst, 'r+b') as destination:
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped, mmap.mmap(destination.fileno(), 0) as output:
+            for window_start in range(start, end, WINDOW_SIZE):
+                window_end = min(window_start + WINDOW_SIZE, end)
+                output[window_start:window_end], n_letters = kernel(mapped[window_start:window_end], key_offset)
+                key_offset += n_letters
+                window_counts.append(n_letters)
+                _release(mapped, window_start, window_end - window_start)
+                output.flush(window_start - window_start % mmap.PAGESIZE, window_end - window_start + window_start % mmap.PAGESIZE)
+                _release(output, window_start, window_end - window_start)
+    return window_counts
+
+def transform_file(src, dst, kernel, workers=1):
+    """
+    Writes ``src`` transformed by ``kernel`` to ``dst``, whose size is the same as ``src``, and returns the number of alphabet letters of each window of ``WINDOW_SIZE`` bytes (list)
+
+    With more than one worker, ``src`` is split in one shard per worker, aligned to the windows. A first parallel pass counts the alphabet letters of each shard (only for keyed kernels), so each worker knows its key offset, and then every worker transforms its shard straight into a preallocated ``dst``
+    """
+
+    if workers <= 1:
+        key_offset = 0
+        window_counts = []
+        def process(window):
+            nonlocal key_offset
+            data, n_letters = kernel(window, key_offset)
+            key_offset += n_letters
+            window_counts.append(n_letters)
+            return data
+        process_file(src, dst, process)
+        return window_counts
+
+    with open(src, 'rb') as source:
+        size = source.seek(0, 2)
+    with open(dst, 'wb') as destination:
+        destination.truncate(size)
+    if not size:
+        return []
+    shard_size = -(-size // workers)
+    shard_size += -shard_size % WINDOW_SIZE
+    starts = list(range(0, size, shard_size))
+    ends = [min(start + shard_size, size) for start in starts]
+    with ProcessPoolExecutor(workers) as executor:
+        key_offsets = [0] * len(starts)
+        if kernel.keyed:
+            counts = list(executor.map(_count_shard, [src] * len(starts), starts, ends, [kernel] * len(starts)))
+            for index in range(1, len(starts)):
+                key_offsets[index] = key_offsets[index - 1] + counts[index - 1]
+        shard_counts = executor.map(_transform_shard, [src] * len(starts), [dst] * len(starts), starts, ends, [kernel] * len(starts), key_offsets)
+        return [n_letters for window_counts in shard_counts for n_letters in window_counts]
+
+def write_index(index, window_counts, size, interval=WINDOW_SIZE):
+    """
+    Writes the sidecar index file ``index``: ``interval``, the ``size`` of the indexed file and the number of alphabet letters before every multiple of ``interval`` bytes, all as little-endian 64-bit integers
+    """
+
+    checkpoints = np.concatenate(([interval, size, 0], np.cumsum(window_counts, dtype=np.int64)))
+    checkpoints.astype('<u8').tofile(index)
+
+def index_file(src, index, kernel, interval=WINDOW_SIZE):
+    """
+    Counts the alphabet letters of ``src`` in a single pass and writes its sidecar index file ``index``
+    """
+
+    with open(src, 'rb') as source:
+        size = source.seek(0, 2)
+        window_counts = []
+        if size:
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                window_counts = _count_windows(mapped, 0, size, kernel, interval)
+    write_index(index, window_counts, size, interval)
+
+def _read_checkpoint(index, offset, size):
+    with open(index, 'rb') as file:
+        interval, indexed_size = (int(value) for value in np.frombuffer(file.read(16), dtype='<u8'))
+        if indexed_size != size:
+            raise ValueError('The index doesn\'t match the file')
+        file.seek(8 * (2 + offset // interval))
+        return offset - offset % interval, int.from_bytes(file.read(8), 'little')
+
+def transform_range(src, offset, length, kernel, index=None):
+    """
+    Returns ``length`` bytes of ``src``, starting at ``offset``, transformed by ``kernel`` (bytes).
+
+    The key offset is found by counting the alphabet letters before ``offset``: from the nearest checkpoint of the sidecar index file ``index``, if given, or else from the start of the file
+
+    Raises:
+        ValueError: When ``offset`` or ``length`` is negative
+        ValueError: When ``index`` was built for a file of a different size
+    """
+
+    if offset < 0 or length < 0:
+        raise ValueError('offset and length must not be negative')
+    with open(src, 'rb') as source:
+        size = source.seek(0, 2)
+        offset = min(offset, size)
+        start, key_offset = _read_checkpoint(index, offset, size) if index else (0, 0)
+        if offset == size or not length:
+            return b''
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            key_offset += sum(_count_windows(mapped, start, offset, kernel))
+            return kernel(mapped[offset:offset + length], key_offset)[0]
@@ -0,0 +1,152 @@
+"""
+Helpers shared by the ``dictionary_attack`` methods, which score the words of a memory-mapped wordlist in batches, across worker processes
+"""
+
+import mmap
+import string
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ._fileio import WINDOW_SIZE
+
+def byte_indices(letters):
+    """
+    Returns the key index of each byte (numpy.ndarray of 256 values): the position of its character in ``letters`` (ASCII letters in any case), or ``-1``
+
+    Raises:
+        ValueError: When ``letters`` has characters that don't fit in a single byte
+    """
+
+    indices = np.full(256, -1, dtype=np.intp)
+    for index, letter in reversed(list(enumerate(letters))):
+        if ord(letter) > 255:
+            raise ValueError('Wordlists can only be used with single-byte alphabets')
+        indices[ord(letter)] = index
+        if letter in string.ascii_uppercase:
+            indices[ord(letter.lower())] = index
+    return indices
+
+class ShiftScorer:
+    """
+    Picklable scorer of the Vigenere family: ``key_of[c, p]`` is the key index which deciphers the cipher letter ``c`` into ``p``.
+    The letter counts a key gives on ``sample`` are added up from the counts of each key column, shifted by ``key_of``, without deciphering it
+    """
+
+    def __init__(self, sample, key_of, reference):
+        self.sample = sample
+        self.key_of = key_of
+        self.reference = reference
+        self._tables = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_tables'] = {}
+        return state
+
+    def _column_tables(self, length):
+        if length not in self._tables:
+            size = len(self.reference)
+            counts = np.bincount((np.arange(len(self.sample)) % length) * size + self.sample, minlength=length * size).reshape(length, size)
+            tables = np.zeros((length, size, size))
+            plain = np.broadcast_to(np.arange(size), (size, size))
+            for column in range(length):
+                np.add.at(tables[column], (self.key_of, plain), counts[column][:, None])
+            self._tables[length] = tables
+        return self._tables[length]
+
+    def __call__(self, keys):
+        tables = self._column_tables(keys.shape[1])
+        counts = np.zeros((len(keys), len(self.reference)))
+        for column in range(keys.shape[1]):
+            counts += tables[column][keys[:, column]]
+        return _chi_squared(counts, len(self.sample) * self.reference)
+
+class KeywordScorer:
+    """
+    Picklable scorer of the Keyword cipher: the letter counts a keyword gives on the sample are the ``counts`` of its cipher letters, moved to the positions the keyword alphabet gives them
+    """
+
+    def __init__(self, counts, reference):
+        self.counts = counts
+        self.reference = reference
+
+    def __call__(self, keys):
+        n_keys, length = keys.shape
+        size = len(self.reference)
+        rows = np.arange(n_keys)
+        first = np.full((n_keys, size), length, dtype=np.intp)
+        for position in range(length - 1, -1, -1):
+            first[rows, keys[:, position]] = position
+        is_first = first[rows[:, None], keys] == np.arange(length)
+        ranks = np.cumsum(is_first, axis=1) - 1
+        present = first < length
+        n_present = present.sum(axis=1)[:, None]
+        absent_positions = n_present + np.arange(size) - (np.cumsum(present, axis=1) - present)
+        key_positions = np.where(present, ranks[rows[:, None], np.minimum(first, length - 1)], absent_positions)
+        counts = np.zeros((n_keys, size))
+        counts[rows[:, None], key_positions] = self.counts
+        return _chi_squared(counts, self.counts.sum() * self.reference)
+
+def _chi_squared(counts, expected):
+    return ((counts - expected) ** 2 / expected).sum(axis=1)
+
+def _line_start(mapped, offset):
+    if offset <= 0:
+        return 0
+    newline = mapped.find(b'\n', offset - 1)
+    return len(mapped) if newline < 0 else newline + 1
+
+def _word_batches(window, indices):
+    data = np.frombuffer(window, dtype=np.uint8)
+    letter_indices = indices[data]
+    is_letter = letter_indices >= 0
+    word_ids = np.cumsum(data == 10)[is_letter]
+    letters = letter_indices[is_letter]
+    lengths = np.bincount(word_ids)
+    starts = np.cumsum(lengths) - lengths
+    for length in np.unique(lengths[lengths > 0]):
+        words = np.flatnonzero(lengths == length)
+        yield letters[starts[words][:, None] + np.arange(length)]
+
+def _keep_best(best, n_keep):
+    return dict(sorted(best.items(), key=lambda item: (item[1], item[0]))[:n_keep])
+
+def _scan_shard(src, start, end, indices, scorer, n_keep):
+    best = {}
+    with open(src, 'rb') as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        position, end = _line_start(mapped, start), _line_start(mapped, end)
+        while position < end:
+            window_end = _line_start(mapped, min(position + WINDOW_SIZE, end))
+            for keys in _word_batches(mapped[position:window_end], indices):
+                scores = scorer(keys)
+                kept = np.argsort(scores, kind='stable')[:n_keep]
+                for index in kept:
+                    key = tuple(int(value) for value in keys[index])
+                    best[key] = min(float(scores[index]), best.get(key, float('inf')))
+                best = _keep_best(best, n_keep)
+            position = window_end
+    return best
+
+def scan_wordlist(src, indices, scorer, n_keep, workers=1):
+    """
+    Scores every word of the wordlist ``src`` (one per line) with ``scorer`` and returns the ``n_keep`` best keys (list of tuples of key indices), best first. ``indices`` maps each byte to its key index (see ``byte_indices``), other bytes are skipped
+
+    The wordlist is memory-mapped and read in windows of whole lines. Its words are turned into key indices and grouped by length without a Python loop per word, so each batch is scored at once.
+    With more than one worker, the wordlist is split in one shard per worker, aligned to the lines, and each worker keeps only its ``n_keep`` best keys
+    """
+
+    with open(src, 'rb') as source:
+        size = source.seek(0, 2)
+    if not size:
+        return []
+    if workers <= 1:
+        best = _scan_shard(src, 0, size, indices, scorer, n_keep)
+    else:
+        shard_size = -(-size // workers)
+        starts = list(range(0, size, shard_size))
+        ends = [min(start + shard_size, size) for start in starts]
+        best = {}
+        with ProcessPoolExecutor(workers) as executor:
+            for shard_best in executor.map(_scan_shard, [src] * len(starts), starts, ends, [indices] * len(starts), [scorer] * len(starts), [n_keep] * len(starts)):
+                for key, score in shard_best.items():
+                    best[key] = min(score, best.get(key, float('inf')))
+    return list(_keep_best(best, n_keep))
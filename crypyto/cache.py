@@ -0,0 +1,185 @@
+"""
+This module provides a persistent result cache, so cracking the same ciphertext again doesn't recompute everything
+"""
+
+import hashlib
+import pickle
+import sqlite3
+from collections import namedtuple
+from threading import Lock
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'max_size', 'size', 'entries'])
+
+_MISSING = object()
+
+class ResultCache:
+    """
+    `ResultCache` represents an on-disk cache of brute-force and cracking results, stored in a local SQLite file so it survives restarts.
+
+    Results are keyed by a hash of the cipher class, the method, the ciphertext and only the parameters the result depends on (e.g. not the ``Caesar`` key for ``brute_force``), so equivalent calls share their results.
+    They're stored pickled, so only open cache files you trust.
+    When the stored results take more than ``max_size`` bytes, the least recently used ones are evicted.
+    Hit, miss and eviction counts are kept since the cache was opened. The cache is thread-safe.
+
+    It's used by passing it as the ``cache`` argument of ``Caesar.brute_force``, ``RailFence.brute_force``, ``Gronsfeld.brute_force`` and ``cryptanalysis.solve``.
+
+    Args:
+        filename (str): The filename of the SQLite file, created if needed. Defaults to ``'crypyto_cache.sqlite'``
+        max_size (int): The maximum number of bytes of stored results. Defaults to 64 MiB
+
+    Raises:
+        ValueError: When ``max_size`` is smaller than 1
+
+    Examples:
+        >>> from crypyto.cache import ResultCache
+        >>> from crypyto.ciphers import Gronsfeld
+        >>> cache = ResultCache('results.sqlite')
+        >>> cipher = Gronsfeld('2317').encrypt('Whoever has the key can read every single word of this message')
+        >>> first = Gronsfeld('0').crack(cipher, cache=cache)
+        >>> Gronsfeld('0').crack(cipher, cache=cache) == first
+        True
+        >>> cache.info()
+        CacheInfo(hits=1, misses=1, evictions=0, max_size=67108864, size=846, entries=1)
+    """
+
+    def __init__(self, filename='crypyto_cache.sqlite', max_size=64 << 20):
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1')
+        self.filename = filename
+        self.max_size = max_size
+        self._lock = Lock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed INTEGER NOT NULL)')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+        self._size, self._entries, self._clock = self._connection.execute('SELECT COALESCE(SUM(size), 0), COUNT(*), COALESCE(MAX(accessed), 0) FROM results').fetchone()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key(manipulator, method, cipher, **parameters):
+        """
+        Returns the cache key (str) of running ``method`` of ``manipulator`` on ``cipher``: a SHA-256 hash of the cipher class, the method, the ciphertext and ``parameters``, which should be only the ones the result depends on
+
+        Args:
+            manipulator (object|type|None): The cipher manipulator (or its class), or ``None`` for module functions (e.g. ``cryptanalysis.solve``)
+            method (str): The name of the method (or function)
+            cipher (str): The ciphertext
+            **parameters: The manipulator attributes and method options the result depends on
+
+        Examples:
+            >>> from crypyto.cache import ResultCache
+            >>> from crypyto.ciphers import Caesar
+            >>> ResultCache.key(Caesar(key=1), 'brute_force', 'MJQQT', abc='ABCDEFGHIJKLMNOPQRSTUVWXYZ') == ResultCache.key(Caesar, 'brute_force', 'MJQQT', abc='ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+            True
+        """
+
+        owner = None
+        if manipulator is not None:
+            cls = manipulator if isinstance(manipulator, type) else type(manipulator)
+            owner = '{}.{}'.format(cls.__module__, cls.__qualname__)
+        parameters = tuple(sorted((name, _normalize(value)) for name, value in parameters.items()))
+        return hashlib.sha256(repr((owner, method, str(cipher), parameters)).encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def get(self, key, default=None):
+        """
+        Returns the result stored under ``key``, or ``default`` if there's none. Counts a hit or a miss
+
+        Args:
+            key (str): The cache key (see ``key``)
+            default (object): The value returned when ``key`` isn't cached. Defaults to ``None``
+        """
+
+        with self._lock:
+            row = self._connection.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self._misses += 1
+                return default
+            self._hits += 1
+            self._clock += 1
+            self._connection.execute('UPDATE results SET accessed = ? WHERE key = ?', (self._clock, key))
+        return pickle.loads(row[0])
+
+    def set(self, key, value):
+        """
+        Stores ``value`` under ``key``, evicting the least recently used results if needed. Results larger than ``max_size`` aren't stored
+
+        Args:
+            key (str): The cache key (see ``key``)
+            value (object): The result. Must be picklable
+        """
+
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_size:
+            return
+        with self._lock:
+            self._clock += 1
+            old = self._connection.execute('SELECT size FROM results WHERE key = ?', (key,)).fetchone()
+            self._connection.execute('INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)', (key, data, len(data), self._clock))
+            self._size += len(data) - (old[0] if old else 0)
+            self._entries += 0 if old else 1
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self):
+        evicted = []
+        freed = 0
+        for key, size in self._connection.execute('SELECT key, size FROM results ORDER BY accessed'):
+            if self._size - freed <= self.max_size:
+                break
+            evicted.append((key,))
+            freed += size
+        self._connection.executemany('DELETE FROM results WHERE key = ?', evicted)
+        self._size -= freed
+        self._entries -= len(evicted)
+        self._evictions += len(evicted)
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the result stored under ``key``, or computes it with ``compute()`` and stores it
+
+        Args:
+            key (str): The cache key (see ``key``)
+            compute (callable): Function without arguments that returns the result
+        """
+
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def info(self):
+        """
+        Returns the cache statistics (CacheInfo): hits, misses and evictions since the cache was opened, max_size, current size in bytes and number of entries
+        """
+
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self.max_size, self._size, self._entries)
+
+    def clear(self):
+        """
+        Removes every result from the cache and resets its statistics
+        """
+
+        with self._lock:
+            self._connection.execute('DELETE FROM results')
+            self._size = self._entries = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def close(self):
+        """
+        Closes the SQLite file
+        """
+
+        with self._lock:
+            self._connection.close()
+
+def _normalize(value):
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(item) for item in value)
+    return value
@@ -2,11 +2,168 @@
 This module provides simple usage of functions related to a list of ciphers  
 """
 
+import os
 import string
 import re
 import random
-from math import gcd
+from collections import namedtuple
+from math import gcd, log
+from functools import partial
+import numpy as np
 from unidecode import unidecode
+from ._fileio import WINDOW_SIZE, byte_table, transform_file, write_index, index_file, transform_range, TranslateKernel, ShiftKernel
+from ._wordlist import byte_indices, scan_wordlist, ShiftScorer, KeywordScorer
+
+CribMatch = namedtuple('CribMatch', ['crib', 'offset', 'fragment', 'period', 'key', 'score'])
+
+_CRIB_BLOCK = 1 << 20
+
+_NO_WHITESPACE = str.maketrans('', '', string.whitespace)
+_SQUARE_SIZE_PATTERN = re.compile(r'(\d+)[xX](\d+)#')
+
+def _code_points(text):
+    return np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+
+def _substitute(abc, text, table):
+    indices = abc.to_indices(text)
+    is_letter = indices >= 0
+    codes = _code_points(text).copy()
+    codes[is_letter] = abc.codes[table[indices[is_letter]]]
+    return codes.tobytes().decode('utf-32-le')
+
+def _mod_inverse(value, modulus):
+    old_remainder, remainder, old_inverse, inverse = value % modulus, modulus, 1, 0
+    while remainder:
+        quotient = old_remainder // remainder
+        old_remainder, remainder = remainder, old_remainder - quotient * remainder
+        old_inverse, inverse = inverse, old_inverse - quotient * inverse
+    return old_inverse % modulus
+
+class Alphabet(str):
+    """
+    `Alphabet` represents a compiled alphabet: a ``str`` whose letters are indexed once, so finding a letter's position is O(1) whatever the alphabet size (even with thousands of Unicode code points)
+
+    Every cipher in this module turns its ``abc`` into an ``Alphabet``, so it can still be used as a regular string. Its lookup tables are read-only, so it can be shared by any number of threads.
+
+    Args:
+        letters (str): The letters of the alphabet, in order
+
+    Examples:
+        >>> from crypyto.ciphers import Alphabet
+        >>> abc = Alphabet('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+        >>> abc.index('K')
+        10
+        >>> abc.to_indices('HI!')
+        array([ 7,  8, -1])
+        >>> abc.from_indices([7, 8])
+        'HI'
+    """
+
+    def __new__(cls, letters):
+        alphabet = super().__new__(cls, letters)
+        alphabet._letter_to_index = {}
+        for index, letter in enumerate(letters):
+            alphabet._letter_to_index.setdefault(letter, index)
+        alphabet.codes = _code_points(str(letters)).copy()
+        unique_codes, first_indices = np.unique(alphabet.codes, return_index=True)
+        if len(unique_codes) and unique_codes[-1] < 1 << 16:
+            alphabet._code_to_index = np.full(int(unique_codes[-1]) + 2, -1, dtype=np.intp)
+            alphabet._code_to_index[unique_codes] = first_indices
+            alphabet._sorted_codes = None
+        else:
+            alphabet._code_to_index = first_indices
+            alphabet._sorted_codes = unique_codes
+        for table in (alphabet.codes, alphabet._code_to_index, alphabet._sorted_codes):
+            if table is not None:
+                table.flags.writeable = False
+        return alphabet
+
+    def __contains__(self, item):
+        if len(item) == 1:
+            return item in self._letter_to_index
+        return super().__contains__(item)
+
+    def index(self, sub, *args):
+        """
+        Returns the position (int) of the letter ``sub`` in the alphabet, in O(1). Substrings and ranges behave like ``str.index``
+
+        Raises:
+            ValueError: When ``sub`` is not in the alphabet
+        """
+
+        if len(sub) == 1 and not args:
+            try:
+                return self._letter_to_index[sub]
+            except KeyError:
+                raise ValueError('{!r} is not in the alphabet'.format(sub))
+        return super().index(sub, *args)
+
+    def to_indices(self, text):
+        """
+        Returns the position of each character of ``text`` in the alphabet (numpy.ndarray), with ``-1`` for characters out of it
+
+        Args:
+            text (str): The text to be encoded
+        """
+
+        codes = _code_points(text)
+        if self._sorted_codes is None:
+            return self._code_to_index[np.minimum(codes, len(self._code_to_index) - 1)]
+        if not len(self._sorted_codes):
+            return np.full(len(codes), -1, dtype=np.intp)
+        positions = np.minimum(np.searchsorted(self._sorted_codes, codes), len(self._sorted_codes) - 1)
+        return np.where(self._sorted_codes[positions] == codes, self._code_to_index[positions], -1)
+
+    def from_indices(self, indices):
+        """
+        Returns the letters at the positions ``indices`` (str)
+
+        Args:
+            indices (iterable): Positions in the alphabet, e.g. the result of ``to_indices`` without the ``-1`` values
+        """
+
+        return self.codes[np.asarray(indices, dtype=np.intp)].tobytes().decode('utf-32-le')
+
+ENGLISH_FREQUENCIES = {
+    'A': 8.167, 'B': 1.492, 'C': 2.782, 'D': 4.253, 'E': 12.702, 'F': 2.228, 'G': 2.015,
+    'H': 6.094, 'I': 6.966, 'J': 0.153, 'K': 0.772, 'L': 4.025, 'M': 2.406, 'N': 6.749,
+    'O': 7.507, 'P': 1.929, 'Q': 0.095, 'R': 5.987, 'S': 6.327, 'T': 9.056, 'U': 2.758,
+    'V': 0.978, 'W': 2.360, 'X': 0.150, 'Y': 1.974, 'Z': 0.074,
+}
+
+COMMON_BIGRAMS = ('TH', 'HE', 'IN', 'ER', 'AN', 'RE', 'ON', 'AT', 'EN', 'ND', 'TI', 'ES', 'OR', 'TE', 'OF', 'ED', 'IS', 'IT', 'AL', 'AR',
+                  'ST', 'TO', 'NT', 'NG', 'SE', 'HA', 'AS', 'OU', 'IO', 'LE', 'VE', 'CO', 'ME', 'DE', 'HI', 'RI', 'RO', 'IC', 'NE', 'EA')
+
+_ENGLISH_ABC = Alphabet(string.ascii_uppercase)
+_IS_COMMON_BIGRAM = np.zeros(len(_ENGLISH_ABC) ** 2, dtype=bool)
+_IS_COMMON_BIGRAM[[_ENGLISH_ABC.index(bigram[0]) * len(_ENGLISH_ABC) + _ENGLISH_ABC.index(bigram[1]) for bigram in COMMON_BIGRAMS]] = True
+
+def _english_reference(abc):
+    frequencies = np.array([ENGLISH_FREQUENCIES.get(letter, 0.01) for letter in abc])
+    return frequencies / frequencies.sum()
+
+def _english_score(text):
+    indices = _ENGLISH_ABC.to_indices(text.upper())
+    letters = indices[indices >= 0]
+    if not len(letters):
+        return float('inf')
+    counts = np.bincount(letters, minlength=len(_ENGLISH_ABC))
+    expected = len(letters) * _english_reference(_ENGLISH_ABC)
+    chi_squared = ((counts - expected) ** 2 / expected).sum() / len(letters)
+    is_pair = (indices[:-1] >= 0) & (indices[1:] >= 0)
+    pairs = indices[:-1][is_pair] * len(_ENGLISH_ABC) + indices[1:][is_pair]
+    uncommon = 1 - _IS_COMMON_BIGRAM[pairs].mean() if len(pairs) else 1.0
+    return float(chi_squared + uncommon)
+
+def _ranked_decryptions(decryptions, n_results):
+    results = []
+    seen_texts = set()
+    for key, text in decryptions:
+        if text not in seen_texts:
+            seen_texts.add(text)
+            results.append((key, text, _english_score(text)))
+    results.sort(key=lambda result: result[2])
+    return results[:n_results]
 
 class PolybiusSquare:
     """
@@ -17,6 +174,7 @@ class PolybiusSquare:
         height (int): The square's height. Must be at least 1. Height times width must be greater than the alphabet length
         abc (str): The alphabet used in the square. Defaults to ``string.ascii_uppercase``
         ij (bool): Whether 'i' and 'j' are treated as the same letter. Defaults to ``True``
+        seed (int|None): Seed of the random generator which picks a position for letters with more than one. Defaults to ``None``, which seeds it from the operating system
 
     Raises:
         ValueError: When `width` is smaller than 1
@@ -24,12 +182,13 @@ class PolybiusSquare:
 
     """
 
-    def __init__(self, width, height, abc=string.ascii_uppercase, ij=True):
-        self.abc = abc.replace('J', '') if ij else self.abc
+    def __init__(self, width, height, abc=string.ascii_uppercase, ij=True, seed=None):
+        self._random = random.Random(seed)
+        self.abc = Alphabet(abc.replace('J', '') if ij else abc)
         self.width = width
         self.height = height
         self.mount_square()
-        self.not_abc_pattern = re.compile('[^{}]+'.format(abc), re.UNICODE)
+        self.not_abc_pattern = re.compile('[^{}]+'.format(re.escape(abc)), re.UNICODE)
 
     @property
     def width(self):
@@ -65,13 +224,16 @@ class PolybiusSquare:
         for letter in self.abc:
             for pos in self.abc_to_pos[letter]:
                 self.pos_to_abc[pos] = letter
+        self._square_codes = np.array([ord(letter) for letter in self.abc_square], dtype='<u4').reshape(self.height, self.width)
+        self._square_codes.flags.writeable = False
 
-    def encrypt(self, text):
+    def encrypt(self, text, seed=None):
         """
         Returns encrypted text (str)
 
         Args:
             text (str): The text to be encrypted
+            seed (int|None): Seed of a random generator used only by this call, so the positions picked don't depend on other calls. Defaults to ``None``, which uses the generator of the instance
 
         Examples:
             >>> from crypyto.ciphers import PolybiusSquare
@@ -84,7 +246,8 @@ class PolybiusSquare:
         text = text.replace('J', 'I') if len(self.abc) == 25 else text
         text = self.not_abc_pattern.sub('', text)
         cipher = '{}x{}#'.format(self.width, self.height)
-        positions = [random.choice(self.abc_to_pos[letter]) for letter in text]
+        choice = (self._random if seed is None else random.Random(seed)).choice
+        positions = [choice(self.abc_to_pos[letter]) for letter in text]
         cipher += ';'.join(positions)
         return cipher
 
@@ -97,6 +260,7 @@ class PolybiusSquare:
 
         Raises:
             ValueError: When ``cipher`` doesn't match the Polybius Square pattern
+            ValueError: When ``cipher`` has a position (or a square size) out of this square
 
         Examples:
             >>> from crypyto.ciphers import PolybiusSquare
@@ -105,13 +269,75 @@ class PolybiusSquare:
             'ENCRYPTEDMESSAGE'
         """
 
-        cipher = cipher.lower()
-        match = re.search(r'(?:\d+x\d+#)?((?:\d+-\d+;?)+)', cipher)
-        if match:
-            positions = match.group(1).split(';')
-            text = ''.join([self.pos_to_abc[pos] for pos in positions])
-            return text
-        else:
+        return ''.join(self.decrypt_stream([cipher]))
+
+    def _decrypt_positions(self, positions):
+        try:
+            data = np.frombuffer(positions.encode('ascii'), dtype=np.uint8)
+        except UnicodeEncodeError:
+            raise ValueError('Cipher doesn\'t match the Polybius Square pattern.')
+        is_digit = (data >= 48) & (data <= 57)
+        separators = np.flatnonzero(~is_digit)
+        lengths = separators - np.concatenate(([0], separators[:-1] + 1))
+        if len(separators) % 2 or (data[separators[0::2]] != 45).any() or (data[separators[1::2]] != 59).any() or (lengths < 1).any():
+            raise ValueError('Cipher doesn\'t match the Polybius Square pattern.')
+        exponents = np.minimum(np.repeat(separators, lengths) - np.flatnonzero(is_digit) - 1, 18)
+        values = np.add.reduceat((data[is_digit] - 48).astype(np.int64) * 10 ** exponents, np.concatenate(([0], np.cumsum(lengths)[:-1])))
+        cols, rows = values[0::2], values[1::2]
+        out_of_square = (cols < 1) | (cols > self.width) | (rows < 1) | (rows > self.height) | (lengths[0::2] > 18) | (lengths[1::2] > 18)
+        if out_of_square.any():
+            position = positions.split(';')[np.flatnonzero(out_of_square)[0]]
+            raise ValueError('Position {} is out of the {}x{} square.'.format(position, self.width, self.height))
+        return self._square_codes[rows - 1, cols - 1].tobytes().decode('utf-32-le')
+
+    def decrypt_stream(self, chunks, chunk_size=1 << 16):
+        """
+        Returns a generator of decrypted chunks (str). Positions are parsed in bulk, in linear time and without building a string per position, so the cipher can be as large as needed. Whitespace is ignored
+
+        Args:
+            chunks (iterable|file): Iterable of cipher chunks (str) or a file opened in text mode. May or may not start with the square size (e.g. '5x5#')
+            chunk_size (int): The number of characters read at a time when ``chunks`` is a file. Defaults to ``65536``
+
+        Raises:
+            ValueError: When the cipher doesn't match the Polybius Square pattern
+            ValueError: When the cipher has a position (or a square size) out of this square
+
+        Examples:
+            >>> from crypyto.ciphers import PolybiusSquare
+            >>> ps = PolybiusSquare(5, 5)
+            >>> ''.join(ps.decrypt_stream(['5x5#5-1;3-', '3;3-1;2-4']))
+            'ENCR'
+            >>> with open('cipher.txt') as cipher_file:
+            ...     for text in ps.decrypt_stream(cipher_file):
+            ...         print(text, end='')
+        """
+
+        if hasattr(chunks, 'read'):
+            read = chunks.read
+            chunks = iter(lambda: read(chunk_size), '')
+        rest = ''
+        header_checked = False
+        decrypted_any = False
+        for chunk in chunks:
+            rest += chunk.translate(_NO_WHITESPACE)
+            if not header_checked:
+                if '#' not in rest and '-' not in rest and len(rest) < 64:
+                    continue
+                header = _SQUARE_SIZE_PATTERN.match(rest)
+                if header:
+                    if (int(header.group(1)), int(header.group(2))) != (self.width, self.height):
+                        raise ValueError('Cipher was made with a {}x{} square, not {}x{}.'.format(header.group(1), header.group(2), self.width, self.height))
+                    rest = rest[header.end():]
+                header_checked = True
+            cut = rest.rfind(';') + 1
+            if cut:
+                positions, rest = rest[:cut], rest[cut:]
+                decrypted_any = True
+                yield self._decrypt_positions(positions)
+        if rest and not _SQUARE_SIZE_PATTERN.fullmatch(rest):
+            decrypted_any = True
+            yield self._decrypt_positions(rest + ';')
+        if not decrypted_any:
             raise ValueError('Cipher doesn\'t match the Polybius Square pattern.')
 
 class Atbash:
@@ -124,7 +350,7 @@ class Atbash:
     """
 
     def __init__(self, abc=string.ascii_uppercase):
-        self.abc = abc
+        self.abc = Alphabet(abc)
         self.cba = abc[::-1]
         self.convertion_dict = dict(zip(self.abc, self.cba))
 
@@ -164,6 +390,50 @@ class Atbash:
 
         return self.encrypt(cipher, decode_unicode)
 
+    def translation_table(self, decrypt=False):
+        """
+        Returns the letter-to-letter mapping (dict) this cipher applies. Atbash is its own inverse, so ``decrypt`` doesn't change the result
+
+        Args:
+            decrypt (bool): Whether to return the decryption mapping. Defaults to ``False``
+        """
+
+        return dict(self.convertion_dict)
+
+    def encrypt_file(self, src, dst, workers=1):
+        """
+        Encrypts the file ``src`` into ``dst`` through a memory map, without loading it into memory. ASCII letters are uppercased and encrypted, every other byte is copied as is
+
+        Args:
+            src (str): The filename of the file to be encrypted
+            dst (str): The filename of the encrypted file
+            workers (int): Number of processes the file is split across. Defaults to ``1``, which processes it in the current process
+
+        Examples:
+            >>> from crypyto.ciphers import Atbash
+            >>> atbash = Atbash()
+            >>> atbash.encrypt_file('export.log', 'export.log.enc')
+        """
+
+        transform_file(src, dst, TranslateKernel(byte_table(self.translation_table())), workers)
+
+    def decrypt_file(self, src, dst, workers=1):
+        """
+        Decrypts the file ``src`` into ``dst`` through a memory map, without loading it into memory. ASCII letters are uppercased and decrypted, every other byte is copied as is
+
+        Args:
+            src (str): The filename of the file to be decrypted
+            dst (str): The filename of the decrypted file
+            workers (int): Number of processes the file is split across. Defaults to ``1``, which processes it in the current process
+
+        Examples:
+            >>> from crypyto.ciphers import Atbash
+            >>> atbash = Atbash()
+            >>> atbash.decrypt_file('export.log.enc', 'export.log')
+        """
+
+        transform_file(src, dst, TranslateKernel(byte_table(self.translation_table(True))), workers)
+
 class Caesar:
     """
     `Caesar` represents a Caesar cipher manipulator
@@ -185,7 +455,7 @@ class Caesar:
     
     @abc.setter
     def abc(self, value):
-        self._abc = value
+        self._abc = Alphabet(value)
         self.max_value = len(value) - 1
 
     @property
@@ -216,19 +486,7 @@ class Caesar:
 
         key = self.key if key == None else key
         text = unidecode(text).upper() if decode_unicode else text.upper()
-        cipher = ''
-        for letter in text:
-            if letter in self.abc:
-                letter_index = self.abc.index(letter) + key
-                if letter_index > self.max_value:
-                    letter_index = letter_index - self.max_value - 1
-                if letter_index < 0:
-                    letter_index = letter_index + self.max_value + 1
-
-                cipher += self.abc[letter_index]
-            else:
-                cipher += letter
-        return cipher
+        return _substitute(self.abc, text, (np.arange(len(self.abc)) + key) % len(self.abc))
 
     def decrypt(self, cipher, decode_unicode=True, key=None):
         """
@@ -250,7 +508,7 @@ class Caesar:
         text = self.encrypt(cipher, decode_unicode, -key)
         return text
 
-    def brute_force(self, cipher, decode_unicode=True, output_file=None):
+    def brute_force(self, cipher, decode_unicode=True, output_file=None, cache=None):
         """
         Prints (to stdout or specified file) all possible results
 
@@ -258,6 +516,7 @@ class Caesar:
             cipher (str): The cipher to be decrypted
             decode_unicode (bool): Whether the cipher should have unicode characters converted to ascii before decrypting. Defaults to ``True``
             output_file (str|None): The filename of the file the results are gonna be printed. Defaults to ``None``, which indicated printing on stdout
+            cache (crypyto.cache.ResultCache|None): Cache the results are looked up in and stored to. Defaults to ``None``, which always computes them
 
         Examples:
             >>> from crypyto.ciphers import Caesar
@@ -277,10 +536,10 @@ class Caesar:
             if not input().upper().startswith('Y'):
                 return
 
-        results = ''
-        for try_number in range(1, self.max_value + 1):
-            text = self.encrypt(cipher, decode_unicode, try_number)
-            results += text + '\n'
+        def compute():
+            return ''.join(self.encrypt(cipher, decode_unicode, try_number) + '\n' for try_number in range(1, self.max_value + 1))
+
+        results = cache.get_or_compute(cache.key(self, 'brute_force', cipher, abc=self.abc, decode_unicode=decode_unicode), compute) if cache else compute()
 
         if output_file:
             with open(output_file, 'w') as out:
@@ -288,6 +547,53 @@ class Caesar:
         else:
             print(results.strip())
 
+    def translation_table(self, decrypt=False, key=None):
+        """
+        Returns the letter-to-letter mapping (dict) this cipher applies
+
+        Args:
+            decrypt (bool): Whether to return the decryption mapping. Defaults to ``False``
+            key (int|None): The key used to build the mapping. Defaults to ``None``, which uses the value from ``self.key``
+        """
+
+        key = self.key if key == None else key
+        key = -key if decrypt else key
+        return {letter:self.abc[(index + key) % len(self.abc)] for index, letter in enumerate(self.abc)}
+
+    def encrypt_file(self, src, dst, workers=1):
+        """
+        Encrypts the file ``src`` into ``dst`` through a memory map, without loading it into memory. ASCII letters are uppercased and encrypted, every other byte is copied as is
+
+        Args:
+            src (str): The filename of the file to be encrypted
+            dst (str): The filename of the encrypted file
+            workers (int): Number of processes the file is split across. Defaults to ``1``, which processes it in the current process
+
+        Examples:
+            >>> from crypyto.ciphers import Caesar
+            >>> caesar = Caesar(key=5)
+            >>> caesar.encrypt_file('export.log', 'export.log.enc')
+        """
+
+        transform_file(src, dst, TranslateKernel(byte_table(self.translation_table())), workers)
+
+    def decrypt_file(self, src, dst, workers=1):
+        """
+        Decrypts the file ``src`` into ``dst`` through a memory map, without loading it into memory. ASCII letters are uppercased and decrypted, every other byte is copied as is
+
+        Args:
+            src (str): The filename of the file to be decrypted
+            dst (str): The filename of the decrypted file
+            workers (int): Number of processes the file is split across. Defaults to ``1``, which processes it in the current process
+
+        Examples:
+            >>> from crypyto.ciphers import Caesar
+            >>> caesar = Caesar(key=5)
+            >>> caesar.decrypt_file('export.log.enc', 'export.log')
+        """
+
+        transform_file(src, dst, TranslateKernel(byte_table(self.translation_table(True))), workers)
+
 ROT13 = Caesar(key=13)
 
 class Affine:
@@ -304,7 +610,7 @@ class Affine:
     """
 
     def __init__(self, a, b, abc=string.ascii_uppercase):
-        self.abc = abc
+        self.abc = Alphabet(abc)
         self.a = a
         self.b = b
         self.pos_to_abc = dict(enumerate(abc))
@@ -335,14 +641,7 @@ class Affine:
         """
 
         text = unidecode(text).upper()
-        cipher = ''
-        for character in text:
-            if character in self.abc:
-                x = self.abc_to_pos[character]
-                cipher_pos = (self.a * x + self.b) % len(self.abc)
-                character = self.pos_to_abc[cipher_pos]
-            cipher += character
-        return cipher
+        return _substitute(self.abc, text, (self.a * np.arange(len(self.abc)) + self.b) % len(self.abc))
 
     def decrypt(self, cipher):
         """
@@ -358,16 +657,61 @@ class Affine:
             'HELLO, WORLD!'
         """
 
-        cipher = cipher.upper()
-        text = ''
-        for character in cipher:
-            if character in self.abc:
-                mod_inv = -self.a % len(self.abc)
-                cipher_pos = self.abc_to_pos[character]
-                x = mod_inv * (cipher_pos - self.b) % 26
-                character = self.pos_to_abc[x]
-            text += character
-        return text
+        mod_inv = _mod_inverse(self.a, len(self.abc))
+        return _substitute(self.abc, cipher.upper(), mod_inv * (np.arange(len(self.abc)) - self.b) % len(self.abc))
+
+    def translation_table(self, decrypt=False):
+        """
+        Returns the letter-to-letter mapping (dict) this cipher applies
+
+        Args:
+            decrypt (bool): Whether to return the decryption mapping. Defaults to ``False``
+        """
+
+        table = {letter:self.pos_to_abc[(self.a * x + self.b) % len(self.abc)] for x, letter in self.pos_to_abc.items()}
+        return {v:k for k, v in table.items()} if decrypt else table
+
+    def encrypt_file(self, src, dst, workers=1):
+        """
+        Encrypts the file ``src`` into ``dst`` through a memory map, without loading it into memory. ASCII letters are uppercased and encrypted, every other byte is copied as is
+
+        Args:
+            src (str): The filename of the file to be encrypted
+            dst (str): The filename of the encrypted file
+            workers (int): Number of processes the file is split across. Defaults to ``1``, which processes it in the current process
+
+        Examples:
+            >>> from crypyto.ciphers import Affine
+            >>> af = Affine(a=5, b=8)
+            >>> af.encrypt_file('export.log', 'export.log.enc')
+        """
+
+        transform_file(src, dst, TranslateKernel(byte_table(self.translation_table())), workers)
+
+    def decrypt_file(self, src, dst, workers=1):
+        """
+        Decrypts the file ``src`` into ``dst`` through a memory map, without loading it into memory. ASCII letters are uppercased and decrypted, every other byte is copied as is
+
+        Args:
+            src (str): The filename of the file to be decrypted
+            dst (str): The filename of the decrypted file
+            workers (int): Number of processes the file is split across. Defaults to ``1``, which processes it in the current process
+
+        Examples:
+            >>> from crypyto.ciphers import Affine
+            >>> af = Affine(a=5, b=8)
+            >>> af.decrypt_file('export.log.enc', 'export.log')
+        """
+
+        transform_file(src, dst, TranslateKernel(byte_table(self.translation_table(True))), workers)
+
+def _rail_count(value):
+    return abs(value) if abs(value) > 1 else 2
+
+def _rail_direction(value):
+    if value[0].upper() not in ['D', 'U']:
+        raise ValueError('direction must be (U)p or (D)own')
+    return value[0].upper()
 
 class RailFence:
     """
@@ -395,7 +739,7 @@ class RailFence:
 
     @n_rails.setter
     def n_rails(self, value):
-        self._n_rails = abs(value) if abs(value) > 1 else 2
+        self._n_rails = _rail_count(value)
         self.cycle = self.n_rails * 2 - 2
 
     @property
@@ -414,27 +758,34 @@ class RailFence:
     
     @direction.setter
     def direction(self, value):
-        if value[0].upper() not in ['D', 'U']:
-            raise ValueError('direction must be (U)p or (D)own')
-        self._direction = value[0].upper()
+        self._direction = _rail_direction(value)
     
-    def _zig_zag_for(self, iterate_over, action):
-        direction = self.direction
-        rail_index = 0 if direction == 'D' else self.n_rails - 1
+    def _parameters(self, n_rails, direction):
+        n_rails = self.n_rails if n_rails is None else _rail_count(n_rails)
+        direction = self.direction if direction is None else _rail_direction(direction)
+        return n_rails, direction
+
+    def _zig_zag_for(self, iterate_over, action, n_rails, direction):
+        rail_index = 0 if direction == 'D' else n_rails - 1
         for n in iterate_over:
             action(rail_index, n)
             if rail_index == 0:
                 direction = 'U'
-            elif rail_index == self.n_rails - 1:
+            elif rail_index == n_rails - 1:
                 direction = 'D'
             rail_index = rail_index + 1 if direction == 'U' else rail_index - 1
 
-    def encrypt(self, text):
+    def encrypt(self, text, n_rails=None, direction=None):
         """
         Returns encrypted text (str)
 
         Args:
             text (str): The text to be encrypted
+            n_rails (int|None): Number of rails used to encrypt. Defaults to ``None``, which uses the value from ``self.n_rails``
+            direction (str|None): Direction to start zigzagging. Defaults to ``None``, which uses the value from ``self.direction``
+
+        Raises:
+            ValueError: When ``direction`` doesn't start with ``'U'`` or ``'D'``
 
         Examples:
             >>> from crypyto.cipher import RailFence
@@ -443,21 +794,27 @@ class RailFence:
             'WECRLTEERDSOEEFEAOCAIVDEN'
         """
 
+        n_rails, direction = self._parameters(n_rails, direction)
         text = self.not_alnum_pattern.sub('', text) if self.only_alnum else text
-        rails = [''] * self.n_rails
+        rails = [''] * n_rails
         def add_char(rail_index, *params):
             nonlocal rails
             rails[rail_index] += params[0]
-        self._zig_zag_for(text, add_char)
+        self._zig_zag_for(text, add_char, n_rails, direction)
         cipher = ''.join(rails)
         return cipher
 
-    def decrypt(self, cipher):
+    def decrypt(self, cipher, n_rails=None, direction=None):
         """
         Returns decrypted cipher
 
         Args:
             cipher (str): The cipher to be decrypted
+            n_rails (int|None): Number of rails used to decrypt. Defaults to ``None``, which uses the value from ``self.n_rails``
+            direction (str|None): Direction to start zigzagging. Defaults to ``None``, which uses the value from ``self.direction``
+
+        Raises:
+            ValueError: When ``direction`` doesn't start with ``'U'`` or ``'D'``
 
         Examples:
             >>> from crypyto.cipher import RailFence
@@ -466,33 +823,81 @@ class RailFence:
             'WEAREDISCOVEREDFLEEATONCE'
         """
 
-        base_width, n_extra = divmod(len(cipher), self.cycle)
-        n_characters_rails = [base_width * 2 if 0 < n_rail < self.n_rails - 1 else base_width for n_rail in range(self.n_rails)] 
-        def add_n_characters(rail_index, *trash):
-            nonlocal n_characters_rails
-            n_characters_rails[rail_index] += 1
-        self._zig_zag_for(range(n_extra), add_n_characters)
-        rails = [[] for n in range(self.n_rails)]
-
-        cipher_index = 0
-        for rail_index, n_characters in enumerate(n_characters_rails):
-            rails[rail_index].extend(list(cipher[cipher_index:cipher_index + n_characters]))
-            cipher_index += n_characters
-
-        text = ''
-        def add_decrypted_char(rail_index, *trash):
-            nonlocal text
-            text += rails[rail_index].pop(0)
-        self._zig_zag_for(range(len(cipher)), add_decrypted_char)
-        return text
+        return self.decrypt_range(cipher, n_rails=n_rails, direction=direction)
+
+    def _rail_lengths(self, length, n_rails, direction):
+        cycle = n_rails * 2 - 2
+        rails = np.arange(n_rails)
+        lengths = (length - rails + cycle - 1) // cycle
+        lengths[1:-1] += (length + rails[1:-1] - 1) // cycle
+        return lengths if direction == 'D' else lengths[::-1]
+
+    def _source_indices(self, length, start, stop, n_rails, direction):
+        cycle = n_rails * 2 - 2
+        positions = np.arange(start, stop)
+        cycle_positions = positions % cycle
+        rails = np.where(cycle_positions < n_rails, cycle_positions, cycle - cycle_positions)
+        middle = (rails > 0) & (rails < n_rails - 1)
+        rail_indices = positions // cycle * np.where(middle, 2, 1) + (cycle_positions >= n_rails)
+        if direction == 'U':
+            rails = n_rails - 1 - rails
+        rail_starts = np.concatenate(([0], np.cumsum(self._rail_lengths(length, n_rails, direction))[:-1]))
+        return rails, rail_starts[rails] + rail_indices
+
+    def decrypt_range(self, cipher, start=0, stop=None, n_rails=None, direction=None):
+        """
+        Returns the decrypted characters from ``start`` to ``stop`` (str|bytes), without decrypting the rest of the cipher.
+
+        The position each plaintext character has in the cipher is calculated directly, and the characters of each rail are read in a single slice, so ``cipher`` may also be a memory-mapped or seekable file
+
+        Args:
+            cipher (str|bytes|mmap.mmap|file): The cipher to be decrypted. Files must be opened in binary mode
+            start (int): Index of the first decrypted character. Negative values count from the end. Defaults to ``0``
+            stop (int|None): Index after the last decrypted character. Negative values count from the end. Defaults to ``None``, which indicates the end of the text
+            n_rails (int|None): Number of rails used to decrypt. Defaults to ``None``, which uses the value from ``self.n_rails``
+            direction (str|None): Direction to start zigzagging. Defaults to ``None``, which uses the value from ``self.direction``
+
+        Raises:
+            ValueError: When ``direction`` doesn't start with ``'U'`` or ``'D'``
+
+        Examples:
+            >>> from crypyto.ciphers import RailFence
+            >>> rf = RailFence(n_rails=3, only_alnum=True)
+            >>> rf.decrypt_range('WECRLTEERDSOEEFEAOCAIVDEN', 5, 14)
+            'DISCOVERE'
+            >>> with open('cipher.txt', 'rb') as cipher_file:
+            ...     rf.decrypt_range(cipher_file, -4)
+            b'ONCE'
+        """
 
-    def brute_force(self, cipher, output_file=None):
+        n_rails, direction = self._parameters(n_rails, direction)
+        is_file = not hasattr(cipher, '__getitem__')
+        length = cipher.seek(0, 2) if is_file else len(cipher)
+        start, stop, _ = slice(start, stop).indices(length)
+        stop = max(start, stop)
+        rails, indices = self._source_indices(length, start, stop, n_rails, direction)
+        as_array = _code_points if isinstance(cipher, str) else partial(np.frombuffer, dtype=np.uint8)
+        text = np.zeros(stop - start, dtype='<u4' if isinstance(cipher, str) else np.uint8)
+        for rail in np.unique(rails):
+            in_rail = rails == rail
+            rail_indices = indices[in_rail]
+            first, last = int(rail_indices.min()), int(rail_indices.max())
+            if is_file:
+                cipher.seek(first)
+                piece = cipher.read(last - first + 1)
+            else:
+                piece = cipher[first:last + 1]
+            text[in_rail] = as_array(piece)[rail_indices - first]
+        return text.tobytes().decode('utf-32-le') if isinstance(cipher, str) else text.tobytes()
+
+    def brute_force(self, cipher, output_file=None, cache=None):
         """
         Prints (to stdout or specified file) all possible decrypted results
 
         Args:
             cipher (str): The cipher to be decrypted
             output_file (str|None): The filename of the file the results are gonna be printed. Defaults to ``None``, which indicated printing on stdout
+            cache (crypyto.cache.ResultCache|None): Cache the results are looked up in and stored to. Defaults to ``None``, which always computes them
 
         Examples:
             >>> from crypyto.ciphers import RailFence
@@ -514,16 +919,10 @@ class RailFence:
             print('Are you sure you want to print them all (Y/N)?')
             if not input().upper().startswith('Y'):
                 return
-        initial_direction = self.direction
-        results = ''
-        for direction in ['D', 'U']:
-            self.direction = direction
-            initial_n_rails = self.n_rails
-            for n in range(2, len(cipher)):
-                self.n_rails = n
-                results += self.decrypt(cipher) + '\n'
-            self.n_rails = initial_n_rails
-        self.direction = initial_direction
+        def compute():
+            return ''.join(self.decrypt(cipher, n_rails, direction) + '\n' for direction in ['D', 'U'] for n_rails in range(2, len(cipher)))
+
+        results = cache.get_or_compute(cache.key(self, 'brute_force', cipher), compute) if cache else compute()
         if output_file:
             with open(output_file, 'w') as out:
                 out.write(results.strip())
@@ -540,7 +939,7 @@ class Keyword:
     """
 
     def __init__(self, key, abc=string.ascii_uppercase):
-        self.abc = abc.upper()
+        self.abc = Alphabet(abc.upper())
         self.key = key
 
     @property
@@ -594,6 +993,89 @@ class Keyword:
         text = ''.join(self._key_to_abc.get(char, char) for char in cipher)
         return text
 
+    def translation_table(self, decrypt=False):
+        """
+        Returns the letter-to-letter mapping (dict) this cipher applies
+
+        Args:
+            decrypt (bool): Whether to return the decryption mapping. Defaults to ``False``
+        """
+
+        return dict(self._key_to_abc) if decrypt else dict(self._abc_to_key)
+
+    def encrypt_file(self, src, dst, workers=1):
+        """
+        Encrypts the file ``src`` into ``dst`` through a memory map, without loading it into memory. ASCII letters are uppercased and encrypted, every other byte is copied as is
+
+        Args:
+            src (str): The filename of the file to be encrypted
+            dst (str): The filename of the encrypted file
+            workers (int): Number of processes the file is split across. Defaults to ``1``, which processes it in the current process
+
+        Examples:
+            >>> from crypyto.ciphers import Keyword
+            >>> kw = Keyword('secret')
+            >>> kw.encrypt_file('export.log', 'export.log.enc')
+        """
+
+        transform_file(src, dst, TranslateKernel(byte_table(self.translation_table())), workers)
+
+    def decrypt_file(self, src, dst, workers=1):
+        """
+        Decrypts the file ``src`` into ``dst`` through a memory map, without loading it into memory. ASCII letters are uppercased and decrypted, every other byte is copied as is
+
+        Args:
+            src (str): The filename of the file to be decrypted
+            dst (str): The filename of the decrypted file
+            workers (int): Number of processes the file is split across. Defaults to ``1``, which processes it in the current process
+
+        Examples:
+            >>> from crypyto.ciphers import Keyword
+            >>> kw = Keyword('secret')
+            >>> kw.decrypt_file('export.log.enc', 'export.log')
+        """
+
+        transform_file(src, dst, TranslateKernel(byte_table(self.translation_table(True))), workers)
+
+    def dictionary_attack(self, cipher, wordlist, n_results=10, sample_size=1000, n_candidates=100, workers=1):
+        """
+        Returns the most likely (key, text, score) tuples (list) whose keyword is a word of ``wordlist``, best first.
+
+        The wordlist is memory-mapped and its words are scored in batches on a sample of the first ``sample_size`` cipher letters: the letter counts a keyword gives are the sample's letter counts moved to the places of its keyword alphabet, so nothing is decrypted yet.
+        Only the best ``n_candidates`` keywords decrypt the whole cipher, and they're ranked again by how English-like their text is, letter order included: ``score`` is the ``cryptanalysis.english_score`` of ``text`` (the lower, the better)
+
+        Args:
+            cipher (str): The cipher to be decrypted
+            wordlist (str): The filename of the wordlist, with one word per line. Only the alphabet letters of each line are used (ASCII letters in any case), so ``"O'Neil"`` is tried as ``'ONEIL'``
+            n_results (int): The number of results returned. Defaults to ``10``
+            sample_size (int): The number of cipher letters the words are first scored on. Defaults to ``1000``
+            n_candidates (int): The number of best scoring words which decrypt the whole cipher. Defaults to ``100``
+            workers (int): Number of processes the wordlist is split across. Defaults to ``1``, which scores it in the current process
+
+        Raises:
+            ValueError: When the alphabet has characters that don't fit in a single byte
+
+        Examples:
+            >>> from crypyto.ciphers import Keyword
+            >>> kw = Keyword('secret')
+            >>> cipher = kw.encrypt('Whoever has the key can read every single word of this message')
+            >>> kw.dictionary_attack(cipher, 'words.txt', workers=4)[0][:2]
+            ('SECRET', 'WHOEVER HAS THE KEY CAN READ EVERY SINGLE WORD OF THIS MESSAGE')
+        """
+
+        cipher = cipher.upper()
+        letters = self.abc.to_indices(cipher)
+        letters = letters[letters >= 0]
+        if not len(letters):
+            return []
+        scorer = KeywordScorer(np.bincount(letters[:sample_size], minlength=len(self.abc)), _english_reference(self.abc))
+        keys = scan_wordlist(wordlist, byte_indices(self.abc), scorer, n_candidates, workers)
+        decryptions = []
+        for key in keys:
+            keyword = self.abc.from_indices(key)
+            decryptions.append((keyword, cipher.translate(str.maketrans(Keyword(keyword, self.abc).translation_table(True)))))
+        return _ranked_decryptions(decryptions, n_results)
+
 class Vigenere:
     """
     `Vigenere` represents a Vigenère Cipher manipulator
@@ -624,38 +1106,36 @@ class Vigenere:
     
     @abc.setter
     def abc(self, value):
-        self._abc = value.upper()
-        self._not_abc_pattern = re.compile('[^{}]+'.format(self._abc), re.UNICODE)
+        self._abc = Alphabet(value.upper())
+        self._not_abc_pattern = re.compile('[^{}]+'.format(re.escape(self._abc)), re.UNICODE)
 
-    def _prepare_encryption(self, text, decode_unicode):
+    def _prepare_encryption(self, text, decode_unicode, key_offset=0):
         text = unidecode(text).upper() if decode_unicode else text.upper()
         text_only_abc = self._not_abc_pattern.sub('', text)
+        key_offset %= len(self.key)
+        shifted_key = self.key[key_offset:] + self.key[:key_offset]
         rpt_times, extra_letters = divmod(len(text_only_abc), len(self.key))
-        key = self.key * rpt_times + self.key[:extra_letters]
+        key = shifted_key * rpt_times + shifted_key[:extra_letters]
         return text, key
 
-    def _encrypt(self, text, decode_unicode=True, decrypt=False):
-        text, key = self._prepare_encryption(text, decode_unicode)
-        abc_index = 0
-        cipher = ''
-        for char in text:
-            if char in self.abc:
-                mul_factor = -1 if decrypt else 1
-                cipher_index = self.abc.index(char) + mul_factor * self.abc.index(key[abc_index])
-                cipher_index = cipher_index + 26 if cipher_index < 0 else cipher_index % 26
-                cipher += self.abc[cipher_index]
-                abc_index += 1
-            else:
-                cipher += char
+    def _encrypt(self, text, decode_unicode=True, decrypt=False, key_offset=0):
+        text, key = self._prepare_encryption(text, decode_unicode, key_offset)
+        indices = self.abc.to_indices(text)
+        is_letter = indices >= 0
+        mul_factor = -1 if decrypt else 1
+        cipher_codes = _code_points(text).copy()
+        cipher_codes[is_letter] = self.abc.codes[(indices[is_letter] + mul_factor * self.abc.to_indices(key)) % len(self.abc)]
+        cipher = cipher_codes.tobytes().decode('utf-32-le')
         return cipher
 
-    def encrypt(self, text, decode_unicode=True):
+    def encrypt(self, text, decode_unicode=True, key_offset=0):
         """
         Returns encrypted text (str)
 
         Args:
             text (str): Text to be encrypted
             decode_unicode (bool): Whether the text should have unicode characters converted to ascii before encrypting. Defaults to ``True``
+            key_offset (int): Number of alphabet letters that came before ``text``, so the key starts at the right position. Defaults to ``0``
         
         Examples:
             >>> from crypyto.ciphers import Vigenere
@@ -664,15 +1144,16 @@ class Vigenere:
             'ZINCS, PGVNU!'
         """
 
-        return self._encrypt(text, decode_unicode, False)
+        return self._encrypt(text, decode_unicode, False, key_offset)
 
-    def decrypt(self, cipher, decode_unicode=True):
+    def decrypt(self, cipher, decode_unicode=True, key_offset=0):
         """
         Returns decrypted cipher
 
         Args:
             cipher (str): Cipher to be decrypted
             decode_unicode (bool): Whether the cipher should have unicode characters converted to ascii before decrypting. Defaults to ``True``
+            key_offset (int): Number of alphabet letters that came before ``cipher``, so the key starts at the right position. Defaults to ``0``
         
         Examples:
             >>> from crypyto.ciphers import Vigenere
@@ -681,7 +1162,236 @@ class Vigenere:
             'HELLO, WORLD!'
         """
 
-        return self._encrypt(cipher, decode_unicode, True)
+        return self._encrypt(cipher, decode_unicode, True, key_offset)
+
+    def _key_shifts(self, decrypt):
+        shifts = np.array([self.abc.index(letter) for letter in self.key], dtype=np.intp)
+        return -shifts if decrypt else shifts
+
+    def _byte_table(self):
+        return byte_table()
+
+    def _file_kernel(self, decrypt):
+        return ShiftKernel(self._byte_table(), self.abc.encode('latin-1'), self._key_shifts(decrypt))
+
+    def encrypt_file(self, src, dst, workers=1, index=None):
+        """
+        Encrypts the file ``src`` into ``dst`` through a memory map, without loading it into memory. ASCII letters are uppercased and encrypted, every other byte is copied as is
+
+        Args:
+            src (str): The filename of the file to be encrypted
+            dst (str): The filename of the encrypted file
+            workers (int): Number of processes the file is split across. Defaults to ``1``, which processes it in the current process
+            index (str|None): The filename of a sidecar index to be written along, which makes ``decrypt_at`` seek into either file. Defaults to ``None``
+
+        Raises:
+            ValueError: When the alphabet has characters that don't fit in a single byte
+
+        Examples:
+            >>> from crypyto.ciphers import Vigenere
+            >>> v = Vigenere('secret')
+            >>> v.encrypt_file('export.log', 'export.log.enc', index='export.log.enc.idx')
+        """
+
+        window_counts = transform_file(src, dst, self._file_kernel(False), workers)
+        if index:
+            write_index(index, window_counts, os.path.getsize(src))
+
+    def decrypt_file(self, src, dst, workers=1, index=None):
+        """
+        Decrypts the file ``src`` into ``dst`` through a memory map, without loading it into memory. ASCII letters are uppercased and decrypted, every other byte is copied as is
+
+        Args:
+            src (str): The filename of the file to be decrypted
+            dst (str): The filename of the decrypted file
+            workers (int): Number of processes the file is split across. Defaults to ``1``, which processes it in the current process
+            index (str|None): The filename of a sidecar index to be written along, which makes ``decrypt_at`` seek into either file. Defaults to ``None``
+
+        Raises:
+            ValueError: When the alphabet has characters that don't fit in a single byte
+
+        Examples:
+            >>> from crypyto.ciphers import Vigenere
+            >>> v = Vigenere('secret')
+            >>> v.decrypt_file('export.log.enc', 'export.log')
+        """
+
+        window_counts = transform_file(src, dst, self._file_kernel(True), workers)
+        if index:
+            write_index(index, window_counts, os.path.getsize(src))
+
+    def build_index(self, filename, index, interval=WINDOW_SIZE):
+        """
+        Writes a sidecar index of the file ``filename``, which stores the number of alphabet letters before every ``interval`` bytes. The index is the same for the encrypted and the decrypted file
+
+        Args:
+            filename (str): The filename of the indexed file
+            index (str): The filename of the sidecar index
+            interval (int): The number of bytes between checkpoints. Defaults to 256 KiB
+
+        Examples:
+            >>> from crypyto.ciphers import Vigenere
+            >>> v = Vigenere('secret')
+            >>> v.build_index('export.log.enc', 'export.log.enc.idx')
+        """
+
+        index_file(filename, index, self._file_kernel(True), interval)
+
+    def decrypt_at(self, filename, offset, length, index=None):
+        """
+        Returns ``length`` bytes of the encrypted file ``filename``, starting at byte ``offset``, decrypted (bytes).
+        Only the requested bytes are decrypted: the key position is found from the nearest checkpoint of ``index``, so just the bytes since that checkpoint are counted
+
+        Args:
+            filename (str): The filename of the encrypted file
+            offset (int): The position of the first decrypted byte
+            length (int): The maximum number of decrypted bytes
+            index (str|None): The filename of the sidecar index of the file. Defaults to ``None``, which counts every letter before ``offset``
+
+        Raises:
+            ValueError: When ``offset`` or ``length`` is negative
+            ValueError: When ``index`` was built for a file of a different size
+
+        Examples:
+            >>> from crypyto.ciphers import Vigenere
+            >>> v = Vigenere('secret')
+            >>> v.encrypt_file('export.log', 'export.log.enc', index='export.log.enc.idx')
+            >>> v.decrypt_at('export.log.enc', 1 << 30, 16, 'export.log.enc.idx')
+            b'GET /INDEX.HTML '
+        """
+
+        return transform_range(filename, offset, length, self._file_kernel(True), index)
+
+    def _key_letters(self):
+        return self.abc
+
+    def _plain_indices(self):
+        return np.arange(len(self.abc))
+
+    def _key_table(self):
+        key_letters = self._key_letters()
+        shifts = type(self)(key_letters, self.abc)._key_shifts(False)
+        key_of = np.full((len(self.abc), len(self.abc)), -1, dtype=np.intp)
+        key_of[(self._plain_indices()[None, :] + shifts[:, None]) % len(self.abc), np.arange(len(self.abc))[None, :]] = np.arange(len(key_letters))[:, None]
+        return key_of
+
+    def _key_weights(self):
+        return np.log(_english_reference(self.abc) * len(self.abc))
+
+    def _key_text(self, key_indices):
+        key_letters = self._key_letters()
+        return ''.join(key_letters[index] for index in key_indices)
+
+    def dictionary_attack(self, cipher, wordlist, n_results=10, sample_size=1000, n_candidates=100, workers=1, decode_unicode=True):
+        """
+        Returns the most likely (key, text, score) tuples (list) whose key is a word of ``wordlist``, best first.
+
+        The wordlist is memory-mapped and its words are scored in batches on a sample of the first ``sample_size`` cipher letters: the letter counts a key gives are added up from per-column count tables of the sample, so nothing is decrypted yet.
+        Only the best ``n_candidates`` keys decrypt the whole cipher, and they're ranked again by how English-like their text is, letter order included: ``score`` is the ``cryptanalysis.english_score`` of ``text`` (the lower, the better).
+        ``Beaufort`` and ``Gronsfeld`` score their own keys (``Gronsfeld`` takes the digits of each line)
+
+        Args:
+            cipher (str): The cipher to be decrypted
+            wordlist (str): The filename of the wordlist, with one word per line. Only the alphabet letters of each line are used (ASCII letters in any case), so ``"O'Neil"`` is tried as ``'ONEIL'``
+            n_results (int): The number of results returned. Defaults to ``10``
+            sample_size (int): The number of cipher letters the words are first scored on. Defaults to ``1000``
+            n_candidates (int): The number of best scoring words which decrypt the whole cipher. Defaults to ``100``
+            workers (int): Number of processes the wordlist is split across. Defaults to ``1``, which scores it in the current process
+            decode_unicode (bool): Whether the cipher should have unicode characters converted to ascii before decrypting. Defaults to ``True``
+
+        Raises:
+            ValueError: When the alphabet has characters that don't fit in a single byte
+
+        Examples:
+            >>> from crypyto.ciphers import Vigenere
+            >>> v = Vigenere('lemon')
+            >>> cipher = v.encrypt('Whoever has the key can read every single word of this message')
+            >>> v.dictionary_attack(cipher, 'words.txt', workers=4)[0][:2]
+            ('LEMON', 'WHOEVER HAS THE KEY CAN READ EVERY SINGLE WORD OF THIS MESSAGE')
+        """
+
+        cipher = unidecode(cipher).upper() if decode_unicode else cipher.upper()
+        letters = self.abc.to_indices(cipher)
+        letters = letters[letters >= 0]
+        if not len(letters):
+            return []
+        scorer = ShiftScorer(letters[:sample_size], self._key_table(), _english_reference(self.abc))
+        keys = scan_wordlist(wordlist, byte_indices(self._key_letters()), scorer, n_candidates, workers)
+        decryptions = []
+        for key in keys:
+            key = self._key_text(key)
+            decryptions.append((key, type(self)(key, self.abc).decrypt(cipher, False)))
+        return _ranked_decryptions(decryptions, n_results)
+
+    def crib_drag(self, cipher, cribs, n_results=10, max_period=20, decode_unicode=True):
+        """
+        Returns the most likely placements of known plaintext words (cribs) in ``cipher`` as CribMatch (crib, offset, fragment, period, key, score) tuples (list), best first.
+
+        Each crib is slid across every position of the cipher at once: for each crib letter, the key letter it implies at every position is looked up in a single NumPy operation over the cipher letters, so the memory used only grows linearly with the cipher size and the ``fragment`` of key letters is never built for most positions.
+        A placement is scored by how periodic its fragment is (``period`` is the shortest period up to ``max_period`` it repeats with, or ``None``) and how close the key letters are to English ones: ``score`` is minus the log-likelihood ratio of the fragment against random key letters, the lower, the better.
+        When a period is found, ``key`` is the whole key, assuming it starts at the first letter of the cipher (otherwise it's ``None``). ``offset`` is the index of the first crib letter in the cipher (after unicode characters are converted, if ``decode_unicode``).
+        ``Beaufort`` and ``Gronsfeld`` derive their own key letters, and ``Gronsfeld`` only keeps placements whose key is made of digits
+
+        Args:
+            cipher (str): The cipher where the cribs are searched
+            cribs (str|iterable): A probable word (or phrase) of the plaintext, or an iterable of them. Only their alphabet letters are used
+            n_results (int): The number of results returned. Defaults to ``10``
+            max_period (int): The longest key period looked for. Defaults to ``20``
+            decode_unicode (bool): Whether the cipher and cribs should have unicode characters converted to ascii. Defaults to ``True``
+
+        Examples:
+            >>> from crypyto.ciphers import Vigenere
+            >>> v = Vigenere('lemon')
+            >>> cipher = v.encrypt('Meet me at the usual place at ten rather than eight, we attack at dawn')
+            >>> best = v.crib_drag(cipher, ['attack at dawn', 'retreat'])[0]
+            >>> best.crib, best.offset, best.fragment, best.key
+            ('attack at dawn', 56, 'ONLEMONLEMON', 'LEMON')
+        """
+
+        text = unidecode(cipher).upper() if decode_unicode else cipher.upper()
+        indices = self.abc.to_indices(text)
+        positions = np.flatnonzero(indices >= 0)
+        letters = indices[positions].astype(np.int32)
+        key_of = self._key_table()
+        weights = np.append(self._key_weights(), -np.inf)
+        candidates = []
+        for crib_index, crib in enumerate([cribs] if isinstance(cribs, str) else cribs):
+            crib_letters = self.abc.to_indices(unidecode(crib).upper() if decode_unicode else crib.upper())
+            crib_letters = crib_letters[crib_letters >= 0].astype(np.int32)
+            length = len(crib_letters)
+            if not length or length > len(letters):
+                continue
+            count = len(letters) - length + 1
+            key_tables = key_of[:, crib_letters].T
+            scores = np.zeros(count)
+            for column in range(length):
+                scores -= weights[key_tables[column]][letters[column:column + count]]
+
+            first_column = key_tables[0][letters[:count]]
+            periods = np.zeros(count, dtype=np.intp)
+            for period in range(min(max_period, length - 1), 0, -1):
+                offsets = np.flatnonzero(key_tables[period][letters[period:period + count]] == first_column)
+                for column in range(1, length - period):
+                    offsets = offsets[key_tables[column + period][letters[offsets + column + period]] == key_tables[column][letters[offsets + column]]]
+                periods[offsets] = period
+            periodic = np.flatnonzero(periods)
+            for block_start in range(0, len(periodic), max(1, _CRIB_BLOCK // length)):
+                offsets = periodic[block_start:block_start + max(1, _CRIB_BLOCK // length)]
+                fragments = key_of[letters[offsets[:, None] + np.arange(length)], crib_letters]
+                plausibility = np.cumsum(weights[fragments], axis=1)[np.arange(len(offsets)), periods[offsets] - 1]
+                scores[offsets] = -(plausibility + (length - periods[offsets]) * log(len(self.abc)))
+
+            best = np.flatnonzero(np.isfinite(scores))
+            if len(best) > n_results:
+                best = best[np.argpartition(scores[best], n_results)[:n_results]]
+            candidates.extend((float(scores[offset]), crib_index, int(offset), crib, crib_letters, int(periods[offset])) for offset in best)
+
+        results = []
+        for score, _, offset, crib, crib_letters, period in sorted(candidates, key=lambda candidate: candidate[:3])[:n_results]:
+            fragment = key_of[letters[offset:offset + len(crib_letters)], crib_letters]
+            key = self._key_text(fragment[(np.arange(period) - offset) % period]) if period else None
+            results.append(CribMatch(crib, int(positions[offset]), self._key_text(fragment), period or None, key, score))
+        return results
 
 class Beaufort(Vigenere):
     """
@@ -706,13 +1416,14 @@ class Beaufort(Vigenere):
         value = unidecode(value.upper()) if self._decode_unicode_key else value.upper()
         self._key = self._atbash.encrypt(self._not_abc_pattern.sub('', value))
 
-    def encrypt(self, text, decode_unicode=True):
+    def encrypt(self, text, decode_unicode=True, key_offset=0):
         """
         Returns encrypted text (str)
 
         Args:
             text (str): The text to be encrypted
             decode_unicode (bool): Whether the text should have unicode characters converted to ascii before encrypting. Defaults to ``True``
+            key_offset (int): Number of alphabet letters that came before ``text``, so the key starts at the right position. Defaults to ``0``
         
         Examples:
             >>> from crypyto.ciphers import Beaufort
@@ -721,15 +1432,16 @@ class Beaufort(Vigenere):
             'LARGQ, XENRO!'
         """
 
-        return self._encrypt(self._atbash.encrypt(text), decode_unicode, True)
+        return self._encrypt(self._atbash.encrypt(text), decode_unicode, True, key_offset)
 
-    def decrypt(self, cipher, decode_unicode=True):
+    def decrypt(self, cipher, decode_unicode=True, key_offset=0):
         """
         Returns decrypted cipher (str)
 
         Args:
             cipher (str): The cipher to be decrypted
             decode_unicode (bool): Whether the cipher should have unicode characters converted to ascii before decrypting. Defaults to ``True``
+            key_offset (int): Number of alphabet letters that came before ``cipher``, so the key starts at the right position. Defaults to ``0``
         
         Examples:
             >>> from crypyto.ciphers import Beaufort
@@ -738,7 +1450,16 @@ class Beaufort(Vigenere):
             'HELLO, WORLD!'
         """
 
-        return self.encrypt(cipher, decode_unicode)
+        return self.encrypt(cipher, decode_unicode, key_offset)
+
+    def _key_shifts(self, decrypt):
+        return -super()._key_shifts(False)
+
+    def _plain_indices(self):
+        return np.arange(len(self.abc))[::-1]
+
+    def _byte_table(self):
+        return byte_table(self._atbash.translation_table())
 
 class Gronsfeld(Vigenere):
     """
@@ -760,9 +1481,11 @@ class Gronsfeld(Vigenere):
     
     @abc.setter
     def abc(self, value):
-        self._abc = value.upper()
-        self._not_abc_pattern = re.compile('[^{}]+'.format(self._abc), re.UNICODE)
+        self._abc = Alphabet(value.upper())
+        self._not_abc_pattern = re.compile('[^{}]+'.format(re.escape(self._abc)), re.UNICODE)
         self._caesar = Caesar(value)
+        self._encrypt_tables = {str(digit):self._caesar.translation_table(key=digit) for digit in range(10)}
+        self._decrypt_tables = {str(digit):self._caesar.translation_table(True, digit) for digit in range(10)}
 
     @property
     def key(self):
@@ -772,27 +1495,31 @@ class Gronsfeld(Vigenere):
     def key(self, value):
         self._key = self.only_num_pattern.sub('', value)
 
-    def _encrypt(self, text, decode_unicode=True, decrypt=False):
-        text, key = self._prepare_encryption(text, decode_unicode)
-        abc_index = 0
-        cipher = ''
-        for char in text:
-            if char in self.abc:
-                caesar_key = int(key[abc_index])
-                cipher_char = self._caesar.decrypt(char, key=caesar_key) if decrypt else self._caesar.encrypt(char, key=caesar_key)
-                cipher += cipher_char
-                abc_index += 1
-            else:
-                cipher += char
+    def _encrypt(self, text, decode_unicode=True, decrypt=False, key_offset=0):
+        text, key = self._prepare_encryption(text, decode_unicode, key_offset)
+        tables = self._decrypt_tables if decrypt else self._encrypt_tables
+        key_digits = iter(key)
+        cipher = ''.join(tables[next(key_digits)][char] if char in self._encrypt_tables['0'] else char for char in text)
         return cipher
 
-    def encrypt(self, text, decode_unicode=True):
+    def _key_shifts(self, decrypt):
+        shifts = np.array([int(digit) for digit in self.key], dtype=np.intp)
+        return -shifts if decrypt else shifts
+
+    def _key_weights(self):
+        return np.full(10, log(len(self.abc) / 10))
+
+    def _key_letters(self):
+        return string.digits
+
+    def encrypt(self, text, decode_unicode=True, key_offset=0):
         """
         Returns encrypted text (str)
 
         Args:
             text (str): The text to be encrypted
             decode_unicode (bool): Whether the text should have unicode characters converted to ascii before encrypting. Defaults to ``True``
+            key_offset (int): Number of alphabet letters that came before ``text``, so the key starts at the right position. Defaults to ``0``
         
         Examples:
             >>> from crypyto.ciphers import Gronsfeld
@@ -801,15 +1528,16 @@ class Gronsfeld(Vigenere):
             'JHMSQ, ZPYNG!'
         """
 
-        return self._encrypt(text, decode_unicode, False)
+        return self._encrypt(text, decode_unicode, False, key_offset)
 
-    def decrypt(self, cipher, decode_unicode=True):
+    def decrypt(self, cipher, decode_unicode=True, key_offset=0):
         """
         Returns decrypted cipher (str)
 
         Args:
             cipher (str): The cipher to be decrypted
             decode_unicode (bool): Whether the text should have unicode characters converted to ascii before encrypting. Defaults to ``True``
+            key_offset (int): Number of alphabet letters that came before ``cipher``, so the key starts at the right position. Defaults to ``0``
         
         Examples:
             >>> from crypyto.ciphers import Gronsfeld
@@ -818,4 +1546,51 @@ class Gronsfeld(Vigenere):
             'HELLO, WORLD!'
         """
 
-        return self._encrypt(cipher, decode_unicode, True)
\ No newline at end of file
+        return self._encrypt(cipher, decode_unicode, True, key_offset)
+
+    def crack(self, cipher, max_key_length=4, n_results=10, n_candidates=100, decode_unicode=True, cache=None):
+        """
+        Returns the most likely (key, text, score) tuples (list) among every numeric key up to ``max_key_length`` digits, best first.
+
+        The letter counts of all those keys are built at once and scored with the chi-squared statistic against English letter frequencies, so nothing is decrypted yet.
+        Only the best ``n_candidates`` keys of each length decrypt the whole cipher, and they're ranked again by how English-like their text is, letter order included: ``score`` is the ``cryptanalysis.english_score`` of ``text`` (the lower, the better)
+
+        Args:
+            cipher (str): The cipher to be decrypted
+            max_key_length (int): The maximum number of digits of the tried keys. All ``10 ** max_key_length`` keys are scored, so keep it small. Defaults to ``4``
+            n_results (int): The number of results returned. Defaults to ``10``
+            n_candidates (int): The number of best scoring keys of each length which decrypt the whole cipher. Defaults to ``100``
+            decode_unicode (bool): Whether the cipher should have unicode characters converted to ascii before decrypting. Defaults to ``True``
+            cache (crypyto.cache.ResultCache|None): Cache the results are looked up in and stored to. Defaults to ``None``, which always computes them
+
+        Examples:
+            >>> from crypyto.ciphers import Gronsfeld
+            >>> g = Gronsfeld('2317')
+            >>> cipher = g.encrypt('Whoever has the key can read every single word of this message')
+            >>> g.crack(cipher)[0][:2]
+            ('2317', 'WHOEVER HAS THE KEY CAN READ EVERY SINGLE WORD OF THIS MESSAGE')
+        """
+
+        if cache:
+            key = cache.key(self, 'crack', cipher, abc=self.abc, max_key_length=max_key_length, n_results=n_results, n_candidates=n_candidates, decode_unicode=decode_unicode)
+            return cache.get_or_compute(key, lambda: self.crack(cipher, max_key_length, n_results, n_candidates, decode_unicode))
+
+        cipher = unidecode(cipher).upper() if decode_unicode else cipher.upper()
+        letters = self.abc.to_indices(cipher)
+        letters = letters[letters >= 0]
+        if not len(letters):
+            return []
+        expected = len(letters) * _english_reference(self.abc)
+        candidates = []
+        for key_length in range(1, max_key_length + 1):
+            counts = np.zeros((1, len(self.abc)))
+            for column in range(key_length):
+                column_counts = np.bincount(letters[column::key_length], minlength=len(self.abc))
+                shifted_counts = np.stack([np.roll(column_counts, -digit) for digit in range(10)])
+                counts = (counts[:, None, :] + shifted_counts).reshape(-1, len(self.abc))
+            scores = ((counts - expected) ** 2 / expected).sum(axis=1)
+            best = np.argsort(scores, kind='stable')[:n_candidates]
+            candidates.extend((float(scores[index]), str(index).zfill(key_length)) for index in best)
+
+        decryptions = ((key, Gronsfeld(key, self.abc).decrypt(cipher, False)) for _, key in sorted(candidates))
+        return _ranked_decryptions(decryptions, n_results)
@@ -0,0 +1,263 @@
+"""
+This module provides a cipher identifier, which classifies an unknown ciphertext and runs only the matching solver
+"""
+
+import re
+import string
+from collections import namedtuple
+from math import gcd
+import numpy as np
+from unidecode import unidecode
+from .ciphers import ENGLISH_FREQUENCIES, _english_score, Alphabet, PolybiusSquare, Atbash, Caesar, Affine, RailFence, Vigenere, Beaufort, Gronsfeld
+from .substitution_alphabets import Morse, Binary
+from .frequency_analysis import FrequencyCounter
+
+class Candidate(namedtuple('Candidate', ['cipher', 'key', 'text', 'score'])):
+    """
+    `Candidate` represents a decryption found by ``solve``: the cipher manipulator, its key, the decrypted text and its ``english_score``.
+    Candidates are equal when their cipher classes, keys, texts and scores are, even if their manipulators are different instances (e.g. rebuilt from a cache)
+    """
+
+    __slots__ = ()
+
+    def _fields_compared(self):
+        return (type(self.cipher), self.key, self.text, self.score)
+
+    def __eq__(self, other):
+        if not isinstance(other, Candidate):
+            return NotImplemented
+        return self._fields_compared() == other._fields_compared()
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self._fields_compared())
+
+FAMILIES = ('morse', 'binary', 'polybius', 'monoalphabetic', 'polyalphabetic', 'transposition')
+
+ENGLISH_IOC = 0.0667
+
+_ABC = Alphabet(string.ascii_uppercase)
+_REFERENCE = np.array([ENGLISH_FREQUENCIES[letter] for letter in _ABC]) / sum(ENGLISH_FREQUENCIES.values())
+_POLYBIUS_PATTERN = re.compile(r'\s*(\d+)[xX](\d+)#[\d\-;\s]*$')
+_MORSE_CHARACTERS = set('.-/')
+_MIN_MORSE_FRACTION = 0.8
+_BINARY_DIGITS = ((2, set('01')), (8, set('01234567')), (16, set(string.hexdigits)), (32, set(string.ascii_uppercase + '234567=')), (64, set(string.ascii_letters + string.digits + '+/=')))
+_PRINTABLE = set(string.printable)
+_MIN_BLOCK_TEXT = 8
+
+def english_score(text):
+    """
+    Returns how far ``text`` is from English (float), the lower, the more English-like.
+    It adds the chi-squared statistic of the letters (per letter) to the share of adjacent letter pairs which aren't common English bigrams, so letter order matters too
+
+    Args:
+        text (str): The text to be scored. Only ASCII letters are taken into account
+
+    Examples:
+        >>> from crypyto.cryptanalysis import english_score
+        >>> english_score('WE ARE DISCOVERED, FLEE AT ONCE') < english_score('WECRLTEERDSOEEFEAOCAIVDEN')
+        True
+    """
+
+    return _english_score(text)
+
+def _binary_decryption(cipher):
+    characters = set(cipher) - set(string.whitespace)
+    for base, digits in _BINARY_DIGITS:
+        if characters <= digits:
+            try:
+                text = Binary(base=base).decrypt(' '.join(cipher.split()))
+            except ValueError:
+                continue
+            if base == 2:
+                return base, text
+            min_length = _MIN_BLOCK_TEXT if base in (32, 64) else 1
+            if len(text) >= min_length and sum(char in _PRINTABLE for char in text) >= 0.9 * len(text):
+                return base, text
+    return None
+
+def identify(cipher):
+    """
+    Returns the likely cipher families of ``cipher`` (list), most likely first. The families are ``'morse'``, ``'binary'``, ``'polybius'``, ``'monoalphabetic'``, ``'polyalphabetic'`` and ``'transposition'``.
+
+    Morse outputs are recognized by their characters, at least 80% of which must be dots, dashes or slashes (characters Morse has no code for are kept as they are), and Polybius Square outputs by their pattern. Binary outputs are recognized by their digits in any base of ``Binary``: base 2 by its characters only, and bases 8, 16, 32 and 64 only when they decode to mostly printable ASCII (at least 8 characters for Base32 and Base64), so letter ciphertexts aren't mistaken for them. Letter ciphertexts are classified by their index of coincidence, which substitutions and transpositions keep close to English but polyalphabetic ciphers flatten, and by their letter frequencies, which only transpositions keep close to English
+
+    Args:
+        cipher (str): The ciphertext
+
+    Examples:
+        >>> from crypyto.cryptanalysis import identify
+        >>> identify('.... . .-.. .-.. --- --..-- / .-- --- .-. .-.. -.. -.-.--')
+        ['morse']
+        >>> identify('5x5#3-2;5-1;1-3;1-3;4-3')
+        ['polybius']
+        >>> identify('48 65 6c 6c 6f 2c 20 77 6f 72 6c 64 21')
+        ['binary']
+    """
+
+    characters = set(cipher) - set(string.whitespace)
+    if not characters:
+        return []
+    if _POLYBIUS_PATTERN.match(cipher):
+        return ['polybius']
+    if _binary_decryption(cipher):
+        return ['binary']
+    symbols = [char for char in cipher if char not in string.whitespace]
+    if sum(char in _MORSE_CHARACTERS for char in symbols) >= _MIN_MORSE_FRACTION * len(symbols):
+        return ['morse']
+
+    counter = FrequencyCounter(max_ngram=1, max_period=1)
+    counter.update(cipher)
+    if counter.n_letters < 2:
+        return []
+    ioc = counter.index_of_coincidence()
+    chi_squared = counter.chi_squared() / counter.n_letters
+    if ioc < 0.85 * ENGLISH_IOC:
+        return ['polyalphabetic', 'monoalphabetic', 'transposition']
+    if chi_squared < 0.5:
+        return ['transposition', 'monoalphabetic', 'polyalphabetic']
+    return ['monoalphabetic', 'transposition', 'polyalphabetic']
+
+def _solve_morse(cipher, **options):
+    morse = Morse()
+    yield morse, None, morse.decrypt(cipher)
+
+def _solve_binary(cipher, **options):
+    decryption = _binary_decryption(cipher)
+    if decryption:
+        base, text = decryption
+        yield Binary(base=base), base, text
+
+def _solve_polybius(cipher, **options):
+    width, height = (int(size) for size in _POLYBIUS_PATTERN.match(cipher).groups())
+    try:
+        square = PolybiusSquare(width, height)
+        yield square, (width, height), square.decrypt(cipher)
+    except ValueError:
+        return
+
+def _solve_monoalphabetic(cipher, **options):
+    text = unidecode(cipher).upper()
+    manipulators = [(Atbash(), None)]
+    manipulators.extend((Caesar(key=key), key) for key in range(1, len(_ABC)))
+    manipulators.extend((Affine(a, b), (a, b)) for a in range(1, len(_ABC)) if gcd(a, len(_ABC)) == 1 for b in range(len(_ABC)))
+    for manipulator, key in manipulators:
+        yield manipulator, key, text.translate(str.maketrans(manipulator.translation_table(True)))
+
+def _decryption_permutations(cipher_class, keys):
+    return np.stack([_ABC.to_indices(cipher_class(key).decrypt(_ABC, False)) for key in keys])
+
+def _period_evidence(columns):
+    counts = np.array([column.sum() for column in columns], dtype=np.float64)
+    pairs = counts * (counts - 1) / 2
+    coincidences = np.array([(column * (column - 1)).sum() / 2 for column in columns], dtype=np.float64)
+    random_ioc = 1 / len(_ABC)
+    return float((coincidences * np.log(ENGLISH_IOC / random_ioc) + (pairs - coincidences) * np.log((1 - ENGLISH_IOC) / (1 - random_ioc))).sum())
+
+def _solve_polyalphabetic(cipher, max_period=20, n_periods=3, **options):
+    text = unidecode(cipher).upper()
+    indices = _ABC.to_indices(text)
+    letters = indices[indices >= 0]
+    if not len(letters):
+        return
+    counter = FrequencyCounter(max_ngram=1, max_period=max(1, min(max_period, len(letters) // 2)))
+    counter.update(text)
+    periods = sorted(counter.columns, key=lambda period: -_period_evidence(counter.columns[period]))[:n_periods]
+    families = [(Gronsfeld, list(string.digits)), (Vigenere, list(_ABC)), (Beaufort, list(_ABC))]
+    for cipher_class, keys in families:
+        permutations = _decryption_permutations(cipher_class, keys)
+        for period in periods:
+            key = ''
+            for column in range(period):
+                counts = np.bincount(letters[column::period], minlength=len(_ABC))
+                text_counts = np.zeros(permutations.shape)
+                text_counts[np.arange(len(keys))[:, None], permutations] = counts
+                expected = counts.sum() * _REFERENCE
+                key += keys[int(np.argmin(((text_counts - expected) ** 2 / expected).sum(axis=1)))]
+            manipulator = cipher_class(key)
+            yield manipulator, key, manipulator.decrypt(text, False)
+
+def _solve_transposition(cipher, max_rails=30, **options):
+    for direction in ['D', 'U']:
+        for n_rails in range(2, max(2, min(max_rails, len(cipher) - 1)) + 1):
+            rail_fence = RailFence(n_rails, direction=direction)
+            yield rail_fence, (n_rails, direction), rail_fence.decrypt(cipher)
+
+_MANIPULATORS = {
+    'Morse': lambda key: Morse(),
+    'Binary': lambda key: Binary(base=key),
+    'PolybiusSquare': lambda key: PolybiusSquare(*key),
+    'Atbash': lambda key: Atbash(),
+    'Caesar': lambda key: Caesar(key=key),
+    'Affine': lambda key: Affine(*key),
+    'RailFence': lambda key: RailFence(key[0], direction=key[1]),
+    'Vigenere': Vigenere,
+    'Beaufort': Beaufort,
+    'Gronsfeld': Gronsfeld,
+}
+
+_SOLVERS = {
+    'morse': _solve_morse,
+    'binary': _solve_binary,
+    'polybius': _solve_polybius,
+    'monoalphabetic': _solve_monoalphabetic,
+    'polyalphabetic': _solve_polyalphabetic,
+    'transposition': _solve_transposition,
+}
+
+def solve(cipher, family=None, n_results=10, cache=None, **options):
+    """
+    Returns the most likely decryptions of ``cipher`` as Candidate (cipher, key, text, score) tuples (list), best first.
+    Only the solver of the most likely family (see ``identify``) is run, unless ``family`` is given. ``score`` is the ``english_score`` of ``text``
+
+    The solvers are:
+        - ``'morse'``, ``'binary'`` and ``'polybius'``: decode the ciphertext (``key`` is ``None``, the base of ``Binary`` or the square size)
+        - ``'monoalphabetic'``: tries every ``Atbash``, ``Caesar`` and ``Affine`` key (``Keyword`` keys can't be enumerated without a wordlist)
+        - ``'polyalphabetic'``: for the ``n_periods`` periods (up to ``max_period``) whose key columns are the most likely English, finds the ``Vigenere``, ``Beaufort`` and ``Gronsfeld`` keys whose columns best match English letter frequencies
+        - ``'transposition'``: tries every ``RailFence`` of up to ``max_rails`` rails in both directions
+
+    Args:
+        cipher (str): The ciphertext
+        family (str|None): The family whose solver is run. Defaults to ``None``, which uses the most likely family
+        n_results (int): The maximum number of results returned. Defaults to ``10``
+        cache (crypyto.cache.ResultCache|None): Cache the results are looked up in and stored to, as the cipher class name, key, text and score of each candidate (the manipulators are rebuilt from them). Defaults to ``None``, which always computes them
+        **options: Options of the solver (``max_period`` and ``n_periods`` of ``'polyalphabetic'``, ``max_rails`` of ``'transposition'``)
+
+    Raises:
+        ValueError: When ``family`` is unknown
+
+    Examples:
+        >>> from crypyto.ciphers import Vigenere
+        >>> from crypyto.cryptanalysis import solve
+        >>> cipher = Vigenere('lemon').encrypt('Whoever has the key can read every single word of this message, and so can anyone patient enough to count letters')
+        >>> best = solve(cipher)[0]
+        >>> best.key
+        'LEMON'
+        >>> best.text
+        'WHOEVER HAS THE KEY CAN READ EVERY SINGLE WORD OF THIS MESSAGE, AND SO CAN ANYONE PATIENT ENOUGH TO COUNT LETTERS'
+    """
+
+    if cache:
+        key = cache.key(None, 'cryptanalysis.solve', cipher, family=family, n_results=n_results, **options)
+        records = cache.get_or_compute(key, lambda: [(type(candidate.cipher).__name__, candidate.key, candidate.text, candidate.score) for candidate in solve(cipher, family, n_results, **options)])
+        return [Candidate(_MANIPULATORS[name](key), key, text, score) for name, key, text, score in records]
+
+    if family is None:
+        families = identify(cipher)
+        if not families:
+            return []
+        family = families[0]
+    if family not in _SOLVERS:
+        raise ValueError('family must be one of: {}'.format(', '.join(FAMILIES)))
+
+    results = []
+    seen_texts = set()
+    for manipulator, key, text in _SOLVERS[family](cipher, **options):
+        if text not in seen_texts:
+            seen_texts.add(text)
+            results.append(Candidate(manipulator, key, text, english_score(text)))
+    results.sort(key=lambda candidate: candidate.score)
+    return results[:n_results]
\ No newline at end of file
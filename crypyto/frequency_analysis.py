@@ -0,0 +1,179 @@
+"""
+This module provides frequency analysis tools, the starting point of classical cryptanalysis
+"""
+
+import string
+from itertools import product
+import numpy as np
+from unidecode import unidecode
+from .ciphers import ENGLISH_FREQUENCIES
+from ._fileio import byte_table, WINDOW_SIZE
+
+class FrequencyCounter:
+    """
+    `FrequencyCounter` represents incremental letter statistics of a text, which may be fed in chunks of any size.
+
+    Only the letters of ``abc`` are counted (everything else is skipped), so n-grams and key columns ignore spaces and punctuation, just like the Vigenère family does.
+
+    Args:
+        abc (str): The alphabet whose letters are counted. Must only have single-byte characters. Defaults to ``string.ascii_uppercase``
+        max_ngram (int): The longest n-gram counted (1 to 3). Counting n-grams takes ``len(abc) ** max_ngram`` counters. Defaults to ``3``
+        max_period (int): The longest key period whose per-column counts are kept. Defaults to ``20``
+
+    Raises:
+        ValueError: When ``abc`` has characters that don't fit in a single byte
+        ValueError: When ``max_ngram`` isn't between 1 and 3
+
+    Examples:
+        >>> from crypyto.frequency_analysis import FrequencyCounter
+        >>> counter = FrequencyCounter()
+        >>> counter.update('Hello, ')
+        >>> counter.update('world!')
+        >>> counter.most_common(2)
+        [('L', 3), ('O', 2)]
+        >>> counter.most_common(1, 2)
+        [('EL', 1)]
+        >>> round(counter.index_of_coincidence(), 4)
+        0.0889
+    """
+
+    def __init__(self, abc=string.ascii_uppercase, max_ngram=3, max_period=20):
+        if not 1 <= max_ngram <= 3:
+            raise ValueError('max_ngram must be between 1 and 3')
+        self.abc = abc.upper()
+        self.max_ngram = max_ngram
+        self.max_period = max_period
+        self._table = byte_table()
+        self._byte_to_index = np.full(256, -1, dtype=np.intp)
+        self._byte_to_index[np.frombuffer(self.abc.encode('latin-1'), dtype=np.uint8)] = np.arange(len(self.abc))
+        self.reset()
+
+    def reset(self):
+        """
+        Clears every count
+        """
+
+        size = len(self.abc)
+        self.n_letters = 0
+        self.ngrams = {n:np.zeros(size ** n, dtype=np.int64) for n in range(1, self.max_ngram + 1)}
+        self.columns = {period:np.zeros((period, size), dtype=np.int64) for period in range(1, self.max_period + 1)}
+        self._tail = np.zeros(0, dtype=np.intp)
+
+    def update(self, chunk):
+        """
+        Adds the letters of ``chunk`` to the counts
+
+        Args:
+            chunk (str|bytes): The next piece of text. ``str`` chunks have unicode characters converted to ascii, ``bytes`` chunks only have ASCII letters uppercased
+        """
+
+        if isinstance(chunk, str):
+            chunk = unidecode(chunk).encode('latin-1', 'ignore')
+        data = np.frombuffer(bytes(chunk).translate(self._table), dtype=np.uint8)
+        letters = self._byte_to_index[data]
+        letters = letters[letters >= 0]
+        if not len(letters):
+            return
+        size = len(self.abc)
+        self.ngrams[1] += np.bincount(letters, minlength=size)
+        sequence = np.concatenate((self._tail, letters))
+        for n in range(2, self.max_ngram + 1):
+            if len(sequence) >= n:
+                codes = np.zeros(len(sequence) - n + 1, dtype=np.intp)
+                for position in range(n):
+                    codes = codes * size + sequence[position:len(sequence) - n + 1 + position]
+                codes = codes[max(len(self._tail) - n + 1, 0):]
+                self.ngrams[n] += np.bincount(codes, minlength=size ** n)
+        self._tail = sequence[-(self.max_ngram - 1):] if self.max_ngram > 1 else self._tail
+        positions = np.arange(self.n_letters, self.n_letters + len(letters))
+        for period, counts in self.columns.items():
+            counts += np.bincount((positions % period) * size + letters, minlength=period * size).reshape(period, size)
+        self.n_letters += len(letters)
+
+    def update_file(self, filename, window_size=WINDOW_SIZE):
+        """
+        Adds the letters of a file to the counts, reading it in windows of ``window_size`` bytes
+
+        Args:
+            filename (str): The filename of the file
+            window_size (int): The number of bytes read at a time. Defaults to 256 KiB
+        """
+
+        with open(filename, 'rb') as file:
+            for window in iter(lambda: file.read(window_size), b''):
+                self.update(window)
+
+    def counts(self, n=1):
+        """
+        Returns the n-gram counts (dict), e.g. ``{'TH': 12, ...}``
+
+        Args:
+            n (int): The n-gram size. Defaults to ``1``
+        """
+
+        return {''.join(ngram):int(count) for ngram, count in zip(product(self.abc, repeat=n), self.ngrams[n]) if count}
+
+    def most_common(self, k=10, n=1):
+        """
+        Returns the ``k`` most common n-grams as (ngram, count) tuples (list)
+
+        Args:
+            k (int): The number of n-grams returned. Defaults to ``10``
+            n (int): The n-gram size. Defaults to ``1``
+        """
+
+        counts = self.ngrams[n]
+        best = np.argsort(-counts, kind='stable')[:k]
+        size = len(self.abc)
+        results = []
+        for code in best:
+            count = int(counts[code])
+            if not count:
+                break
+            ngram = ''
+            for _ in range(n):
+                code, letter_index = divmod(int(code), size)
+                ngram = self.abc[letter_index] + ngram
+            results.append((ngram, count))
+        return results
+
+    def index_of_coincidence(self, period=1):
+        """
+        Returns the index of coincidence (float), averaged over the key columns when ``period`` is greater than 1. Around ``0.067`` for English text, ``0.038`` for random letters
+
+        Args:
+            period (int): The key period. Must not be greater than ``max_period``. Defaults to ``1``
+        """
+
+        iocs = [_index_of_coincidence(column) for column in self.columns[period]]
+        return float(np.mean(iocs))
+
+    def chi_squared(self, frequencies=ENGLISH_FREQUENCIES, period=1):
+        """
+        Returns the chi-squared statistic (float) of the letter counts against a reference language, summed over the key columns when ``period`` is greater than 1. The lower, the closer to the language
+
+        Args:
+            frequencies (dict): The letter frequencies (in percent) of the reference language. Defaults to English
+            period (int): The key period. Must not be greater than ``max_period``. Defaults to ``1``
+        """
+
+        reference = np.array([frequencies.get(letter, 0.01) for letter in self.abc]) / sum(frequencies.values())
+        return float(sum(_chi_squared(column, reference) for column in self.columns[period]))
+
+    def periodic_statistics(self, frequencies=ENGLISH_FREQUENCIES):
+        """
+        Returns (period, index of coincidence, chi-squared) tuples (list) for every period up to ``max_period``. The period whose index of coincidence gets close to the language's is the likely key length of a Vigenère-like cipher
+
+        Args:
+            frequencies (dict): The letter frequencies (in percent) of the reference language. Defaults to English
+        """
+
+        return [(period, self.index_of_coincidence(period), self.chi_squared(frequencies, period)) for period in self.columns]
+
+def _index_of_coincidence(counts):
+    total = counts.sum()
+    return float((counts * (counts - 1)).sum() / (total * (total - 1))) if total > 1 else 0.0
+
+def _chi_squared(counts, reference):
+    expected = counts.sum() * reference
+    return float(((counts - expected) ** 2 / expected).sum()) if counts.sum() else 0.0
@@ -0,0 +1,229 @@
+"""
+This module provides a way of chaining ciphers and substitution alphabets into a single pass
+"""
+
+from functools import partial
+from unidecode import unidecode
+from .ciphers import RailFence, Vigenere
+from .substitution_alphabets import Morse, Binary
+
+def _compose(first, second):
+    table = {letter:second.get(value, value) for letter, value in first.items()}
+    for letter, value in second.items():
+        table.setdefault(letter, value)
+    return table
+
+def _normalize(chunks):
+    for chunk in chunks:
+        yield unidecode(chunk).upper()
+
+def _translate(chunks, table):
+    for chunk in chunks:
+        yield chunk.translate(table)
+
+def _keyed(chunks, cipher, decrypt):
+    key_offset = 0
+    for chunk in chunks:
+        if decrypt:
+            yield cipher.decrypt(chunk, False, key_offset)
+        else:
+            yield cipher.encrypt(chunk, False, key_offset)
+        key_offset += len(cipher._not_abc_pattern.sub('', chunk))
+
+def _joined(chunks, encode, separator):
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        cipher = encode(chunk)
+        yield cipher if first else separator + cipher
+        first = False
+
+def _split(chunks, separator):
+    rest = ''
+    for chunk in chunks:
+        head, found, rest = (rest + chunk).rpartition(separator)
+        if found:
+            yield head
+    yield rest
+
+def _mapped(chunks, decode):
+    for chunk in chunks:
+        yield decode(chunk)
+
+def _stripped(chunks):
+    pending = ''
+    started = False
+    for chunk in chunks:
+        if not started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+        body = chunk.rstrip()
+        if body:
+            yield pending + body
+            pending = chunk[len(body):]
+        else:
+            pending += chunk
+
+def _coded(chunks, coder):
+    process, flush = coder()
+    for chunk in chunks:
+        yield process(chunk)
+    yield flush()
+
+def _whole(chunks, function):
+    yield function(''.join(chunks))
+
+def _morse_encode(morse, text):
+    return ' '.join(morse.char_to_morse.get(character, character) for character in text)
+
+def _morse_decode(morse, cipher):
+    cipher = cipher.replace(morse.word_splitter, ' {} '.format(morse.word_splitter))
+    return ''.join(' ' if code == morse.word_splitter else morse.morse_to_char.get(code, '�') for code in cipher.split())
+
+class Pipeline:
+    """
+    `Pipeline` represents a chain of cipher manipulators applied as a single one.
+
+    The text is normalized (``unidecode`` and ``upper``) right before the first layer that would normalize it, and again after any layer whose output may not be normalized (e.g. ``Binary``).
+    Consecutive monoalphabetic layers (``Atbash``, ``Caesar``, ``Keyword``, ``Affine``) are fused into a single translate table.
+    ``Vigenere``, ``Beaufort``, ``Gronsfeld``, ``Morse`` and ``Binary`` are streamed chunk by chunk, while any other layer (e.g. ``RailFence``) waits for the whole text.
+
+    Args:
+        *ciphers: Cipher manipulators from ``crypyto.ciphers`` or ``crypyto.substitution_alphabets``, in the order they are applied when encrypting
+
+    Examples:
+        >>> from crypyto.ciphers import Keyword, Vigenere
+        >>> from crypyto.substitution_alphabets import Morse
+        >>> from crypyto.pipeline import Pipeline
+        >>> pipeline = Pipeline(Keyword('secret'), Vigenere('secret'), Morse())
+        >>> pipeline.encrypt('Hello, world!')
+        '...- -..- -.- --.. .--. --..-- / .--. -.. ... -.- .. -.-.--'
+    """
+
+    def __init__(self, *ciphers):
+        self.ciphers = ciphers
+        self._encrypt_stages = self._build_stages(ciphers, False)
+        self._decrypt_stages = self._build_stages(ciphers[::-1], True)
+
+    def _normalizes(self, cipher, decrypt):
+        if hasattr(cipher, 'translation_table') or isinstance(cipher, Vigenere):
+            return True
+        return not decrypt and not isinstance(cipher, (Binary, RailFence))
+
+    def _stage_for(self, cipher, decrypt):
+        if isinstance(cipher, Vigenere):
+            return [partial(_keyed, cipher=cipher, decrypt=decrypt)]
+        if isinstance(cipher, Morse):
+            if decrypt:
+                return [partial(_split, separator=' '), partial(_mapped, decode=partial(_morse_decode, cipher)), _stripped]
+            return [partial(_joined, encode=partial(_morse_encode, cipher), separator=' '), _stripped]
+        if isinstance(cipher, Binary):
+            return [partial(_coded, coder=cipher._decoder if decrypt else cipher._encoder)]
+        return [partial(_whole, function=cipher.decrypt if decrypt else cipher.encrypt)]
+
+    def _build_stages(self, ciphers, decrypt):
+        stages = []
+        normalized = False
+        table = None
+        for cipher in ciphers:
+            if not normalized and self._normalizes(cipher, decrypt):
+                stages.append(_normalize)
+                normalized = True
+            if hasattr(cipher, 'translation_table'):
+                cipher_table = cipher.translation_table(decrypt)
+                table = cipher_table if table is None else _compose(table, cipher_table)
+                continue
+            if table is not None:
+                stages.append(partial(_translate, table=str.maketrans(table)))
+                table = None
+            stages.extend(self._stage_for(cipher, decrypt))
+            if not isinstance(cipher, RailFence):
+                normalized = self._normalizes(cipher, decrypt)
+        if table is not None:
+            stages.append(partial(_translate, table=str.maketrans(table)))
+        return stages
+
+    def _run(self, stages, chunks):
+        for stage in stages:
+            chunks = stage(chunks)
+        return chunks
+
+    def encrypt_stream(self, chunks):
+        """
+        Returns a generator of encrypted chunks (str)
+
+        Args:
+            chunks (iterable): Iterable of text chunks (str), e.g. a file opened in text mode
+
+        Examples:
+            >>> from crypyto.ciphers import Caesar, Vigenere
+            >>> from crypyto.pipeline import Pipeline
+            >>> pipeline = Pipeline(Caesar(key=3), Vigenere('secret'))
+            >>> ''.join(pipeline.encrypt_stream(['Hello, ', 'world!']))
+            'CLQFV, SJYQX!'
+        """
+
+        return self._run(self._encrypt_stages, chunks)
+
+    def decrypt_stream(self, chunks):
+        """
+        Returns a generator of decrypted chunks (str)
+
+        Args:
+            chunks (iterable): Iterable of cipher chunks (str), e.g. a file opened in text mode
+
+        Examples:
+            >>> from crypyto.ciphers import Caesar, Vigenere
+            >>> from crypyto.pipeline import Pipeline
+            >>> pipeline = Pipeline(Caesar(key=3), Vigenere('secret'))
+            >>> ''.join(pipeline.decrypt_stream(['CLQFV, ', 'SJYQX!']))
+            'HELLO, WORLD!'
+        """
+
+        return self._run(self._decrypt_stages, chunks)
+
+    def encrypt(self, text):
+        """
+        Returns encrypted text (str)
+
+        Args:
+            text (str): The text to be encrypted
+
+        Examples:
+            >>> from crypyto.ciphers import Caesar, Vigenere
+            >>> from crypyto.pipeline import Pipeline
+            >>> pipeline = Pipeline(Caesar(key=3), Vigenere('secret'))
+            >>> pipeline.encrypt('Hello, world!')
+            'CLQFV, SJYQX!'
+        """
+
+        return ''.join(self.encrypt_stream([text]))
+
+    def decrypt(self, cipher):
+        """
+        Returns decrypted cipher (str)
+
+        Args:
+            cipher (str): The cipher to be decrypted
+
+        Examples:
+            >>> from crypyto.ciphers import Caesar, Vigenere
+            >>> from crypyto.pipeline import Pipeline
+            >>> pipeline = Pipeline(Caesar(key=3), Vigenere('secret'))
+            >>> pipeline.decrypt('CLQFV, SJYQX!')
+            'HELLO, WORLD!'
+        """
+
+        return ''.join(self.decrypt_stream([cipher]))
+
+    def inverse(self):
+        """
+        Returns the inverse pipeline (Pipeline), whose ``encrypt`` decrypts this pipeline's output and vice versa
+        """
+
+        pipeline = Pipeline(*self.ciphers)
+        pipeline._encrypt_stages, pipeline._decrypt_stages = self._decrypt_stages, self._encrypt_stages
+        return pipeline
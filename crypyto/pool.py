@@ -0,0 +1,126 @@
+"""
+This module provides a pool of shared cipher manipulators, so keyed instances are built only once
+"""
+
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+PoolInfo = namedtuple('PoolInfo', ['hits', 'misses', 'evictions', 'maxsize', 'size'])
+
+_frozen_classes = {}
+
+def _frozen_class(cls):
+    if cls not in _frozen_classes:
+        def __setattr__(self, name, value):
+            if self.__dict__.get('_frozen') and not name.startswith('_'):
+                raise AttributeError('{} instances from a CipherPool are shared and can\'t be modified'.format(cls.__name__))
+            super(frozen, self).__setattr__(name, value)
+
+        def __delattr__(self, name):
+            if self.__dict__.get('_frozen') and not name.startswith('_'):
+                raise AttributeError('{} instances from a CipherPool are shared and can\'t be modified'.format(cls.__name__))
+            super(frozen, self).__delattr__(name)
+
+        def __reduce__(self):
+            return (_rebuild_frozen, self._pool_key)
+
+        frozen = type(cls.__name__, (cls,), {'__setattr__':__setattr__, '__delattr__':__delattr__, '__reduce__':__reduce__, '__module__':cls.__module__, '__qualname__':cls.__qualname__})
+        _frozen_classes[cls] = frozen
+    return _frozen_classes[cls]
+
+def _rebuild_frozen(cipher_class, args, kwargs):
+    instance = _frozen_class(cipher_class)(*args, **dict(kwargs))
+    instance._pool_key = (cipher_class, args, kwargs)
+    instance._frozen = True
+    return instance
+
+class CipherPool:
+    """
+    `CipherPool` represents a bounded pool of shared cipher manipulators, evicting the least recently used ones.
+
+    Instances are keyed by their class and parameters, and are frozen: their public attributes (e.g. ``key``) can't be reassigned.
+    They pickle as their class and parameters only, and are rebuilt frozen when unpickled (e.g. in a worker process).
+    The pool is thread-safe.
+
+    Args:
+        maxsize (int): The maximum number of instances kept in the pool. Defaults to ``1024``
+
+    Raises:
+        ValueError: When ``maxsize`` is smaller than 1
+
+    Examples:
+        >>> from crypyto.ciphers import Vigenere
+        >>> from crypyto.pool import CipherPool
+        >>> pool = CipherPool(maxsize=2)
+        >>> pool.get(Vigenere, 'secret').encrypt('Hello, world!')
+        'ZINCS, PGVNU!'
+        >>> pool.get(Vigenere, 'secret') is pool.get(Vigenere, 'secret')
+        True
+        >>> pool.info()
+        PoolInfo(hits=2, misses=1, evictions=0, maxsize=2, size=1)
+    """
+
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self._instances = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, cipher_class, *args, **kwargs):
+        """
+        Returns the shared instance of ``cipher_class`` built with the given parameters, building it if needed
+
+        Args:
+            cipher_class (type): The cipher manipulator class (e.g. ``Vigenere``)
+            *args: Positional parameters of ``cipher_class``
+            **kwargs: Keyword parameters of ``cipher_class``
+
+        Raises:
+            TypeError: When a parameter is not hashable
+
+        Examples:
+            >>> from crypyto.ciphers import PolybiusSquare
+            >>> from crypyto.pool import CipherPool
+            >>> pool = CipherPool()
+            >>> pool.get(PolybiusSquare, 5, 5).decrypt('5x5#3-2;5-1;1-3;1-3;4-3')
+            'HELLO'
+        """
+
+        pool_key = (cipher_class, args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            instance = self._instances.get(pool_key)
+            if instance is not None:
+                self._instances.move_to_end(pool_key)
+                self._hits += 1
+                return instance
+            self._misses += 1
+
+        instance = _rebuild_frozen(*pool_key)
+        with self._lock:
+            instance = self._instances.setdefault(pool_key, instance)
+            self._instances.move_to_end(pool_key)
+            while len(self._instances) > self.maxsize:
+                self._instances.popitem(last=False)
+                self._evictions += 1
+        return instance
+
+    def info(self):
+        """
+        Returns the pool statistics (PoolInfo): hits, misses, evictions, maxsize and current size
+        """
+
+        with self._lock:
+            return PoolInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._instances))
+
+    def clear(self):
+        """
+        Removes every instance from the pool and resets its statistics
+        """
+
+        with self._lock:
+            self._instances.clear()
+            self._hits = self._misses = self._evictions = 0
@@ -0,0 +1,134 @@
+"""
+This module provides compact, immutable and picklable descriptions of cipher manipulators, cheap to send to worker processes
+"""
+
+from ._fileio import byte_table, TranslateKernel
+
+class CipherSpec:
+    """
+    `CipherSpec` represents a frozen description of a cipher manipulator: its class and parameters only.
+
+    Pickling a spec stores nothing but those parameters, so it's cheap to send to process pools.
+    The cipher manipulator and its byte kernels are rebuilt lazily, on first use, wherever the spec is unpickled.
+
+    Args:
+        cipher_class (type): The cipher manipulator class (e.g. ``Vigenere``)
+        *args: Positional parameters of ``cipher_class``
+        **kwargs: Keyword parameters of ``cipher_class``
+
+    Examples:
+        >>> import pickle
+        >>> from crypyto.ciphers import Vigenere
+        >>> from crypyto.specs import CipherSpec
+        >>> spec = CipherSpec(Vigenere, 'secret')
+        >>> spec.encrypt('Hello, world!')
+        'ZINCS, PGVNU!'
+        >>> pickle.loads(pickle.dumps(spec)) == spec
+        True
+    """
+
+    __slots__ = ('cipher_class', 'args', 'kwargs', '_cipher', '_kernels')
+
+    def __init__(self, cipher_class, *args, **kwargs):
+        object.__setattr__(self, 'cipher_class', cipher_class)
+        object.__setattr__(self, 'args', args)
+        object.__setattr__(self, 'kwargs', tuple(sorted(kwargs.items())))
+        object.__setattr__(self, '_cipher', None)
+        object.__setattr__(self, '_kernels', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError('CipherSpec objects are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('CipherSpec objects are immutable')
+
+    def __reduce__(self):
+        return (_rebuild_spec, (self.cipher_class, self.args, self.kwargs))
+
+    def __eq__(self, other):
+        if not isinstance(other, CipherSpec):
+            return NotImplemented
+        return (self.cipher_class, self.args, self.kwargs) == (other.cipher_class, other.args, other.kwargs)
+
+    def __hash__(self):
+        return hash((self.cipher_class, self.args, self.kwargs))
+
+    def __repr__(self):
+        params = [repr(arg) for arg in self.args] + ['{}={!r}'.format(name, value) for name, value in self.kwargs]
+        return 'CipherSpec({})'.format(', '.join([self.cipher_class.__name__] + params))
+
+    @property
+    def cipher(self):
+        """
+        The cipher manipulator described by this spec, built on first access
+        """
+
+        if self._cipher is None:
+            object.__setattr__(self, '_cipher', self.cipher_class(*self.args, **dict(self.kwargs)))
+        return self._cipher
+
+    def kernel(self, decrypt=False):
+        """
+        Returns the compiled byte kernel of the cipher (built on first call), used by ``encrypt_bytes`` and ``decrypt_bytes``
+
+        Args:
+            decrypt (bool): Whether to return the decryption kernel. Defaults to ``False``
+
+        Raises:
+            TypeError: When the cipher can't process bytes
+        """
+
+        if decrypt not in self._kernels:
+            if hasattr(self.cipher, 'translation_table'):
+                kernel = TranslateKernel(byte_table(self.cipher.translation_table(decrypt)))
+            elif hasattr(self.cipher, '_file_kernel'):
+                kernel = self.cipher._file_kernel(decrypt)
+            else:
+                raise TypeError('{} can\'t process bytes'.format(self.cipher_class.__name__))
+            self._kernels[decrypt] = kernel
+        return self._kernels[decrypt]
+
+    def encrypt(self, text, *args, **kwargs):
+        """
+        Returns ``text`` encrypted by the cipher (str). Extra arguments are passed to the cipher's ``encrypt``
+        """
+
+        return self.cipher.encrypt(text, *args, **kwargs)
+
+    def decrypt(self, cipher, *args, **kwargs):
+        """
+        Returns ``cipher`` decrypted by the cipher (str). Extra arguments are passed to the cipher's ``decrypt``
+        """
+
+        return self.cipher.decrypt(cipher, *args, **kwargs)
+
+    def encrypt_bytes(self, data, key_offset=0):
+        """
+        Returns ``data`` encrypted by the cipher's byte kernel (bytes). ASCII letters are uppercased and encrypted, every other byte is copied as is
+
+        Args:
+            data (bytes): The bytes to be encrypted
+            key_offset (int): Number of alphabet letters that came before ``data``, for the Vigenere family. Defaults to ``0``
+
+        Examples:
+            >>> from crypyto.ciphers import Caesar
+            >>> from crypyto.specs import CipherSpec
+            >>> CipherSpec(Caesar, key=5).encrypt_bytes(b'Hello, world!')
+            b'MJQQT, BTWQI!'
+        """
+
+        return self.kernel(False)(data, key_offset)[0]
+
+    def decrypt_bytes(self, data, key_offset=0):
+        """
+        Returns ``data`` decrypted by the cipher's byte kernel (bytes). ASCII letters are uppercased and decrypted, every other byte is copied as is
+
+        Args:
+            data (bytes): The bytes to be decrypted
+            key_offset (int): Number of alphabet letters that came before ``data``, for the Vigenere family. Defaults to ``0``
+        """
+
+        return self.kernel(True)(data, key_offset)[0]
+
+def _rebuild_spec(cipher_class, args, kwargs):
+    return CipherSpec(cipher_class, *args, **dict(kwargs))
@@ -5,9 +5,48 @@ import os
 import re
 import string
 import random
-from math import ceil, sqrt
+import sys
+import time
+import asyncio
+import base64
+import multiprocessing
+import wave
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+import codecs
+import json
+from io import BytesIO
+from functools import partial
+from math import ceil
+from threading import Lock
 from unidecode import unidecode
+import numpy as np
 from PIL import Image
+from ._fileio import process_file
+
+DecryptResult = namedtuple('DecryptResult', ['path', 'text', 'error', 'seconds'])
+Sprite = namedtuple('Sprite', ['text', 'x', 'y', 'width', 'height'])
+
+_PCM_TYPES = {1:np.uint8, 2:np.dtype('<i2'), 4:np.dtype('<i4')}
+
+_PACKED_WORD, _PACKED_LITERAL, _PACKED_INVALID = -1, -2, -3
+
+def _packing_tables():
+    codes = {}
+    for length in range(1, 8):
+        for pattern in range(1 << length):
+            code = ''.join('-' if pattern >> (length - 1 - position) & 1 else '.' for position in range(length))
+            codes[code] = ((length << length) | pattern, 3 + length)
+    windows = np.arange(1024)
+    headers = windows >> 7
+    lengths = np.where(headers > 0, 3 + headers, np.array([_PACKED_WORD, _PACKED_LITERAL, _PACKED_INVALID, _PACKED_INVALID])[windows >> 5 & 3])
+    tokens = np.empty(1024, dtype=object)
+    for window in range(128, 1024):
+        length = window >> 7
+        tokens[window] = ''.join('-' if window >> (6 - position) & 1 else '.' for position in range(length))
+    return codes, lengths, tokens
+
+_PACKED_CODES, _UNPACK_LENGTHS, _UNPACK_TOKENS = _packing_tables()
 
 class Morse:
     """
@@ -117,16 +156,421 @@ class Morse:
             text += ' '
         return text.strip()
 
+    def _pack_tokens(self, tokens):
+        values = []
+        widths = []
+        for token in tokens:
+            if token == self.word_splitter:
+                values.append(0)
+                widths.append(5)
+            elif token in _PACKED_CODES:
+                value, width = _PACKED_CODES[token]
+                values.append(value)
+                widths.append(width)
+            else:
+                literal = token.encode('utf-8')
+                if len(literal) > 0xFFFF:
+                    raise ValueError('Tokens longer than 65535 bytes can\'t be packed')
+                values.append(1 << 16 | len(literal))
+                widths.append(21)
+                values.extend(literal)
+                widths.extend([8] * len(literal))
+        values = np.array(values, dtype=np.int64)
+        widths = np.array(widths, dtype=np.int64)
+        ends = np.cumsum(widths)
+        owners = np.repeat(np.arange(len(widths)), widths)
+        shifts = np.repeat(ends, widths) - 1 - np.arange(ends[-1] if len(ends) else 0)
+        return (values[owners] >> shifts & 1).astype(np.uint8)
+
+    def _unpack_bits(self, bits, final):
+        n_bits = len(bits)
+        padded = np.concatenate((bits, np.zeros(10, dtype=np.uint8))).astype(np.uint16)
+        windows = np.zeros(n_bits, dtype=np.uint16)
+        for position in range(10):
+            windows = windows << 1 | padded[position:position + n_bits]
+        lengths = _UNPACK_LENGTHS[windows].tolist()
+        starts = []
+        literals = {}
+        words = []
+        position = 0
+        while position < n_bits:
+            length = lengths[position]
+            if length == _PACKED_WORD:
+                length = 5
+                words.append(len(starts))
+            elif length == _PACKED_LITERAL:
+                if position + 21 > n_bits:
+                    break
+                size = int(np.packbits(bits[position + 5:position + 21]).view('>u2')[0])
+                length = 21 + 8 * size
+                if position + length <= n_bits:
+                    literals[len(starts)] = np.packbits(bits[position + 21:position + length]).tobytes().decode('utf-8')
+            elif length == _PACKED_INVALID and position + 5 <= n_bits:
+                raise ValueError('Invalid packed Morse data')
+            if length < 0 or position + length > n_bits:
+                if words and words[-1] == len(starts):
+                    words.pop()
+                break
+            starts.append(position)
+            position += length
+        if final and (n_bits - position >= 8 or not bits[position:].all()):
+            raise ValueError('Truncated packed Morse data')
+        tokens = _UNPACK_TOKENS[windows[starts]]
+        tokens[words] = self.word_splitter
+        for index, literal in literals.items():
+            tokens[index] = literal
+        return tokens.tolist(), position
+
+    def pack(self, cipher):
+        """
+        Returns the Morse Code ``cipher`` packed into a compact binary format (bytes), from a fourth to a sixth of its size.
+
+        Every space-separated token takes a 3-bit header: a dot/dash code of 1 to 7 elements is the header ``1`` to ``7`` followed by one bit per element (``0`` for a dot, ``1`` for a dash).
+        The header ``0`` is followed by ``00`` for a word splitter, or by ``01``, a 16-bit length and the UTF-8 bytes of any other token, so every string is packed losslessly. The last byte is padded with ``1`` bits
+
+        Args:
+            cipher (str): The Morse Code to be packed (see ``encrypt``)
+
+        Raises:
+            ValueError: When a token that isn't Morse Code is longer than 65535 bytes
+
+        Examples:
+            >>> from crypyto.substitution_alphabets import Morse
+            >>> morse = Morse()
+            >>> morse.pack('.... . .-.. .-.. --- --..-- / .-- --- .-. .-.. -.. -.-.--')
+            b'\\x80Q"?\\xb3\\x03o\\xb5\\x11\\xcd_'
+        """
+
+        if not cipher:
+            return b''
+        bits = self._pack_tokens(cipher.split(' '))
+        return np.packbits(np.concatenate((bits, np.ones(-len(bits) % 8, dtype=np.uint8)))).tobytes()
+
+    def unpack(self, data):
+        """
+        Returns the Morse Code packed by ``pack`` (str)
+
+        Args:
+            data (bytes): The packed Morse Code
+
+        Raises:
+            ValueError: When ``data`` isn't valid packed Morse Code
+
+        Examples:
+            >>> from crypyto.substitution_alphabets import Morse
+            >>> morse = Morse()
+            >>> morse.unpack(b'\\x80Q"?\\xb3\\x03o\\xb5\\x11\\xcd_')
+            '.... . .-.. .-.. --- --..-- / .-- --- .-. .-.. -.. -.-.--'
+        """
+
+        tokens = self._unpack_bits(np.unpackbits(np.frombuffer(bytes(data), dtype=np.uint8)), True)[0]
+        return ' '.join(tokens)
+
+    def pack_file(self, src, dst, encoding='utf-8'):
+        """
+        Packs the Morse Code file ``src`` into ``dst`` (see ``pack``) through a memory map, without loading it into memory
+
+        Args:
+            src (str): The filename of the Morse Code file
+            dst (str): The filename of the packed file
+            encoding (str): The encoding of ``src``. Defaults to ``'utf-8'``
+
+        Examples:
+            >>> from crypyto.substitution_alphabets import Morse
+            >>> morse = Morse()
+            >>> morse.pack_file('transmissions.txt', 'transmissions.morse')
+        """
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+        rest = ''
+        carry = np.zeros(0, dtype=np.uint8)
+        def write(tokens, final=False):
+            nonlocal carry
+            bits = np.concatenate((carry, self._pack_tokens(tokens)))
+            if final:
+                bits = np.concatenate((bits, np.ones(-len(bits) % 8, dtype=np.uint8)))
+            n_bytes = len(bits) // 8
+            carry = bits[8 * n_bytes:]
+            return np.packbits(bits[:8 * n_bytes]).tobytes()
+        def process(window):
+            nonlocal rest
+            tokens = (rest + decoder.decode(window)).split(' ')
+            rest = tokens.pop()
+            return write(tokens) if tokens else b''
+        def flush():
+            cipher = rest + decoder.decode(b'', True)
+            return write([cipher], True) if cipher or len(carry) else b''
+        process_file(src, dst, process, flush)
+
+    def unpack_file(self, src, dst, encoding='utf-8'):
+        """
+        Unpacks the packed Morse Code file ``src`` (see ``pack``) into ``dst`` through a memory map, without loading it into memory
+
+        Args:
+            src (str): The filename of the packed file
+            dst (str): The filename of the Morse Code file
+            encoding (str): The encoding of ``dst``. Defaults to ``'utf-8'``
+
+        Raises:
+            ValueError: When ``src`` isn't valid packed Morse Code
+
+        Examples:
+            >>> from crypyto.substitution_alphabets import Morse
+            >>> morse = Morse()
+            >>> morse.unpack_file('transmissions.morse', 'transmissions.txt')
+        """
+
+        rest = np.zeros(0, dtype=np.uint8)
+        started = False
+        def read(window, final=False):
+            nonlocal rest, started
+            bits = np.concatenate((rest, np.unpackbits(np.frombuffer(window, dtype=np.uint8))))
+            tokens, position = self._unpack_bits(bits, final)
+            rest = bits[position:]
+            if not tokens:
+                return b''
+            text = ' '.join(tokens)
+            text = ' ' + text if started else text
+            started = True
+            return text.encode(encoding)
+        def flush():
+            return read(b'', True) if len(rest) else b''
+        process_file(src, dst, read, flush)
+
+    def audio_frames(self, text, wpm=20, frequency=600, farnsworth_wpm=None, sample_rate=8000):
+        """
+        Yields the Morse Code of ``text`` as mono 16-bit little-endian PCM frames (bytes), one chunk per word, so long texts are never rendered at once
+
+        Args:
+            text (str): The text to be translated into Morse Code
+            wpm (int|float): Speed of the characters, in words per minute (a dot lasts ``1.2 / wpm`` seconds). Defaults to ``20``
+            frequency (int|float): Tone frequency, in hertz. Defaults to ``600``
+            farnsworth_wpm (int|float|None): Overall speed with Farnsworth spacing: characters are sent at ``wpm``, but the gaps between characters and words are stretched to this slower speed. Defaults to ``None``, which uses the standard spacing
+            sample_rate (int): Frames per second. Defaults to ``8000``
+
+        Raises:
+            ValueError: When ``wpm`` isn't positive
+            ValueError: When ``farnsworth_wpm`` isn't between 0 and ``wpm``
+        """
+
+        if wpm <= 0:
+            raise ValueError('wpm must be positive')
+        unit = 1.2 / wpm
+        char_gap, word_gap = 3 * unit, 7 * unit
+        if farnsworth_wpm is not None:
+            if not 0 < farnsworth_wpm <= wpm:
+                raise ValueError('farnsworth_wpm must be between 0 and wpm')
+            delay = (60 * wpm - 37.2 * farnsworth_wpm) / (farnsworth_wpm * wpm)
+            char_gap, word_gap = 3 * delay / 19, 7 * delay / 19
+
+        def silence(seconds):
+            return np.zeros(int(round(seconds * sample_rate)), dtype='<i2')
+
+        def tone(seconds):
+            n_frames = int(round(seconds * sample_rate))
+            envelope = np.ones(n_frames)
+            ramp = min(int(sample_rate * 0.005), n_frames // 2)
+            if ramp:
+                envelope[:ramp] = 0.5 - 0.5 * np.cos(np.pi * np.arange(ramp) / ramp)
+                envelope[-ramp:] = envelope[:ramp][::-1]
+            return (0.8 * 32767 * envelope * np.sin(2 * np.pi * frequency * np.arange(n_frames) / sample_rate)).astype('<i2')
+
+        symbols = {'.':tone(unit), '-':tone(3 * unit)}
+        element_silence, char_silence, word_silence = silence(unit), silence(char_gap), silence(word_gap)
+        started = False
+        for word in unidecode(text).upper().split():
+            pieces = []
+            for character in word:
+                code = self.char_to_morse.get(character)
+                if not code:
+                    continue
+                if pieces:
+                    pieces.append(char_silence)
+                for position, symbol in enumerate(code):
+                    if position:
+                        pieces.append(element_silence)
+                    pieces.append(symbols[symbol])
+            if pieces:
+                if started:
+                    yield word_silence.tobytes()
+                started = True
+                yield np.concatenate(pieces).tobytes()
+
+    def encrypt_audio(self, text, filename=None, wpm=20, frequency=600, farnsworth_wpm=None, sample_rate=8000):
+        """
+        Writes the Morse Code of ``text`` as a mono 16-bit WAV file, streaming the frames (see ``audio_frames``)
+
+        Args:
+            text (str): The text to be translated into Morse Code
+            filename (str|file|None): Filename or writable binary file object of the WAV file. Defaults to ``None``, which returns the WAV as ``bytes``
+            wpm (int|float): Speed of the characters, in words per minute. Defaults to ``20``
+            frequency (int|float): Tone frequency, in hertz. Defaults to ``600``
+            farnsworth_wpm (int|float|None): Overall speed with Farnsworth spacing. Defaults to ``None``, which uses the standard spacing
+            sample_rate (int): Frames per second. Defaults to ``8000``
+
+        Raises:
+            ValueError: When ``wpm`` isn't positive
+            ValueError: When ``farnsworth_wpm`` isn't between 0 and ``wpm``
+
+        Examples:
+            >>> from crypyto.substitution_alphabets import Morse
+            >>> morse = Morse()
+            >>> morse.encrypt_audio('Hello, world!', 'morse_hello.wav')
+            >>> morse.encrypt_audio('Hello, world!', 'morse_hello_farnsworth.wav', wpm=18, farnsworth_wpm=10)
+        """
+
+        output = BytesIO() if filename is None else filename
+        with wave.open(output, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            for frames in self.audio_frames(text, wpm, frequency, farnsworth_wpm, sample_rate):
+                wav.writeframes(frames)
+        if filename is None:
+            return output.getvalue()
+
+    def decrypt_audio(self, audio, sample_rate=None):
+        """
+        Returns the Morse Code audio ``audio`` translated into plain text (str).
+
+        The signal is reduced to an envelope of 4 ms blocks while it's read, so long recordings are never fully loaded.
+        The envelope is split into tone and silence by clustering its levels, and the tone and silence lengths are then clustered into dots and dashes and into element, character and word gaps, so the speed (and Farnsworth spacing) doesn't have to be known
+
+        Args:
+            audio (str|file|bytes|numpy.ndarray): Filename, readable binary file object or ``bytes`` of a PCM WAV file, or an array of PCM samples (one column per channel)
+            sample_rate (int|None): Frames per second of ``audio``. Only needed (and used) when ``audio`` is an array
+
+        Raises:
+            ValueError: When ``audio`` is an array and ``sample_rate`` isn't given
+            ValueError: When the WAV file doesn't have 8, 16 or 32-bit samples
+
+        Examples:
+            >>> from crypyto.substitution_alphabets import Morse
+            >>> morse = Morse()
+            >>> morse.decrypt_audio('morse_hello.wav')
+            'HELLO, WORLD!'
+            >>> morse.decrypt_audio('morse_hello_farnsworth.wav')
+            'HELLO, WORLD!'
+        """
+
+        if isinstance(audio, np.ndarray):
+            if sample_rate is None:
+                raise ValueError('sample_rate must be given for PCM arrays')
+            block = max(1, int(round(sample_rate * 0.004)))
+            samples = audio.reshape(len(audio), -1)
+            if samples.dtype == np.uint8:
+                samples = samples.astype(np.int16) - 128
+            envelope = _envelope(samples, block)
+        else:
+            if isinstance(audio, (bytes, bytearray, memoryview)):
+                audio = BytesIO(audio)
+            with wave.open(audio, 'rb') as wav:
+                if wav.getsampwidth() not in _PCM_TYPES:
+                    raise ValueError('Only 8, 16 and 32-bit PCM is supported')
+                dtype, channels = _PCM_TYPES[wav.getsampwidth()], wav.getnchannels()
+                block = max(1, int(round(wav.getframerate() * 0.004)))
+                envelopes = []
+                for frames in iter(lambda: wav.readframes(block * 65536), b''):
+                    samples = np.frombuffer(frames, dtype=dtype).reshape(-1, channels)
+                    if dtype == np.uint8:
+                        samples = samples.astype(np.int16) - 128
+                    envelopes.append(_envelope(samples, block))
+                envelope = np.concatenate(envelopes) if envelopes else np.zeros(0)
+        return self.decrypt(self._envelope_to_morse(envelope))
+
+    def _envelope_to_morse(self, envelope):
+        if not len(envelope) or envelope.max() == envelope.min():
+            return ''
+        low, high = _two_means(envelope)
+        is_tone = envelope > (low + high) / 2
+        bounds = np.r_[0, np.flatnonzero(np.diff(is_tone.view(np.int8))) + 1, len(is_tone)]
+        lengths = np.diff(bounds)
+        starts_with_tone = is_tone[0]
+        lengths = lengths[0 if starts_with_tone else 1:]
+        if len(lengths) % 2 == 0:
+            lengths = lengths[:-1]
+        tones, gaps = lengths[0::2], lengths[1::2]
+
+        short_tone, long_tone = _two_means(tones)
+        if long_tone > 2 * short_tone:
+            unit = short_tone
+        elif len(gaps) and short_tone >= 2 * gaps.min():
+            unit = short_tone / 3
+        else:
+            unit = short_tone
+        symbols = np.where(tones > 2 * unit, '-', '.')
+
+        separators = np.full(len(gaps), '', dtype=object)
+        is_spaced = gaps > 2 * unit
+        if is_spaced.any():
+            char_gap, word_gap = _two_means(gaps[is_spaced])
+            threshold = (char_gap + word_gap) / 2 if word_gap > 1.5 * char_gap else 5 * unit
+            separators[is_spaced] = np.where(gaps[is_spaced] > threshold, ' {} '.format(self.word_splitter), ' ')
+        tokens = np.empty(len(tones) + len(gaps), dtype=object)
+        tokens[0::2] = symbols
+        tokens[1::2] = separators
+        return ''.join(tokens)
+
+def _envelope(samples, block):
+    magnitude = np.abs(samples.astype(np.int64)).max(axis=1)
+    n_blocks = -(-len(magnitude) // block)
+    magnitude = np.pad(magnitude, (0, n_blocks * block - len(magnitude)), 'constant')
+    return magnitude.reshape(n_blocks, block).max(axis=1)
+
+def _two_means(values, iterations=20):
+    low, high = float(values.min()), float(values.max())
+    for _ in range(iterations):
+        is_high = values > (low + high) / 2
+        if is_high.all() or not is_high.any():
+            break
+        means = float(values[~is_high].mean()), float(values[is_high].mean())
+        if means == (low, high):
+            break
+        low, high = means
+    return low, high
+
+_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+_DIGIT_VALUES = np.full(256, 255, dtype=np.uint8)
+_DIGIT_VALUES[_DIGITS] = np.arange(16)
+_DIGIT_VALUES[np.frombuffer(b'ABCDEF', dtype=np.uint8)] = np.arange(10, 16)
+_DIGIT_BITS = {2:1, 8:3, 16:4}
+_BLOCKS = {32:(5, 8, base64.b32encode, base64.b32decode), 64:(3, 4, base64.b64encode, base64.b64decode)}
+
 class Binary:
     """
-    `Binary` represents a text-to-binary manipulator
+    `Binary` represents a text-to-binary manipulator, which may also use octal, hexadecimal, Base32 or Base64
+
+    With bases 2, 8 and 16 each character becomes its Unicode code point written in ``base``, so any character is supported.
+    With bases 32 and 64 the UTF-8 bytes of the text are encoded with the standard Base32 or Base64 alphabet (see ``base64``)
 
     Args:
-        letter_splitter (str): A string which will be used to indicate characters separation. Defaults to ``' '``
+        letter_splitter (str): A string which will be used to indicate characters (or groups) separation. Defaults to ``' '``
+        base (int): The base of the output: ``2``, ``8``, ``16``, ``32`` or ``64``. Defaults to ``2``
+        width (int|None): With bases 2, 8 and 16, the number of digits of every character, padded with zeros. With bases 32 and 64, the number of characters of every group. Defaults to ``None``, which uses as few digits as needed (bases 2, 8 and 16) or a single group (bases 32 and 64)
+
+    Raises:
+        ValueError: When ``base`` isn't supported
+        ValueError: When ``width`` isn't positive
+        ValueError: When ``letter_splitter`` is empty and ``width`` is ``None`` with bases 2, 8 and 16
+
+    Examples:
+        >>> from crypyto.substitution_alphabets import Binary
+        >>> Binary(base=16, width=4).encrypt('Olá!')
+        '004f 006c 00e1 0021'
+        >>> Binary(base=64).encrypt('Olá!')
+        'T2zDoSE='
     """
 
-    def __init__(self, letter_splitter=' '):
+    def __init__(self, letter_splitter=' ', base=2, width=None):
+        if base not in _DIGIT_BITS and base not in _BLOCKS:
+            raise ValueError('base must be 2, 8, 16, 32 or 64')
+        if width is not None and width < 1:
+            raise ValueError('width must be positive')
+        if base in _DIGIT_BITS and not letter_splitter and width is None:
+            raise ValueError('letter_splitter can only be empty with a fixed width')
         self.letter_splitter = letter_splitter
+        self.base = base
+        self.width = width
 
     def encrypt(self, text):
         """
@@ -135,6 +579,9 @@ class Binary:
         Args:
             text (str): The text to be translated to binary
 
+        Raises:
+            ValueError: When a character doesn't fit in ``width`` digits
+
         Examples:
             >>> from crypyto.substitution_alphabets import Binary
             >>> b = Binary()
@@ -142,7 +589,8 @@ class Binary:
             '1001000 1100101 1101100 1101100 1101111 101100 100000 1110111 1101111 1110010 1101100 1100100 100001'
         """
 
-        return self.letter_splitter.join(format(ord(char), 'b') for char in text)
+        process, flush = self._encoder()
+        return process(text) + flush()
 
     def decrypt(self, cipher):
         """
@@ -151,6 +599,9 @@ class Binary:
         Args:
             cipher (str): The binary-cipher to be translated to normal text
 
+        Raises:
+            ValueError: When ``cipher`` has invalid digits or characters
+
         Examples:
             >>> from crypyto.substitution_alphabets import Binary
             >>> b = Binary()
@@ -158,10 +609,308 @@ class Binary:
             'Hello, world!'
         """
 
-        return ''.join(chr(int(char, 2)) for char in cipher.split(self.letter_splitter))      
+        process, flush = self._decoder()
+        return process(cipher) + flush()
+
+    def _encode_code_points(self, text):
+        codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+        if not len(codes):
+            return ''
+        bits = _DIGIT_BITS[self.base]
+        if self.width:
+            if bits * self.width < 21 and codes.max() >> (bits * self.width):
+                raise ValueError('Characters don\'t fit in {} digits'.format(self.width))
+            lengths = np.full(len(codes), self.width)
+        else:
+            lengths = np.ones(len(codes), dtype=np.intp)
+            for n_digits in range(1, -(-21 // bits)):
+                lengths += (codes >> (bits * n_digits)) > 0
+        n_digits = int(lengths.max())
+        shifts = np.minimum(bits * np.arange(n_digits - 1, -1, -1), 31).astype(np.uint32)
+        digits = _DIGITS[codes[:, None] >> shifts & (self.base - 1)]
+        splitter = np.frombuffer(self.letter_splitter.encode('utf-8'), dtype=np.uint8)
+        output = np.concatenate((digits, np.broadcast_to(splitter, (len(codes), len(splitter)))), axis=1)
+        is_kept = np.concatenate((np.arange(n_digits) >= n_digits - lengths[:, None], np.ones((len(codes), len(splitter)), dtype=bool)), axis=1)
+        is_kept[-1, n_digits:] = False
+        return output[is_kept].tobytes().decode('utf-8')
+
+    def _decode_code_points(self, cipher):
+        cipher = cipher.strip()
+        if not cipher:
+            return ''
+        separator = self.letter_splitter
+        if len(separator) > 1 or separator > '\x7f':
+            cipher = cipher.replace(separator, '\x00')
+            separator = '\x00'
+        data = np.frombuffer(cipher.encode('ascii'), dtype=np.uint8)
+        digits = _DIGIT_VALUES[data]
+        if separator:
+            is_separator = data == ord(separator)
+            if (digits[~is_separator] >= self.base).any():
+                raise ValueError('The cipher has invalid base-{} digits'.format(self.base))
+            bounds = np.flatnonzero(is_separator)
+            starts = np.r_[0, bounds + 1]
+            lengths = np.r_[bounds, len(data)] - starts
+        else:
+            if (digits >= self.base).any():
+                raise ValueError('The cipher has invalid base-{} digits'.format(self.base))
+            if len(data) % self.width:
+                raise ValueError('The cipher length isn\'t a multiple of {}'.format(self.width))
+            starts = np.arange(0, len(data), self.width)
+            lengths = np.full(len(starts), self.width)
+        if not lengths.all():
+            raise ValueError('The cipher has empty characters')
+
+        bits = _DIGIT_BITS[self.base]
+        max_digits = -(-21 // bits)
+        codes = np.zeros(len(starts), dtype=np.int64)
+        for length in np.flatnonzero(np.bincount(lengths)):
+            chosen = np.flatnonzero(lengths == length)
+            matrix = digits[starts[chosen, None] + np.arange(length)]
+            if length > max_digits:
+                if matrix[:, :length - max_digits].any():
+                    raise ValueError('The cipher has characters out of the Unicode range')
+                matrix = matrix[:, length - max_digits:]
+            codes[chosen] = matrix.dot(self.base ** np.arange(matrix.shape[1] - 1, -1, -1, dtype=np.int64))
+        if (codes > sys.maxunicode).any():
+            raise ValueError('The cipher has characters out of the Unicode range')
+        return codes.astype('<u4').tobytes().decode('utf-32-le', 'surrogatepass')
+
+    def _encoder(self):
+        if self.base in _DIGIT_BITS:
+            started = False
+            def process(text):
+                nonlocal started
+                cipher = self._encode_code_points(text)
+                if not cipher:
+                    return ''
+                cipher = self.letter_splitter + cipher if started else cipher
+                started = True
+                return cipher
+            return process, lambda: ''
+
+        block_size, _, encode, _ = _BLOCKS[self.base]
+        carry = b''
+        pending = ''
+        started = False
+        def groups(encoded, final):
+            nonlocal pending, started
+            pending += encoded
+            if not self.width:
+                output, pending = pending, ''
+                return output
+            n_complete = len(pending) if final else len(pending) - len(pending) % self.width
+            pieces = [pending[start:start + self.width] for start in range(0, n_complete, self.width)]
+            pending = pending[n_complete:]
+            if not pieces:
+                return ''
+            output = self.letter_splitter.join(pieces)
+            output = self.letter_splitter + output if started else output
+            started = True
+            return output
+        def process(text):
+            nonlocal carry
+            data = carry + text.encode('utf-8', 'surrogatepass')
+            n_bytes = len(data) - len(data) % block_size
+            carry = data[n_bytes:]
+            return groups(encode(data[:n_bytes]).decode('ascii'), False)
+        def flush():
+            return groups(encode(carry).decode('ascii'), True)
+        return process, flush
+
+    def _decoder(self):
+        if self.base in _DIGIT_BITS:
+            rest = ''
+            def process(cipher):
+                nonlocal rest
+                cipher = rest + cipher
+                if self.letter_splitter:
+                    head, found, rest = cipher.rpartition(self.letter_splitter)
+                    return self._decode_code_points(head) if found else ''
+                cipher = ''.join(cipher.split())
+                n_chars = len(cipher) - len(cipher) % self.width
+                rest = cipher[n_chars:]
+                return self._decode_code_points(cipher[:n_chars])
+            def flush():
+                return self._decode_code_points(rest)
+            return process, flush
+
+        _, block_size, _, decode = _BLOCKS[self.base]
+        utf8 = codecs.getincrementaldecoder('utf-8')('surrogatepass')
+        rest = ''
+        carry = ''
+        def decoded(final):
+            nonlocal carry
+            n_chars = len(carry) if final else len(carry) - len(carry) % block_size
+            data, carry = carry[:n_chars], carry[n_chars:]
+            try:
+                return utf8.decode(decode(data), final)
+            except ValueError as error:
+                raise ValueError('The cipher isn\'t valid Base{}: {}'.format(self.base, error))
+        grouped = self.width and self.letter_splitter and not self.letter_splitter.isspace()
+        def process(cipher):
+            nonlocal rest, carry
+            cipher = rest + cipher
+            if grouped:
+                head, found, rest = cipher.rpartition(self.letter_splitter)
+                cipher = head.replace(self.letter_splitter, '')
+            else:
+                rest = ''
+            carry += ''.join(cipher.split())
+            return decoded(False)
+        def flush():
+            nonlocal carry
+            carry += ''.join((rest.replace(self.letter_splitter, '') if grouped else rest).split())
+            return decoded(True)
+        return process, flush
+
+    def encrypt_file(self, src, dst, encoding='utf-8'):
+        """
+        Translates the file ``src`` to binary into ``dst`` through a memory map, without loading it into memory
+
+        Args:
+            src (str|file): The filename (or readable binary file object, read in windows) of the file to be translated
+            dst (str|file): The filename (or writable binary file object) of the translated file
+            encoding (str): The encoding of both files. Defaults to ``'utf-8'``
+
+        Raises:
+            ValueError: When a character doesn't fit in ``width`` digits
+
+        Examples:
+            >>> import sys
+            >>> from crypyto.substitution_alphabets import Binary
+            >>> b = Binary()
+            >>> b.encrypt_file('export.log', 'export.log.bin')
+            >>> Binary(base=64, width=76, letter_splitter='\\n').encrypt_file(sys.stdin.buffer, sys.stdout.buffer)
+        """
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+        encode, finish = self._encoder()
+        def process(window):
+            return encode(decoder.decode(window)).encode(encoding)
+        def flush():
+            return (encode(decoder.decode(b'', True)) + finish()).encode(encoding)
+        process_file(src, dst, process, flush)
+
+    def decrypt_file(self, src, dst, encoding='utf-8'):
+        """
+        Translates the binary file ``src`` to text into ``dst`` through a memory map, without loading it into memory
+
+        Args:
+            src (str|file): The filename (or readable binary file object, read in windows) of the binary file
+            dst (str|file): The filename (or writable binary file object) of the translated file
+            encoding (str): The encoding of both files. Defaults to ``'utf-8'``
+
+        Raises:
+            ValueError: When ``src`` has invalid digits or characters
+
+        Examples:
+            >>> from crypyto.substitution_alphabets import Binary
+            >>> b = Binary()
+            >>> b.decrypt_file('export.log.bin', 'export.log')
+        """
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+        decode, finish = self._decoder()
+        def process(window):
+            return decode(decoder.decode(window)).encode(encoding)
+        def flush():
+            return (decode(decoder.decode(b'', True)) + finish()).encode(encoding)
+        process_file(src, dst, process, flush)
+
+_worker_manipulator = None
+
+def _fork_context():
+    if sys.version_info >= (3, 7) and 'fork' in multiprocessing.get_all_start_methods():
+        return {'mp_context':multiprocessing.get_context('fork')}
+    return {}
+
+def _timed_decrypt(manipulator, path):
+    start = time.perf_counter()
+    try:
+        return DecryptResult(path, manipulator.decrypt(path), None, time.perf_counter() - start)
+    except Exception as error:
+        return DecryptResult(path, None, error, time.perf_counter() - start)
+
+def _set_worker_manipulator(manipulator):
+    global _worker_manipulator
+    _worker_manipulator = manipulator
+
+def _worker_decrypt(path):
+    return _timed_decrypt(_worker_manipulator, path)
+
+def _fold(profile, pitch, cell_profile):
+    n_bins = len(cell_profile)
+    bins = (np.arange(len(profile)) % pitch * n_bins / pitch).astype(np.intp) % n_bins
+    folded = np.bincount(bins, weights=profile, minlength=n_bins) / np.maximum(np.bincount(bins, minlength=n_bins), 1)
+    folded = folded - folded.mean()
+    expected = cell_profile - cell_profile.mean()
+    norm = np.sqrt((folded ** 2).sum() * (expected ** 2).sum())
+    if not norm:
+        return 0.0, 0
+    correlation = np.fft.irfft(np.fft.rfft(folded) * np.fft.rfft(expected).conj(), n_bins) / norm
+    shift = int(correlation.argmax())
+    return float(correlation[shift]), shift
+
+def _refine_pitch(profile, pitch):
+    positions = np.arange(len(profile))
+    pitches = pitch * np.linspace(0.97, 1.03, 121)
+    power = np.abs(np.exp(-2j * np.pi * positions[None, :] / pitches[:, None]).dot(profile - profile.mean()))
+    return float(pitches[int(power.argmax())])
+
+def _candidate_scales(column_profile, row_profile, cell_columns, cell_rows, n_candidates=3):
+    def score(scale):
+        total = weight = 0
+        for profile, cell_profile in ((column_profile, cell_columns), (row_profile, cell_rows)):
+            n_cells = len(profile) / (scale * len(cell_profile))
+            total += n_cells * _fold(profile, scale * len(cell_profile), cell_profile)[0]
+            weight += n_cells
+        return total / weight
+
+    extent = max(len(column_profile) / len(cell_columns), len(row_profile) / len(cell_rows))
+    largest = min(8, max(2, 2 * extent))
+    scales = np.geomspace(0.25, largest, int(np.log(largest / 0.25) / np.log(1.02)) + 1)
+    scores = np.array([score(scale) for scale in scales])
+    is_peak = np.r_[True, scores[1:] > scores[:-1]] & np.r_[scores[:-1] >= scores[1:], True]
+    rough_scales = scales[is_peak][np.argsort(-scores[is_peak])[:n_candidates]]
+
+    candidates = []
+    for scale in rough_scales:
+        refined = weight = 0
+        for profile, cell_size in ((column_profile, len(cell_columns)), (row_profile, len(cell_rows))):
+            n_cells = len(profile) / (scale * cell_size)
+            if n_cells >= 3:
+                refined += n_cells * _refine_pitch(profile, scale * cell_size) / cell_size
+                weight += n_cells
+        candidates.append(refined / weight if weight else float(scale))
+    return [1.0] + candidates
+
+def _grid(page, x_start, y_start, right, bottom, cell_width, cell_height):
+    n_columns = -(-(right - x_start) // cell_width)
+    n_lines = -(-(bottom - y_start) // cell_height)
+    x_start += 2 * cell_width
+    y_start += 2 * cell_height
+    grid = page[y_start:y_start + n_lines * cell_height, x_start:x_start + n_columns * cell_width]
+    return grid.reshape(n_lines, cell_height, n_columns, cell_width).transpose(0, 2, 1, 3)
+
+def _grid_starts(profile, start, end, cell_profile):
+    cell_size = len(cell_profile)
+    if end - start < 2 * cell_size:
+        return list(range(start - cell_size + 1, start + 1))
+    shift = _fold(profile, cell_size, cell_profile)[1]
+    grid_start = start + shift - cell_size if shift else start
+    return list(range(grid_start - 2, grid_start + 3))
+
+_GRAY_LEVELS = 16
+_GRAY_PALETTE = [level * 255 // (_GRAY_LEVELS - 1) for level in range(_GRAY_LEVELS) for channel in range(3)]
+_IMAGE_MODES = ('RGB', 'L', 'P', '1')
+_GLYPHS_LOCK = Lock()
 
 class ImageSubstitution:
-    def __init__(self, abc, directory, extension):
+    _max_in_line = 30
+
+    def __init__(self, abc, directory, extension, executor=None):
+        self.executor = executor
         self.abc = abc.upper()
         self.not_abc_pattern = re.compile('[^{}]+'.format(re.escape(abc)), re.UNICODE)
         base_dir = os.path.dirname(os.path.realpath(__file__))
@@ -169,72 +918,455 @@ class ImageSubstitution:
         self.abc_to_img = self._get_abc_to_img()
         self.abc_to_img[''] = Image.open(self.filename.format('blank'))
 
+    @property
+    def abc_to_img(self):
+        return self._abc_to_img
+
+    @abc_to_img.setter
+    def abc_to_img(self, value):
+        self._abc_to_img = value
+        self._converted_glyphs = {}
+        self._rasters = {}
+        self._atlases = {}
+        self._sizes = None
+        self._templates = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['executor'] = None
+        return state
+
     def _get_abc_to_img(self):
         abc_to_img = {letter:Image.open(self.filename.format(letter)) for letter in self.abc}
         return abc_to_img
 
-    def _encrypt(self, text, filename='output.png', max_in_line=30):
-        text = unidecode(text).upper()
-        text = self.not_abc_pattern.sub('', text)
-        max_height = max(self.abc_to_img[letter].size[1] for letter in text)
+    def _glyphs(self, mode):
+        if mode not in _IMAGE_MODES:
+            raise ValueError('mode must be one of: {}'.format(', '.join(_IMAGE_MODES)))
+        if mode not in self._converted_glyphs:
+            with _GLYPHS_LOCK:
+                if mode not in self._converted_glyphs:
+                    glyphs = {}
+                    for letter, img in self.abc_to_img.items():
+                        gray = img.convert('L')
+                        if mode == 'RGB':
+                            glyph = img.convert('RGB')
+                        elif mode == 'L':
+                            glyph = gray
+                        elif mode == '1':
+                            glyph = gray.point(lambda value: 255 if value >= 128 else 0).convert('1')
+                        else:
+                            levels = gray.point(lambda value: (value * (_GRAY_LEVELS - 1) + 127) // 255)
+                            glyph = Image.frombytes('P', gray.size, levels.tobytes())
+                            glyph.putpalette(_GRAY_PALETTE)
+                        glyph.load()
+                        glyphs[letter] = glyph
+                    self._converted_glyphs[mode] = glyphs
+        return self._converted_glyphs[mode]
+
+    def _glyph_rasters(self, mode):
+        if mode not in self._rasters:
+            glyphs = self._glyphs(mode)
+            self._rasters[mode] = {letter:np.asarray(glyph.convert('L') if mode == '1' else glyph) for letter, glyph in glyphs.items()}
+        return self._rasters[mode]
+
+    def _glyph_sizes(self):
+        if self._sizes is None:
+            self._sizes = {letter:glyph.size for letter, glyph in self._glyphs('L').items()}
+        return self._sizes
+
+    def _layout(self, text, max_in_line):
+        sizes = self._glyph_sizes()
+        max_height = max(sizes[letter][1] for letter in text)
         if len(text) > max_in_line:
-            total_width = sum(self.abc_to_img[letter].size[0] for letter in text[:max_in_line])
+            total_width = sum(sizes[letter][0] for letter in text[:max_in_line])
             max_height *= ceil(len(text) / max_in_line)
         else:
-            total_width = sum(self.abc_to_img[letter].size[0] for letter in text)
+            total_width = sum(sizes[letter][0] for letter in text)
 
-        new_img = Image.new('RGB', (total_width, max_height), (255, 255, 255))
+        positions = []
         x_offset = 0
         y_offset = 0
         for letter in text:
-            new_img.paste(self.abc_to_img[letter], (x_offset, y_offset))
-            y_offset = y_offset + self.abc_to_img[letter].size[1] if x_offset + self.abc_to_img[letter].size[0] >= total_width else y_offset
-            x_offset = 0 if x_offset + self.abc_to_img[letter].size[0] >= total_width else x_offset + self.abc_to_img[letter].size[0]
-        new_img.save(filename)
-
-    def _get_rms(self, h1, h2):
-        h1 = h1.histogram()
-        h2 = h2.histogram()
-        diff_squares = [(h1[i] - h2[i]) ** 2 for i in range(len(h1))]
-        rms = sqrt(sum(diff_squares) / len(h1))
-        return rms
+            width, height = sizes[letter]
+            positions.append((letter, x_offset, y_offset))
+            if x_offset + width >= total_width:
+                x_offset = 0
+                y_offset += height
+            else:
+                x_offset += width
+        return (total_width, max_height), positions
+
+    def _svg(self, size, positions, mode):
+        glyphs = self._glyphs(mode)
+        symbol_ids = {}
+        symbols = []
+        uses = []
+        for letter, x_offset, y_offset in positions:
+            if letter not in symbol_ids:
+                symbol_ids[letter] = 'g{}'.format(len(symbol_ids))
+                png = BytesIO()
+                glyphs[letter].save(png, format='PNG')
+                symbols.append('<image id="{}" width="{}" height="{}" xlink:href="data:image/png;base64,{}"/>'.format(symbol_ids[letter], glyphs[letter].size[0], glyphs[letter].size[1], base64.b64encode(png.getvalue()).decode('ascii')))
+            uses.append('<use xlink:href="#{}" x="{}" y="{}"/>'.format(symbol_ids[letter], x_offset, y_offset))
+        svg = ['<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" width="{0}" height="{1}" viewBox="0 0 {0} {1}">'.format(*size),
+               '<rect width="100%" height="100%" fill="#fff"/>', '<defs>'] + symbols + ['</defs>'] + uses + ['</svg>']
+        return '\n'.join(svg).encode('utf-8')
+
+    def _atlas(self, mode):
+        if mode not in self._atlases:
+            rasters = self._glyph_rasters(mode)
+            letters = list(rasters)
+            atlas = np.stack([rasters[letter] for letter in letters])
+            atlas.flags.writeable = False
+            self._atlases[mode] = ({letter:index for index, letter in enumerate(letters)}, atlas)
+        return self._atlases[mode]
+
+    def _clean(self, text):
+        text = unidecode(text).upper()
+        return self.not_abc_pattern.sub('', text)
+
+    def _canvas_shape(self, n_letters, max_in_line, mode):
+        if max_in_line < 1:
+            raise ValueError('max_in_line must be at least 1')
+        if not n_letters:
+            raise ValueError('The text has no letters of the alphabet')
+        atlas = self._atlas(mode)[1]
+        n_columns = min(n_letters, max_in_line)
+        return (-(-n_letters // n_columns) * atlas.shape[1], n_columns * atlas.shape[2]) + atlas.shape[3:]
+
+    def _render(self, text, max_in_line, mode, canvas=None):
+        shape = self._canvas_shape(len(text), max_in_line, mode)
+        index, atlas = self._atlas(mode)
+        if canvas is None:
+            canvas = np.empty(shape, dtype=np.uint8)
+        cell_shape = atlas.shape[1:]
+        n_columns = min(len(text), max_in_line)
+        n_full = len(text) // n_columns
+        cells = atlas[[index[letter] for letter in text]]
+        grid = canvas.reshape((-1, cell_shape[0], n_columns) + cell_shape[1:])
+        grid[:n_full] = cells[:n_full * n_columns].reshape((n_full, n_columns) + cell_shape).swapaxes(1, 2)
+        if n_full < len(grid):
+            n_last = len(text) - n_full * n_columns
+            grid[n_full, :, :n_last] = cells[n_full * n_columns:].swapaxes(0, 1)
+            grid[n_full, :, n_last:] = _GRAY_LEVELS - 1 if mode == 'P' else 255
+        return canvas
+
+    def _image(self, canvas, mode):
+        new_img = Image.fromarray(canvas, 'L' if mode == '1' else mode)
+        if mode == '1':
+            new_img = new_img.convert('1', dither=Image.NONE)
+        elif mode == 'P':
+            new_img.putpalette(_GRAY_PALETTE)
+        return new_img
+
+    def _image_format(self, filename, image_format):
+        if image_format is None and not hasattr(filename, 'write'):
+            return 'SVG' if filename.lower().endswith('.svg') else None
+        return image_format
+
+    def _save(self, image, filename, image_format, compress_level, optimize):
+        image_format = image_format or ('PNG' if hasattr(filename, 'write') else None)
+        image.save(filename, format=image_format, compress_level=compress_level, optimize=optimize)
+
+    def _encrypt(self, text, filename='output.png', max_in_line=30, mode='RGB', compress_level=6, optimize=False, image_format=None):
+        text = self._clean(text)
+        image_format = self._image_format(filename, image_format)
+
+        if image_format and image_format.upper() == 'SVG':
+            self._glyphs(mode)
+            size, positions = self._layout(text, max_in_line)
+            svg = self._svg(size, positions, mode)
+            if hasattr(filename, 'write'):
+                filename.write(svg)
+            else:
+                with open(filename, 'wb') as output:
+                    output.write(svg)
+            return
+
+        self._save(self._image(self._render(text, max_in_line, mode), mode), filename, image_format, compress_level, optimize)
+
+    def encrypt_many(self, messages, max_in_line=None, mode='RGB', compress_level=6, optimize=False, image_format=None, workers=4):
+        """
+        Creates an image file for each (text, filename) pair of ``messages``, like ``encrypt`` does, but much faster for many messages.
+
+        The glyphs are stacked once into an atlas, so each message is copied into its canvas in a single step, and canvases of the same size are reused once their image is saved.
+        Image encoding releases the GIL, so it runs on a pool of ``workers`` threads while the next messages are rendered. The first error stops the batch and is raised
+
+        Args:
+            messages (iterable): The (text, filename) pairs, where filename is a filename or a writable binary file object. It's consumed lazily, so it may be a generator
+            max_in_line (int|None): The max number of letters per line. Defaults to ``None``, which uses the default of ``encrypt``
+            mode (str): The image mode: ``'RGB'``, ``'L'`` (grayscale), ``'P'`` (16 gray levels palette) or ``'1'`` (black and white). Defaults to ``'RGB'``
+            compress_level (int): The PNG compression level, from ``0`` (no compression, fastest) to ``9``. Defaults to ``6``
+            optimize (bool): Whether the PNG encoder should search for the smallest output (slower). Defaults to ``False``
+            image_format (str|None): The image format (e.g. ``'PNG'`` or ``'SVG'``). Defaults to ``None``, which uses the extension of each filename (PNG for file objects)
+            workers (int): Number of encoding threads. Defaults to ``4``
+
+        Raises:
+            ValueError: When ``mode`` is unknown, ``max_in_line`` is smaller than 1 or a text has no letters of the alphabet
+
+        Examples:
+            >>> from crypyto.substitution_alphabets import Templar
+            >>> templar = Templar()
+            >>> templar.encrypt_many((('Puzzle card {}'.format(number), 'card_{}.png'.format(number)) for number in range(1000)), mode='1')
+        """
+
+        max_in_line = max_in_line or self._max_in_line
+        workers = max(1, workers)
+        self._atlas(mode)
+        canvases = {}
+        lock = Lock()
+
+        def save(canvas, filename, file_format):
+            try:
+                self._save(self._image(canvas, mode), filename, file_format, compress_level, optimize)
+            finally:
+                with lock:
+                    canvases.setdefault(canvas.shape, []).append(canvas)
+
+        with ThreadPoolExecutor(workers) as executor:
+            pending = set()
+            for text, filename in messages:
+                file_format = self._image_format(filename, image_format)
+                if file_format and file_format.upper() == 'SVG':
+                    pending.add(executor.submit(self._encrypt, text, filename, max_in_line, mode, compress_level, optimize, file_format))
+                else:
+                    text = self._clean(text)
+                    shape = self._canvas_shape(len(text), max_in_line, mode)
+                    with lock:
+                        free = canvases.get(shape)
+                        canvas = free.pop() if free else None
+                    pending.add(executor.submit(save, self._render(text, max_in_line, mode, canvas), filename, file_format))
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+            for future in pending:
+                future.result()
+
+    def encrypt_sheet(self, texts, filename='sheet.png', index=None, max_in_line=None, sheet_width=4096, mode='RGB', compress_level=6, optimize=False):
+        """
+        Creates a single image (a sprite sheet) with every translated text and returns where each one is, as Sprite (text, x, y, width, height) tuples (list), in the order of ``texts``.
+        Each text is rendered like ``encrypt`` does and the renders are packed in rows, left to right, starting a new row when one would be wider than ``sheet_width``. Cropping a sprite's box gives its own image
+
+        Args:
+            texts (iterable): The texts to be translated
+            filename (str|file): The filename (or writable binary file object) of the sprite sheet. Defaults to ``'sheet.png'``
+            index (str|file|None): The filename (or writable text file object) of a JSON index with the offsets, a list of objects with the fields of Sprite. Defaults to ``None``, which doesn't write it
+            max_in_line (int|None): The max number of letters per line of each text. Defaults to ``None``, which uses the default of ``encrypt``
+            sheet_width (int): The max width of the rows, in pixels (a wider text gets a row of its own). Defaults to ``4096``
+            mode (str): The image mode: ``'RGB'``, ``'L'`` (grayscale), ``'P'`` (16 gray levels palette) or ``'1'`` (black and white). Defaults to ``'RGB'``
+            compress_level (int): The PNG compression level, from ``0`` (no compression, fastest) to ``9``. Defaults to ``6``
+            optimize (bool): Whether the PNG encoder should search for the smallest output (slower). Defaults to ``False``
+
+        Raises:
+            ValueError: When ``texts`` is empty, ``mode`` is unknown, ``max_in_line`` is smaller than 1 or a text has no letters of the alphabet
+
+        Examples:
+            >>> from crypyto.substitution_alphabets import Pigpen
+            >>> pigpen = Pigpen()
+            >>> pigpen.encrypt_sheet(['Hello, world!', 'Meet me at noon'], 'pigpen_sheet.png', 'pigpen_sheet.json')
+            [Sprite(text='Hello, world!', x=0, y=0, width=300, height=30), Sprite(text='Meet me at noon', x=300, y=0, width=360, height=30)]
+        """
+
+        max_in_line = max_in_line or self._max_in_line
+        texts = list(texts)
+        if not texts:
+            raise ValueError('texts must not be empty')
+        cleaned = [self._clean(text) for text in texts]
+        shapes = [self._canvas_shape(len(text), max_in_line, mode) for text in cleaned]
+
+        sprites = []
+        x_offset = y_offset = row_height = 0
+        for text, shape in zip(texts, shapes):
+            height, width = shape[:2]
+            if x_offset and x_offset + width > sheet_width:
+                x_offset, y_offset, row_height = 0, y_offset + row_height, 0
+            sprites.append(Sprite(text, x_offset, y_offset, width, height))
+            x_offset += width
+            row_height = max(row_height, height)
+
+        sheet = np.full((y_offset + row_height, max(sprite.x + sprite.width for sprite in sprites)) + shapes[0][2:], _GRAY_LEVELS - 1 if mode == 'P' else 255, dtype=np.uint8)
+        canvases = {}
+        for sprite, text, shape in zip(sprites, cleaned, shapes):
+            canvases[shape] = self._render(text, max_in_line, mode, canvases.get(shape))
+            sheet[sprite.y:sprite.y + sprite.height, sprite.x:sprite.x + sprite.width] = canvases[shape]
+        self._save(self._image(sheet, mode), filename, None, compress_level, optimize)
+
+        if index is not None:
+            entries = [dict(sprite._asdict()) for sprite in sprites]
+            if hasattr(index, 'write'):
+                json.dump(entries, index)
+            else:
+                with open(index, 'w') as output:
+                    json.dump(entries, output)
+        return sprites
+
+    def _template_index(self):
+        if self._templates is None:
+            letters = list(self.abc_to_img)
+            gray_glyphs = self._glyphs('L')
+            glyphs = np.stack([1 - np.asarray(gray_glyphs[letter], dtype=np.float32) / 255 for letter in letters])
+            n_glyphs, cell_height, cell_width = glyphs.shape
+            matrix = glyphs.reshape(n_glyphs, cell_height * cell_width)
+            self._templates = (letters, matrix, (matrix ** 2).sum(axis=1), glyphs.mean(axis=(0, 1)), glyphs.mean(axis=(0, 2)))
+        return self._templates
+
+    def _segment(self, cipher):
+        letters, matrix, squared_norms, cell_columns, cell_rows = self._template_index()
+        cell_width, cell_height = len(cell_columns), len(cell_rows)
+        ink = np.asarray(cipher, dtype=np.uint8) < 128
+        ink_columns = np.nonzero(ink.any(axis=0))[0]
+        ink_rows = np.nonzero(ink.any(axis=1))[0]
+        if not len(ink_columns):
+            return np.zeros((0, matrix.shape[1]), dtype=np.float32)
+        box = (ink_columns[0], ink_rows[0], ink_columns[-1] + 1, ink_rows[-1] + 1)
+        ink = ink[box[1]:box[3], box[0]:box[2]]
+
+        def residual(cells):
+            cells = cells.reshape(-1, cell_height * cell_width)
+            energy = (cells ** 2).sum()
+            return (energy + (squared_norms - 2 * cells.dot(matrix.T)).min(axis=1).sum()) / max(energy, 1e-9)
+
+        def fits(scale):
+            if scale == 1:
+                page = 1 - np.asarray(cipher, dtype=np.float32) / 255
+            else:
+                size = (max(1, int(round(cipher.size[0] / scale))), max(1, int(round(cipher.size[1] / scale))))
+                page = 1 - np.asarray(cipher.resize(size, Image.BOX if scale > 1 else Image.BILINEAR), dtype=np.float32) / 255
+            left, top, right, bottom = (int(round(value / scale)) for value in box)
+            page = np.pad(page, ((2 * cell_height, 2 * cell_height), (2 * cell_width, 2 * cell_width)), 'constant')
+            content = page[2 * cell_height + top:2 * cell_height + bottom, 2 * cell_width + left:2 * cell_width + right]
+            for x_start in _grid_starts(content.sum(axis=0), left, right, cell_columns):
+                for y_start in _grid_starts(content.sum(axis=1), top, bottom, cell_rows):
+                    grid = _grid(page, x_start, y_start, right, bottom, cell_width, cell_height)
+                    sample = grid[np.unique(np.linspace(0, grid.shape[0] - 1, 8).astype(np.intp))][:, np.unique(np.linspace(0, grid.shape[1] - 1, 8).astype(np.intp))]
+                    yield residual(sample), scale, grid
+
+        candidates = [fit for scale in _candidate_scales(ink.sum(axis=0), ink.sum(axis=1), cell_columns, cell_rows) for fit in fits(scale)]
+        scale = min(candidates, key=lambda fit: fit[0])[1]
+        if scale != 1:
+            candidates.extend(fit for step in np.linspace(-0.02, 0.02, 11) if step for fit in fits(scale * (1 + step)))
+        candidates.sort(key=lambda fit: fit[0])
+        grid = min((fit[2] for fit in candidates[:5]), key=residual)
+        return grid.reshape(-1, cell_height * cell_width)
 
     def _decrypt(self, filename):
-        cipher = Image.open(filename)
-        base_width, base_height = self.abc_to_img[self.abc[0]].size
-        if cipher.size[0] % base_width > 0 or cipher.size[1] % base_height > 0:
-            raise ValueError('Encrypted image is not properly sized')
-        n_letters_p_line = cipher.size[0] // base_width
-        n_lines = cipher.size[1] // base_height
-        text = ''
-        y_offset = 0
-        for line in range(n_lines):
-            x_offset = 0
-            for letter in range(n_letters_p_line):
-                cropped_letter = cipher.crop((x_offset, y_offset, x_offset + base_width, y_offset + base_height))
-                all_rms = {l:self._get_rms(i, cropped_letter) for l,i in self.abc_to_img.items()}
-                letter = min(all_rms, key=lambda k: all_rms[k])
-                text += letter
-                x_offset += base_width
-            y_offset += base_height
-        return text
+        if isinstance(filename, (bytes, bytearray, memoryview)):
+            filename = BytesIO(filename)
+        cipher = Image.open(filename).convert('L')
+        letters, matrix, squared_norms = self._template_index()[:3]
+        cells = self._segment(cipher)
+        distances = squared_norms - 2 * cells.dot(matrix.T)
+        return ''.join(letters[index] for index in distances.argmin(axis=1))
+
+    async def encrypt_async(self, text, filename=None, executor=None, **kwargs):
+        """
+        Coroutine version of ``encrypt``. The rendering and PNG encoding run on ``executor``, so the event loop isn't blocked
+
+        Args:
+            text (str): Text to be translated
+            filename (str|file|None): Filename or writable binary file object of the image with the translated text. Defaults to ``None``, which returns the PNG as ``bytes``
+            executor (concurrent.futures.Executor|None): Executor to run the work on. Defaults to ``None``, which uses ``self.executor`` (and the loop's default executor if that's ``None`` too)
+            **kwargs: Extra arguments passed to ``encrypt`` (e.g. ``max_in_line``)
+
+        Examples:
+            >>> from crypyto.substitution_alphabets import Templar
+            >>> templar = Templar()
+            >>> png = await templar.encrypt_async('Hello, world!')
+            >>> await templar.encrypt_async('Hello, world!', 'templar_hello.png')
+        """
+
+        output = BytesIO() if filename is None else filename
+        loop = asyncio.get_running_loop()
+        executor = self.executor if executor is None else executor
+        await loop.run_in_executor(executor, partial(self.encrypt, text, output, **kwargs))
+        if filename is None:
+            return output.getvalue()
+
+    async def decrypt_async(self, filename, executor=None):
+        """
+        Coroutine version of ``decrypt``. File reading, image decoding and matching run on ``executor``, so the event loop isn't blocked
+
+        Args:
+            filename (str|file|bytes): Filename, readable binary file object or PNG ``bytes`` of the cipher image
+            executor (concurrent.futures.Executor|None): Executor to run the work on. Defaults to ``None``, which uses ``self.executor`` (and the loop's default executor if that's ``None`` too)
+
+        Examples:
+            >>> from crypyto.substitution_alphabets import Templar
+            >>> templar = Templar()
+            >>> png = await templar.encrypt_async('Hello, world!')
+            >>> await templar.decrypt_async(png)
+            'HELLOWORLD'
+        """
+
+        loop = asyncio.get_running_loop()
+        executor = self.executor if executor is None else executor
+        return await loop.run_in_executor(executor, self.decrypt, filename)
+
+    def decrypt_many(self, paths, workers=1):
+        """
+        Decrypts many cipher images, yielding a DecryptResult (path, text, error, seconds) for each one as soon as it's done, so results may come out of order.
+        A file that can't be decrypted yields its exception as ``error`` (and ``None`` as ``text``) instead of stopping the batch
+
+        With more than one worker, the images are decrypted by a process pool. The glyphs are prepared once, before the workers start, and each worker gets the manipulator once, when it starts (inherited when processes are forked), so only the paths are sent along with each image
+
+        Args:
+            paths (iterable): Filenames (or PNG ``bytes``) of the cipher images. It's consumed lazily, so it may be a generator
+            workers (int): Number of processes. Defaults to ``1``, which decrypts in the current process
+
+        Examples:
+            >>> import glob
+            >>> from crypyto.substitution_alphabets import Templar
+            >>> templar = Templar()
+            >>> for result in templar.decrypt_many(glob.glob('scans/*.png'), workers=4):
+            ...     print(result.path, result.text or result.error, '{:.3f}s'.format(result.seconds))
+            scans/0002.png HELLOWORLD 0.012s
+            scans/0001.png cannot identify image file 'scans/0001.png' 0.004s
+        """
+
+        self._template_index()
+        if workers <= 1:
+            for path in paths:
+                yield _timed_decrypt(self, path)
+            return
+
+        with ProcessPoolExecutor(workers, initializer=_set_worker_manipulator, initargs=(self,), **_fork_context()) as executor:
+            pending = set()
+            for path in paths:
+                pending.add(executor.submit(_worker_decrypt, path))
+                if len(pending) >= workers * 4:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
 
 class Pigpen(ImageSubstitution):
     """
     `Pigpen` represents a Pigpen Cipher manipulator
+
+    Args:
+        executor (concurrent.futures.Executor|None): Default executor used by ``encrypt_async`` and ``decrypt_async``. Defaults to ``None``, which uses the event loop's default executor
     """
 
-    def __init__(self):
-        super().__init__(string.ascii_uppercase, 'Pigpen', 'png')
+    def __init__(self, executor=None):
+        super().__init__(string.ascii_uppercase, 'Pigpen', 'png', executor)
 
-    def encrypt(self, text, filename='output.png', max_in_line=30):
+    def encrypt(self, text, filename='output.png', max_in_line=30, mode='RGB', compress_level=6, optimize=False, image_format=None):
         """
         Creates an image file with the translated text
 
         Args:
             text (str): Text to be translated to the Pigpen alphabet
-            filename (str): The filename of the image file with the translated text. Defaults to ``'output.png'``
+            filename (str|file): The filename (or writable binary file object) of the image file with the translated text. Defaults to ``'output.png'``
             max_in_line (int): The max number of letters per line. Defaults to ``30``
+            mode (str): The image mode: ``'RGB'``, ``'L'`` (grayscale), ``'P'`` (16 gray levels palette) or ``'1'`` (black and white). The last ones make much smaller files. Defaults to ``'RGB'``
+            compress_level (int): The PNG compression level, from ``0`` (no compression, fastest) to ``9``. Defaults to ``6``
+            optimize (bool): Whether the PNG encoder should search for the smallest output (slower). Defaults to ``False``
+            image_format (str|None): The image format (e.g. ``'PNG'`` or ``'SVG'``). Defaults to ``None``, which uses the extension of ``filename`` (PNG for file objects). SVG output embeds each distinct glyph once and only references it afterwards, but can't be decrypted
 
         Examples:
             >>> from crypyto.substitution_alphabets import Pigpen
@@ -243,25 +1375,22 @@ class Pigpen(ImageSubstitution):
             >>> pigpen.encrypt('Hello, world!', 'pigpen_hello_max.png', 5)
         """
 
-        super()._encrypt(text, filename, max_in_line)
+        super()._encrypt(text, filename, max_in_line, mode, compress_level, optimize, image_format)
 
     def decrypt(self, filename):
         """
-        Returns the image cipher translated to normal text (str). It will most often do it wrong, because of specifications on Pigpen. I'll try to fix that soon.
+        Returns the image cipher translated to normal text (str). The image may have margins and be scaled, its glyph grid is found from the ink profiles
 
         Args:
-            filename (str): Filename of the cipher image file
-
-        Raise:
-            ValueError: If the size of the respective image doensn't match the cipher pattern. I'll try to work on that.
+            filename (str|file|bytes): Filename, readable binary file object or PNG ``bytes`` of the cipher image
 
         Examples:
             >>> from crypyto.substitution_alphabets import Pigpen
             >>> pigpgen = Pigpen()
             >>> pigpen.decrypt('pigpen_hello.png')
-            'BEJJMWMJJD'
+            'HELLOWORLD'
             >>> pigpen.decrypt('pigpen_hello_max.png')
-            'BEJJMWMJJD'
+            'HELLOWORLD'
         """
 
         return super()._decrypt(filename)
@@ -269,38 +1398,44 @@ class Pigpen(ImageSubstitution):
 class Templar(ImageSubstitution):
     """
     `Templar` represents a Templar Cipher manipulator
+
+    Args:
+        executor (concurrent.futures.Executor|None): Default executor used by ``encrypt_async`` and ``decrypt_async``. Defaults to ``None``, which uses the event loop's default executor
     """
 
-    def __init__(self):
-        super().__init__(string.ascii_uppercase, 'Templar', 'png')
+    def __init__(self, executor=None):
+        super().__init__(string.ascii_uppercase, 'Templar', 'png', executor)
 
-    def encrypt(self, text, filename='output.png', max_in_line=30):
+    def encrypt(self, text, filename='output.png', max_in_line=30, mode='RGB', compress_level=6, optimize=False, image_format=None):
         """
         Creates an image file with the translated text
 
         Args:
             text (str): Text to be translated to the Templar alphabet
-            filename (str): The filename of the image file with the translated text. Defaults to ``'output.png'``
+            filename (str|file): The filename (or writable binary file object) of the image file with the translated text. Defaults to ``'output.png'``
             max_in_line (int): The max number of letters per line. Defaults to ``30``
+            mode (str): The image mode: ``'RGB'``, ``'L'`` (grayscale), ``'P'`` (16 gray levels palette) or ``'1'`` (black and white). The last ones make much smaller files. Defaults to ``'RGB'``
+            compress_level (int): The PNG compression level, from ``0`` (no compression, fastest) to ``9``. Defaults to ``6``
+            optimize (bool): Whether the PNG encoder should search for the smallest output (slower). Defaults to ``False``
+            image_format (str|None): The image format (e.g. ``'PNG'`` or ``'SVG'``). Defaults to ``None``, which uses the extension of ``filename`` (PNG for file objects). SVG output embeds each distinct glyph once and only references it afterwards, but can't be decrypted
         
         Examples:
             >>> from crypyto.substitution_alphabets import Templar
             >>> templar = Templar()
             >>> templar.encrypt('Hello, world!', 'templar_hello.png')
             >>> templar.encrypt('Hello, world!', 'templar_hello_max.png', 5)
+            >>> templar.encrypt('Hello, world!', 'templar_hello_small.png', mode='1', compress_level=9)
+            >>> templar.encrypt('Hello, world!', 'templar_hello.svg')
         """
 
-        super()._encrypt(text, filename, max_in_line)
+        super()._encrypt(text, filename, max_in_line, mode, compress_level, optimize, image_format)
 
     def decrypt(self, filename):
         """
-        Returns the image cipher translated to normal text (str)
+        Returns the image cipher translated to normal text (str). The image may have margins and be scaled, its glyph grid is found from the ink profiles
 
         Args:
-            filename (str): Filename of the cipher image file
-
-        Raise:
-            ValueError: If the size of the respective image doensn't match the cipher pattern. I'll try to work on that.
+            filename (str|file|bytes): Filename, readable binary file object or PNG ``bytes`` of the cipher image
 
         Examples:
             >>> from crypyto.substitution_alphabets import Templar
@@ -319,13 +1454,18 @@ class Betamaze(ImageSubstitution):
 
     Args:
         random_rotate (bool): Whether to randomly rotate each square letter (as it is possible with Betamaze). Defaults to ``False``
+        executor (concurrent.futures.Executor|None): Default executor used by ``encrypt_async`` and ``decrypt_async``. Defaults to ``None``, which uses the event loop's default executor
+        seed (int|None): Seed of the random generator which picks the rotation of each letter. Defaults to ``None``, which seeds it from the operating system
     """
 
-    def __init__(self, random_rotate=False):
+    _max_in_line = 10
+
+    def __init__(self, random_rotate=False, executor=None, seed=None):
+        self._random = random.Random(seed)
         self._random_rotate = True if random_rotate else False
         self._symbols_dict = {',':'comma', '.':'period', ' ':'space', '(':'parenthesis', ')':'parenthesis', ':':'colon', ';':'semicolon', '"':'quote'}
         abc = string.ascii_uppercase + ' ,.:;"()0123456789'
-        super().__init__(abc, 'Betamaze', 'png')
+        super().__init__(abc, 'Betamaze', 'png', executor)
 
     @property
     def random_rotate(self):
@@ -340,19 +1480,23 @@ class Betamaze(ImageSubstitution):
     def _get_abc_to_img(self):
         symbols_dict = {'.'}
         if self.random_rotate:
-            abc_to_img = {char:Image.open(self.filename.format(self._symbols_dict.get(char, char))).rotate(90 * random.randint(0,3)) for char in self.abc}
+            abc_to_img = {char:Image.open(self.filename.format(self._symbols_dict.get(char, char))).rotate(90 * self._random.randint(0,3)) for char in self.abc}
         else:
             abc_to_img = {char:Image.open(self.filename.format(self._symbols_dict.get(char, char))) for char in self.abc}
         return abc_to_img
 
-    def encrypt(self, text, filename='output.png', max_in_line=10):
+    def encrypt(self, text, filename='output.png', max_in_line=10, mode='RGB', compress_level=6, optimize=False, image_format=None):
         """
         Creates an image file with the translated text
 
         Args:
             text (str): Text to be translated to the Betamaze alphabet
-            filename (str): The filename of the image file with the translated text. Defaults to ``'output.png'``
+            filename (str|file): The filename (or writable binary file object) of the image file with the translated text. Defaults to ``'output.png'``
             max_in_line (int): The max number of letters per line. Defaults to ``10``
+            mode (str): The image mode: ``'RGB'``, ``'L'`` (grayscale), ``'P'`` (16 gray levels palette) or ``'1'`` (black and white). The last ones make much smaller files. Defaults to ``'RGB'``
+            compress_level (int): The PNG compression level, from ``0`` (no compression, fastest) to ``9``. Defaults to ``6``
+            optimize (bool): Whether the PNG encoder should search for the smallest output (slower). Defaults to ``False``
+            image_format (str|None): The image format (e.g. ``'PNG'`` or ``'SVG'``). Defaults to ``None``, which uses the extension of ``filename`` (PNG for file objects). SVG output embeds each distinct glyph once and only references it afterwards, but can't be decrypted
 
         Examples:
             >>> from crypyto.substitution_alphabets import Betamaze
@@ -363,17 +1507,14 @@ class Betamaze(ImageSubstitution):
             >>> betamaze_random.encrypt('Hello, world!', 'betamaze_hello_random.png', 5)
         """
 
-        super()._encrypt(text, filename, max_in_line)
+        super()._encrypt(text, filename, max_in_line, mode, compress_level, optimize, image_format)
 
     def decrypt(self, filename):
         """
-        Returns the image cipher translated to normal text (str)
+        Returns the image cipher translated to normal text (str). The image may have margins and be scaled, its glyph grid is found from the ink profiles
 
         Args:
-            filename (str): Filename of the cipher image file
-
-        Raise:
-            ValueError: If the size of the respective image doensn't match the cipher pattern. I'll try to work on that.
+            filename (str|file|bytes): Filename, readable binary file object or PNG ``bytes`` of the cipher image
 
         Examples:
             >>> from crypyto.substitution_alphabets import Betamaze
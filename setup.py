@@ -47,5 +47,6 @@ setup(
     install_requires=[
           'unidecode',
           'Pillow',
+          'numpy',
     ],
 )
\ No newline at end of file
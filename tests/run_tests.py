@@ -1,6 +1,25 @@
+import asyncio
+import json
 import os
+import random
+import string
+import pickle
+import tempfile
+import time
+from io import BytesIO, StringIO
+import numpy as np
+from unidecode import unidecode
+from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
 from crypyto.ciphers import *
 from crypyto.substitution_alphabets import *
+from crypyto.pipeline import *
+from crypyto.specs import CipherSpec
+from crypyto.pool import CipherPool
+from crypyto.cache import ResultCache
+from crypyto.cryptanalysis import english_score, identify, solve
+from crypyto.frequency_analysis import FrequencyCounter
+from thread_stress import stress
 
 ciphers = {
 	'tests/PolybiusSquare.out':PolybiusSquare(5, 5),
@@ -12,8 +31,13 @@ ciphers = {
 	'tests/Keyword.out':Keyword('secret'),
 	'tests/Vigenere.out':Vigenere('secret'),
 	'tests/Binary.out':Binary(),
+	'tests/Binary8.out':Binary(base=8),
+	'tests/Binary16.out':Binary(base=16, width=4),
+	'tests/Binary32.out':Binary(base=32),
+	'tests/Binary64.out':Binary(base=64, width=8),
 	'tests/Beaufort.out':Beaufort('secret'),
 	'tests/Gronsfeld.out':Gronsfeld('2317'),
+	'tests/Pipeline.out':Pipeline(Keyword('secret'), Vigenere('secret'), Morse()),
 	}
 
 with open('tests/input.in', 'r') as input_file:
@@ -25,4 +49,423 @@ for cipher in ciphers:
 	for input_text, encrypted_text in zip(input_strings, encrypted_outputs):
 			encrypted, decrypted = encrypted_text.split(' <<equals to>> ')
 			assert ciphers[cipher].encrypt(input_text) == encrypted
-			assert decrypted == ciphers[cipher].decrypt(encrypted)
\ No newline at end of file
+			assert decrypted == ciphers[cipher].decrypt(encrypted)
+
+for binary in [ciphers['tests/Binary{}.out'.format(base)] for base in ['', '8', '16', '32', '64']]:
+	pipeline = Pipeline(Caesar(key=2), binary)
+	for input_text in input_strings:
+		encrypted = binary.encrypt(Caesar(key=2).encrypt(input_text))
+		assert pipeline.encrypt(input_text) == encrypted
+		assert ''.join(pipeline.encrypt_stream(input_text[start:start + 3] for start in range(0, len(input_text), 3))) == encrypted
+		assert ''.join(pipeline.decrypt_stream(encrypted[start:start + 5] for start in range(0, len(encrypted), 5))) == Caesar(key=2).decrypt(Caesar(key=2).encrypt(input_text))
+	message = 'Whoever has the key can read every single word of this message'
+	assert identify(binary.encrypt(message)) == ['binary']
+	assert solve(binary.encrypt(message))[0][1:3] == (binary.base, message)
+
+short_message = 'Whoever has the key can read every single word of this message, and so can anyone patient enough to count letters'
+for cipher, key in [(Gronsfeld('2317'), '2317'), (Vigenere('lemon'), 'LEMON'), (Beaufort('secret'), 'SECRET')]:
+	for max_period in [8, 20]:
+		best = solve(cipher.encrypt(short_message), max_period=max_period)[0]
+		assert (type(best.cipher), best.key, best.text) == (type(cipher), key, short_message.upper())
+
+ascii_text = '\n'.join(line for line in input_strings if all(ord(char) < 128 for char in line)) * 11000
+file_ciphers = [ciphers['tests/{}.out'.format(name)] for name in ['Atbash', 'Caesar', 'Affine', 'Keyword', 'Vigenere', 'Beaufort', 'Gronsfeld']]
+
+def write_file(filename, data):
+	with open(filename, 'wb') as output:
+		output.write(data)
+
+def read_file(filename):
+	with open(filename, 'rb') as input_file:
+		return input_file.read()
+
+with tempfile.TemporaryDirectory() as directory:
+	plain_file = os.path.join(directory, 'plain.txt')
+	encrypted_file = os.path.join(directory, 'encrypted.txt')
+	decrypted_file = os.path.join(directory, 'decrypted.txt')
+	write_file(plain_file, ascii_text.encode())
+
+	for cipher in file_ciphers:
+		encrypted = cipher.encrypt(ascii_text).encode()
+		cipher.encrypt_file(plain_file, encrypted_file)
+		assert read_file(encrypted_file) == encrypted
+		cipher.decrypt_file(encrypted_file, decrypted_file)
+		assert read_file(decrypted_file) == ascii_text.upper().encode()
+
+		cipher.encrypt_file(plain_file, encrypted_file, workers=3)
+		assert read_file(encrypted_file) == encrypted
+		cipher.decrypt_file(encrypted_file, decrypted_file, workers=3)
+		assert read_file(decrypted_file) == ascii_text.upper().encode()
+
+	index = os.path.join(directory, 'encrypted.idx')
+	rebuilt_index = os.path.join(directory, 'rebuilt.idx')
+	upper_text = ascii_text.upper().encode()
+	for cipher in file_ciphers[4:]:
+		cipher.encrypt_file(plain_file, encrypted_file, workers=3, index=index)
+		cipher.build_index(encrypted_file, rebuilt_index)
+		assert read_file(index) == read_file(rebuilt_index)
+		for offset, length in [(0, 16), (1000, 40), ((1 << 18) - 7, 30), ((1 << 19) + 3, 100), (len(upper_text) - 5, 16), (len(upper_text) + 10, 16)]:
+			assert cipher.decrypt_at(encrypted_file, offset, length, index) == upper_text[offset:offset + length]
+			assert cipher.decrypt_at(encrypted_file, offset, length) == upper_text[offset:offset + length]
+		write_file(decrypted_file, b'too short')
+		try:
+			cipher.decrypt_at(decrypted_file, 0, 4, index)
+			assert False
+		except ValueError:
+			pass
+
+	unicode_text = '\n'.join(input_strings)
+	write_file(plain_file, unicode_text.encode())
+	binary = Binary()
+	binary.encrypt_file(plain_file, encrypted_file)
+	assert read_file(encrypted_file).decode() == binary.encrypt(unicode_text)
+	binary.decrypt_file(encrypted_file, decrypted_file)
+	assert read_file(decrypted_file).decode() == unicode_text
+
+specs = [CipherSpec(Atbash), CipherSpec(Caesar, key=7), CipherSpec(Affine, 5, 8), CipherSpec(Keyword, 'secret'), CipherSpec(Vigenere, 'secret'), CipherSpec(Beaufort, 'secret'), CipherSpec(Gronsfeld, '2317')]
+data = ascii_text[:5000].encode()
+split = 1234
+for spec, cipher in zip(specs, file_ciphers):
+	unpickled = pickle.loads(pickle.dumps(spec))
+	assert unpickled == spec
+	for input_text in input_strings:
+		assert unpickled.encrypt(input_text) == cipher.encrypt(input_text)
+	encrypted = cipher.encrypt(data.decode()).encode()
+	assert unpickled.encrypt_bytes(data) == encrypted
+	assert unpickled.decrypt_bytes(encrypted) == data.upper()
+	n_letters = sum(chr(byte).isalpha() for byte in data[:split])
+	assert spec.encrypt_bytes(data[:split]) + spec.encrypt_bytes(data[split:], n_letters) == encrypted
+	try:
+		spec.args = ()
+		assert False
+	except AttributeError:
+		pass
+
+pool = CipherPool(maxsize=2)
+for cipher_class, args, kwargs in [(Vigenere, ('secret',), {}), (RailFence, (4,), {'direction':'U'}), (Caesar, (), {'key':7})]:
+	shared = pool.get(cipher_class, *args, **kwargs)
+	assert shared is pool.get(cipher_class, *args, **kwargs)
+	unpickled = pickle.loads(pickle.dumps(shared))
+	assert isinstance(unpickled, cipher_class)
+	for input_text in input_strings:
+		assert unpickled.encrypt(input_text) == cipher_class(*args, **kwargs).encrypt(input_text)
+	try:
+		unpickled.key = 'other'
+		assert False
+	except AttributeError:
+		pass
+assert pool.info() == (3, 3, 1, 2, 2)
+
+with tempfile.TemporaryDirectory() as directory:
+	cache = ResultCache(os.path.join(directory, 'cache.sqlite'))
+	for cipher in [Vigenere('lemon').encrypt(short_message), Affine(5, 8).encrypt(short_message), RailFence(3).encrypt(short_message), Binary(base=16).encrypt(short_message)]:
+		fresh = solve(cipher)
+		assert solve(cipher, cache=cache) == fresh
+		cached = solve(cipher, cache=cache)
+		assert cached == fresh
+		assert cached[0].cipher.decrypt(cipher) == fresh[0].cipher.decrypt(cipher)
+	cipher = Caesar(key=4).encrypt(short_message)
+	Caesar(key=1).brute_force(cipher, output_file=os.path.join(directory, 'first.txt'), cache=cache)
+	Caesar(key=9).brute_force(cipher, output_file=os.path.join(directory, 'second.txt'), cache=cache)
+	assert read_file(os.path.join(directory, 'first.txt')) == read_file(os.path.join(directory, 'second.txt'))
+	assert cache.info()[:2] == (5, 5)
+	cache.close()
+
+assert [timing[:2] for timing in stress(threads=4, rounds=1)] == [(name, 4) for name in ['round_trips', 'seeded_square', 'rail_fence_brute_force', 'cracking', 'images']]
+
+images = []
+for betamaze in [Betamaze(random_rotate=True, seed=5), Betamaze(random_rotate=True, seed=5)]:
+	image = BytesIO()
+	betamaze.encrypt('Hello, world!', image, 5)
+	images.append(image.getvalue())
+	assert betamaze.decrypt(image.getvalue()) == 'HELLO, WORLD'
+assert images[0] == images[1]
+
+whole = FrequencyCounter(max_period=8)
+whole.update(short_message * 3)
+chunked = FrequencyCounter(max_period=8)
+for start in range(0, len(short_message * 3), 7):
+	chunked.update((short_message * 3)[start:start + 7].encode())
+for n in [1, 2, 3]:
+	assert chunked.counts(n) == whole.counts(n)
+assert chunked.periodic_statistics() == whole.periodic_statistics()
+assert whole.most_common(1) == [('E', 3 * short_message.upper().count('E'))]
+with tempfile.TemporaryDirectory() as directory:
+	write_file(os.path.join(directory, 'message.txt'), (short_message * 3).encode())
+	from_file = FrequencyCounter(max_period=8)
+	from_file.update_file(os.path.join(directory, 'message.txt'), window_size=5)
+	assert from_file.counts(3) == whole.counts(3)
+vigenere = FrequencyCounter(max_period=8)
+vigenere.update(Vigenere('lemon').encrypt(short_message * 3))
+assert max(vigenere.periodic_statistics(), key=lambda statistics: statistics[1])[0] == 5
+
+square = PolybiusSquare(5, 5, seed=1)
+cipher = square.encrypt(short_message)
+expected = square.decrypt(cipher)
+for size in [1, 2, 3, 5, 64, len(cipher)]:
+	chunks = [cipher[start:start + size] for start in range(0, len(cipher), size)]
+	assert ''.join(square.decrypt_stream(chunks)) == expected
+	assert ''.join(square.decrypt_stream(StringIO(cipher.replace(';', '; ')), chunk_size=size)) == expected
+for malformed in ['6x6#1-1;', '5x5#1-1;2;', '5x5#6-1;', '']:
+	try:
+		''.join(square.decrypt_stream([malformed]))
+		assert False
+	except ValueError:
+		pass
+
+for letters in [string.ascii_uppercase, 'ABCA', ''.join(chr(0x1F600 + index) for index in range(40)) + 'ABC']:
+	abc = Alphabet(letters)
+	assert abc == letters and isinstance(abc, str)
+	assert [abc.index(letter) for letter in letters] == [letters.index(letter) for letter in letters]
+	assert list(abc.to_indices(letters + '?')) == [letters.index(letter) for letter in letters] + [-1]
+	assert abc.from_indices(abc.to_indices(letters)) == ''.join(letters[letters.index(letter)] for letter in letters)
+	assert '?' not in abc and letters[-1] in abc
+	try:
+		abc.index('?')
+		assert False
+	except ValueError:
+		pass
+emoji_abc = ''.join(chr(0x1F600 + index) for index in range(40)) + 'ABC'
+caesar = Caesar(abc=emoji_abc, key=3)
+assert caesar.decrypt(caesar.encrypt(emoji_abc + '!', decode_unicode=False), decode_unicode=False) == emoji_abc + '!'
+
+for n_rails in [2, 3, 7]:
+	for direction in ['D', 'U']:
+		rail_fence = RailFence(n_rails, direction=direction)
+		cipher = rail_fence.encrypt(short_message)
+		plain = rail_fence.decrypt(cipher)
+		for start, stop in [(0, None), (5, 14), (-4, None), (30, 31), (20, 10), (0, 1000)]:
+			assert rail_fence.decrypt_range(cipher, start, stop) == plain[start:stop]
+			assert rail_fence.decrypt_range(cipher.encode(), start, stop) == plain[start:stop].encode()
+			assert rail_fence.decrypt_range(BytesIO(cipher.encode()), start, stop) == plain[start:stop].encode()
+		assert RailFence(2).decrypt_range(cipher, 5, 14, n_rails=n_rails, direction=direction) == plain[5:14]
+
+for manipulator, expected in [(Pigpen(), 'HELLOWORLD'), (Templar(), 'HELLOWORLD'), (Betamaze(), 'HELLO, WORLD')]:
+	sizes = {}
+	for mode in ['RGB', 'L', 'P', '1']:
+		for compress_level, optimize in [(0, False), (9, True)]:
+			image = BytesIO()
+			manipulator.encrypt('Hello, world!', image, 5, mode=mode, compress_level=compress_level, optimize=optimize)
+			assert Image.open(BytesIO(image.getvalue())).mode == mode
+			assert manipulator.decrypt(image.getvalue()) == expected
+			sizes[mode, compress_level] = len(image.getvalue())
+	assert sizes['1', 9] < sizes['L', 9] < sizes['RGB', 9] < sizes['RGB', 0]
+	svg = BytesIO()
+	manipulator.encrypt('Hello, world!', svg, 5, image_format='SVG')
+	svg = svg.getvalue().decode()
+	assert svg.startswith('<svg') and svg.endswith('</svg>')
+	assert (svg.count('<image'), svg.count('<use')) == (len(set(expected)), len(expected))
+
+templar = Templar()
+with tempfile.TemporaryDirectory() as directory:
+	expected = {}
+	for number, text in enumerate(['Hello, world!', 'Meet me at noon', 'Attack at dawn']):
+		path = os.path.join(directory, '{}.png'.format(number))
+		templar.encrypt(text, path, mode='1')
+		expected[path] = templar.decrypt(path)
+	broken = os.path.join(directory, 'broken.png')
+	write_file(broken, b'not an image')
+	for workers in [1, 2]:
+		results = {result.path:result for result in templar.decrypt_many(iter(sorted(expected) + [broken]), workers=workers)}
+		assert {path:result.text for path, result in results.items() if path != broken} == expected
+		assert all(result.error is None and result.seconds >= 0 for path, result in results.items() if path != broken)
+		assert results[broken].text is None and isinstance(results[broken].error, Exception)
+
+for manipulator in [Pigpen(), Templar(), Betamaze()]:
+	image = BytesIO()
+	manipulator.encrypt('Meet me at noon', image, 6, mode='L')
+	expected = manipulator.decrypt(image.getvalue())
+	image = Image.open(BytesIO(image.getvalue()))
+	for scale in [1, 2, 1.5, 0.8]:
+		for margin in [(0, 0), (37, 11)]:
+			size = (int(image.size[0] * scale), int(image.size[1] * scale))
+			page = Image.new('L', (size[0] + 2 * margin[0], size[1] + 2 * margin[1]), 255)
+			page.paste(image.resize(size, Image.BILINEAR), margin)
+			scan = BytesIO()
+			page.save(scan, 'PNG')
+			assert manipulator.decrypt(scan.getvalue()) == expected
+
+for manipulator in [Pigpen(), Templar(), Betamaze()]:
+	text = manipulator._clean('The quick brown fox jumps over the lazy dog, 1234567890.')
+	for mode in ['RGB', 'L', 'P', '1']:
+		size, positions = manipulator._layout(text, 7)
+		reference = Image.new(mode, size, 'white' if mode != 'P' else 15)
+		glyphs = manipulator._glyphs(mode)
+		for letter, x_offset, y_offset in positions:
+			reference.paste(glyphs[letter], (x_offset, y_offset))
+		image = BytesIO()
+		manipulator.encrypt(text, image, 7, mode=mode)
+		assert Image.open(BytesIO(image.getvalue())).tobytes() == reference.tobytes()
+betamaze = Betamaze(seed=2)
+upright = dict(betamaze._glyph_rasters('L'))
+betamaze.random_rotate = True
+rotated = betamaze._glyph_rasters('L')
+assert any((rotated[letter] != upright[letter]).any() for letter in betamaze.abc)
+assert all(any((rotated[letter] == np.rot90(upright[letter], turns)).all() for turns in range(4)) for letter in betamaze.abc)
+
+morse = Morse()
+morse_text = 'Hello, world! 73 de K1ABC'
+expected = morse.decrypt(morse.encrypt(morse_text))
+for options in [{}, {'wpm':35}, {'wpm':18, 'farnsworth_wpm':8}, {'sample_rate':44100, 'frequency':900}]:
+	assert morse.decrypt_audio(morse.encrypt_audio(morse_text, **options)) == expected
+with tempfile.TemporaryDirectory() as directory:
+	morse.encrypt_audio(morse_text, os.path.join(directory, 'morse.wav'))
+	assert morse.decrypt_audio(os.path.join(directory, 'morse.wav')) == expected
+samples = np.frombuffer(b''.join(morse.audio_frames(morse_text)), dtype='<i2')
+noisy = (samples + np.random.RandomState(0).normal(0, 2000, len(samples))).clip(-32768, 32767).astype('<i2')
+assert morse.decrypt_audio(np.stack([noisy, noisy], axis=1), sample_rate=8000) == expected
+assert morse.decrypt_audio(((samples >> 8) + 128).astype(np.uint8), sample_rate=8000) == expected
+for options in [{'wpm':0}, {'wpm':10, 'farnsworth_wpm':12}]:
+	try:
+		morse.encrypt_audio(morse_text, **options)
+		assert False
+	except ValueError:
+		pass
+
+morse_codes = [morse.encrypt(input_text) for input_text in input_strings if input_text] + ['', '.- héllo  / -..', '........']
+for code in morse_codes:
+	assert morse.unpack(morse.pack(code)) == code
+whole_code = ' / '.join(morse.encrypt(input_text) for input_text in input_strings if input_text)
+assert len(morse.pack(whole_code)) * 3 < len(whole_code)
+for data in [b'\x18', b'\x00']:
+	try:
+		morse.unpack(data)
+		assert False
+	except ValueError:
+		pass
+with tempfile.TemporaryDirectory() as directory:
+	code = whole_code * 2000
+	write_file(os.path.join(directory, 'morse.txt'), code.encode())
+	morse.pack_file(os.path.join(directory, 'morse.txt'), os.path.join(directory, 'morse.bin'))
+	assert read_file(os.path.join(directory, 'morse.bin')) == morse.pack(code)
+	morse.unpack_file(os.path.join(directory, 'morse.bin'), os.path.join(directory, 'unpacked.txt'))
+	assert read_file(os.path.join(directory, 'unpacked.txt')) == code.encode()
+
+for cipher, key in [(Vigenere('lemon'), 'LEMON'), (Beaufort('secret'), 'SECRET'), (Gronsfeld('2317'), '2317')]:
+	matches = cipher.crib_drag(cipher.encrypt(short_message), ['every single word', 'attack at dawn'], n_results=3)
+	assert 1 <= len(matches) <= 3
+	assert [match.score for match in matches] == sorted(match.score for match in matches)
+	best = matches[0]
+	assert (best.crib, best.offset, best.period, best.key) == ('every single word', short_message.index('every'), len(key), key)
+	letter_offset = sum(char.isalpha() for char in short_message[:best.offset])
+	assert best.fragment == ''.join(key[(letter_offset + index) % len(key)] for index in range(len('everysingleword')))
+
+word_random = random.Random(0)
+words = [''.join(word_random.choice(string.ascii_lowercase) for _ in range(word_random.randint(3, 9))) for _ in range(20000)]
+words += [str(word_random.randint(0, 99999)) for _ in range(2000)]
+words[1234], words[7777], words[21000] = "Se'cret", 'lemon', '2317'
+with tempfile.TemporaryDirectory() as directory:
+	wordlist = os.path.join(directory, 'words.txt')
+	write_file(wordlist, '\n'.join(words).encode())
+	for cipher, key in [(Keyword('secret'), 'SECRET'), (Vigenere('lemon'), 'LEMON'), (Beaufort('secret'), 'SECRET'), (Gronsfeld('2317'), '2317')]:
+		results = cipher.dictionary_attack(cipher.encrypt(short_message), wordlist, n_results=3)
+		assert results[0][:2] == (key, short_message.upper())
+		assert [result[2] for result in results] == sorted(result[2] for result in results)
+		assert cipher.dictionary_attack(cipher.encrypt(short_message), wordlist, n_results=3, workers=2) == results
+
+sheet_texts = ['Hello, world!', 'Meet me at noon', 'Attack at dawn', 'The quick brown fox jumps over the lazy dog']
+for manipulator in [Pigpen(), Templar(), Betamaze()]:
+	for mode in ['RGB', 'P', '1']:
+		expected = []
+		for text in sheet_texts:
+			image = BytesIO()
+			manipulator.encrypt(text, image, 6, mode=mode)
+			expected.append(image.getvalue())
+		outputs = [BytesIO() for _ in sheet_texts * 2]
+		manipulator.encrypt_many(((text, output) for text, output in zip(sheet_texts * 2, outputs)), max_in_line=6, mode=mode, workers=2)
+		assert [output.getvalue() for output in outputs] == expected * 2
+		sheet, index = BytesIO(), StringIO()
+		sprites = manipulator.encrypt_sheet(sheet_texts, sheet, index, max_in_line=6, sheet_width=400, mode=mode)
+		assert [dict(sprite._asdict()) for sprite in sprites] == json.loads(index.getvalue())
+		assert [sprite.text for sprite in sprites] == sheet_texts
+		sheet = Image.open(BytesIO(sheet.getvalue()))
+		for sprite, image in zip(sprites, expected):
+			assert sheet.crop((sprite.x, sprite.y, sprite.x + sprite.width, sprite.y + sprite.height)).tobytes() == Image.open(BytesIO(image)).tobytes()
+	try:
+		manipulator.encrypt_sheet([])
+		assert False
+	except ValueError:
+		pass
+
+def loop_caesar(text, key):
+	cipher = ''
+	for letter in text.upper():
+		cipher += string.ascii_uppercase[(string.ascii_uppercase.index(letter) + key) % 26] if letter in string.ascii_uppercase else letter
+	return cipher
+
+def loop_affine(text, a, b):
+	cipher = ''
+	for letter in text.upper():
+		cipher += string.ascii_uppercase[(a * string.ascii_uppercase.index(letter) + b) % 26] if letter in string.ascii_uppercase else letter
+	return cipher
+
+timing_text = ascii_text[:300000]
+for manipulator, reference in [(Caesar(key=7), lambda text: loop_caesar(text, 7)), (Affine(5, 8), lambda text: loop_affine(text, 5, 8))]:
+	start = time.perf_counter()
+	expected = reference(timing_text)
+	loop_seconds = time.perf_counter() - start
+	start = time.perf_counter()
+	cipher = manipulator.encrypt(timing_text)
+	plain = manipulator.decrypt(cipher)
+	seconds = time.perf_counter() - start
+	assert cipher == expected and plain == timing_text.upper()
+	assert seconds < loop_seconds, (type(manipulator).__name__, seconds, loop_seconds)
+assert Caesar(key=3).decrypt(Caesar(key=3).encrypt(short_message, key=29), key=29) == short_message.upper()
+
+def layered(layers, text, decrypt=False):
+	for layer in (layers[::-1] if decrypt else layers):
+		text = layer.decrypt(text) if decrypt else layer.encrypt(text)
+	return text
+
+chains = [
+	(Atbash(), Binary(base=16), Caesar(key=3)),
+	(Caesar(key=2), Binary(base=64), Keyword('secret')),
+	(Binary(base=16), Vigenere('secret'), Atbash()),
+	(Keyword('secret'), Binary(base=8), Binary(base=16), Affine(5, 8)),
+	(Binary(base=16), RailFence(3), Caesar(key=5)),
+	(Vigenere('lemon'), Binary(), Morse()),
+	]
+for layers in chains:
+	chain = Pipeline(*layers)
+	for input_text in input_strings:
+		if input_text:
+			assert chain.encrypt(input_text) == layered(layers, input_text)
+			if not any(isinstance(layer, Binary) and layer.base == 64 for layer in layers):
+				assert chain.decrypt(chain.encrypt(input_text)) == layered(layers, layered(layers, input_text), True)
+				assert chain.decrypt(chain.encrypt(input_text)) == (input_text if isinstance(layers[0], Binary) else unidecode(input_text).upper())
+
+async def async_round_trips(manipulator, executor):
+	png = await manipulator.encrypt_async('Hello, world!', executor=executor, max_in_line=5)
+	image = BytesIO()
+	await manipulator.encrypt_async('Hello, world!', image, executor=executor, max_in_line=5)
+	return png, image.getvalue(), await manipulator.decrypt_async(png, executor=executor), await manipulator.decrypt_async(BytesIO(png), executor=executor)
+
+for manipulator in [Pigpen(), Templar(), Betamaze()]:
+	image = BytesIO()
+	manipulator.encrypt('Hello, world!', image, 5)
+	text = manipulator.decrypt(image.getvalue())
+	with ThreadPoolExecutor(2) as executor:
+		for chosen in [None, executor]:
+			assert asyncio.run(async_round_trips(manipulator, chosen)) == (image.getvalue(), image.getvalue(), text, text)
+		manipulator.executor = executor
+		assert asyncio.run(async_round_trips(manipulator, None)) == (image.getvalue(), image.getvalue(), text, text)
+		manipulator.executor = None
+
+for key in ['7', '42', '2317', '905']:
+	results = Gronsfeld('0').crack(Gronsfeld(key).encrypt(short_message), n_results=5)
+	assert results[0][:2] == (key, short_message.upper())
+	assert len(results) == 5 and len(set(result[1] for result in results)) == 5
+	assert [result[2] for result in results] == sorted(result[2] for result in results)
+results = Gronsfeld('0').crack(Gronsfeld('4').encrypt(short_message), max_key_length=1, n_results=20)
+assert sorted(result[0] for result in results) == [str(digit) for digit in range(10)]
+assert all(score == english_score(text) and text == Gronsfeld(key).decrypt(Gronsfeld('4').encrypt(short_message)) for key, text, score in results)
+assert Gronsfeld('0').crack('1234 !?') == []
+
+with open('README.rst') as readme:
+	readme_text = readme.read()[:3000]
+for plain in [readme_text, 'Total = 3 * (4 + 5)\n`code` #tag 100%', short_message + ' <html> {json} ~~~']:
+	morse_cipher = Morse().encrypt(plain)
+	assert identify(morse_cipher) == ['morse']
+	assert solve(morse_cipher)[0].text == Morse().decrypt(morse_cipher)
+for letter_cipher in [Caesar(key=3).encrypt(short_message + '...'), Vigenere('lemon').encrypt('Wait... what - really? / no')]:
+	assert 'morse' not in identify(letter_cipher)
@@ -0,0 +1,99 @@
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
+from crypyto.ciphers import *
+from crypyto.substitution_alphabets import *
+from crypyto.pipeline import *
+from crypyto.pool import CipherPool
+from crypyto.cryptanalysis import solve
+
+THREADS = int(os.environ.get('THREADS', 8))
+ROUNDS = int(os.environ.get('ROUNDS', 20))
+
+with open('tests/input.in', 'r') as input_file:
+	input_strings = [line for line in input_file.read().split('\n') if line]
+
+pool = CipherPool()
+shared = [
+	PolybiusSquare(5, 5),
+	Atbash(),
+	Caesar(key=7),
+	Affine(5, 8),
+	RailFence(3),
+	Morse(),
+	Keyword('secret'),
+	Vigenere('secret'),
+	Binary(),
+	Binary(base=64),
+	Beaufort('secret'),
+	Gronsfeld('2317'),
+	Pipeline(Keyword('secret'), Vigenere('secret'), Morse()),
+	pool.get(Vigenere, 'secret'),
+	pool.get(RailFence, 4, direction='U'),
+	]
+square = PolybiusSquare(6, 6)
+rail_fence = pool.get(RailFence, 3)
+gronsfeld = pool.get(Gronsfeld, '0')
+templar = Templar()
+long_text = ' '.join(input_strings)
+
+def round_trips(task):
+	results = []
+	for cipher in shared:
+		for text in input_strings:
+			encrypted = cipher.encrypt(text)
+			results.append((encrypted, cipher.decrypt(encrypted)))
+	return results
+
+def seeded_square(task):
+	encrypted = square.encrypt(long_text, seed=task)
+	return encrypted, square.decrypt(encrypted)
+
+def rail_fence_brute_force(task, output_dir):
+	filename = os.path.join(output_dir, '{}.txt'.format(task))
+	rail_fence.brute_force(long_text[:25], filename)
+	with open(filename) as output:
+		return output.read(), rail_fence.n_rails, rail_fence.direction
+
+def cracking(task):
+	cipher = Gronsfeld('2317').encrypt(long_text)
+	return gronsfeld.crack(cipher, 3), [candidate[1:] for candidate in solve(Vigenere('lemon').encrypt(long_text))]
+
+def images(task):
+	image = BytesIO()
+	templar.encrypt(input_strings[task % len(input_strings)], image, mode='1')
+	return templar.decrypt(image.getvalue())
+
+def run(function, tasks, workers):
+	start = time.perf_counter()
+	if workers == 1:
+		results = [function(task) for task in tasks]
+	else:
+		with ThreadPoolExecutor(workers) as executor:
+			results = list(executor.map(function, tasks))
+	return results, time.perf_counter() - start
+
+def stress(threads=THREADS, rounds=ROUNDS):
+	timings = []
+	switch_interval = sys.getswitchinterval()
+	sys.setswitchinterval(1e-6)
+	try:
+		with tempfile.TemporaryDirectory() as output_dir:
+			for function in [round_trips, seeded_square, partial(rail_fence_brute_force, output_dir=output_dir), cracking, images]:
+				name = getattr(function, 'func', function).__name__
+				tasks = list(range(threads * rounds))
+				expected, serial_seconds = run(function, tasks, 1)
+				results, threaded_seconds = run(function, tasks, threads)
+				assert results == expected, name
+				timings.append((name, len(tasks), serial_seconds, threaded_seconds))
+	finally:
+		sys.setswitchinterval(switch_interval)
+	return timings
+
+if __name__ == '__main__':
+	for name, calls, serial_seconds, threaded_seconds in stress():
+		print('{:<24} {:4} calls  serial {:7.3f}s  {} threads {:7.3f}s'.format(name, calls, serial_seconds, THREADS, threaded_seconds))